@@ -0,0 +1,40 @@
+"""add site stats table
+
+Revision ID: b7e4c2a91f03
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4c2a91f03'
+down_revision: Union[str, Sequence[str], None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create site_stats table for the persisted site statistics cache."""
+    op.create_table(
+        'site_stats',
+        sa.Column('site_id', sa.String(), nullable=False),
+        sa.Column('table_name', sa.String(), nullable=True),
+        sa.Column('total_posts', sa.Integer(), nullable=True),
+        sa.Column('exact', sa.Boolean(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('last_updated', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('site_id')
+    )
+    op.create_index(op.f('ix_site_stats_site_id'), 'site_stats', ['site_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop site_stats table."""
+    op.drop_index(op.f('ix_site_stats_site_id'), table_name='site_stats')
+    op.drop_table('site_stats')
@@ -2,7 +2,7 @@
 Database module for the Admin application.
 Provides SQLAlchemy models and session management for storing site connections.
 """
-from sqlalchemy import create_engine, Column, String, DateTime
+from sqlalchemy import create_engine, Column, String, DateTime, Integer, Float, Boolean, Text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from datetime import datetime
 import os
@@ -67,6 +67,33 @@ class SiteConnection(Base):
         }
 
 
+class SiteStats(Base):
+    """Last known statistics per site, written through from the in-memory stats cache."""
+    __tablename__ = "site_stats"
+    
+    site_id = Column(String, primary_key=True, index=True)
+    table_name = Column(String, nullable=True)
+    total_posts = Column(Integer, default=0)
+    exact = Column(Boolean, default=True)
+    status = Column(String, nullable=False, default="error")
+    error = Column(Text, nullable=True)
+    last_updated = Column(Float, nullable=False, default=0)  # epoch seconds, as used by the cache
+    
+    def to_dict(self):
+        """Convert to the ConnectionManager stats cache entry format (without the site name)."""
+        stats = {
+            "id": self.site_id,
+            "table": self.table_name,
+            "total_posts": self.total_posts,
+            "exact": self.exact,
+            "status": self.status,
+            "last_updated": self.last_updated,
+        }
+        if self.error:
+            stats["error"] = self.error
+        return stats
+
+
 class Category(Base):
     """Model for storing Categories globally for the super admin."""
     __tablename__ = "categories"
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from typing import List, Optional
@@ -64,7 +64,9 @@ async def warm_connection_manager():
     Prime the singleton at startup so first frontend /sites request is instant.
     """
     try:
-        await asyncio.to_thread(ConnectionManager.get_instance)
+        manager = await asyncio.to_thread(ConnectionManager.get_instance)
+        # Dispose site engines that sit idle past SITE_ENGINE_IDLE_TTL
+        app.state.idle_eviction_task = asyncio.create_task(manager.run_idle_eviction())
     except Exception as e:
         print(f"Warning: Connection manager warmup failed: {e}")
 
@@ -385,41 +387,37 @@ async def upload_image_multi(
         raise HTTPException(status_code=500, detail=f"Multi-upload error: {str(e)}")
 
 @app.get("/sites/{site_id}/recent-posts")
-async def get_recent_posts(site_id: str, limit: int = 5, manager: ConnectionManager = Depends(get_conn_manager)):
+async def get_recent_posts(site_id: str, limit: int = 5, fields: str = None, manager: ConnectionManager = Depends(get_conn_manager)):
     """
     Fetch the most recent posts from a site's database to verify injection worked.
+    fields= takes "summary" or a comma-separated column list (default: all columns).
     """
     from sqlalchemy import text
+    from services import projection
+    from services.serialization import FastJSONResponse, RowSerializer
     
     try:
-        engine = manager.get_engine(site_id)
+        engine = await manager.get_async_engine(site_id)
         config = manager.get_config(site_id)
-        table_name = manager.resolve_table_name(engine, config.target_table_name)
         
-        # Query recent posts
-        sql = text(f'SELECT * FROM "{table_name}" ORDER BY id DESC LIMIT :limit')
-        
-        with engine.connect() as conn:
-            result = conn.execute(sql, {"limit": limit})
-            rows = result.fetchall()
-            columns = result.keys()
-            
-            # Convert to list of dicts
-            posts = [dict(zip(columns, row)) for row in rows]
+        async with engine.connect() as conn:
+            table_name = await manager.resolve_table_name_async(conn, config.target_table_name, site_id=site_id)
+            schema = await manager.schema_registry.get_async(site_id, conn)
+            select_sql = projection.select_list(schema, table_name, fields)
+
+            # Query recent posts
+            sql = text(f'SELECT {select_sql} FROM "{table_name}" t ORDER BY id DESC LIMIT :limit')
+            result = await conn.execute(sql, {"limit": limit})
             
-            # Convert non-serializable types to strings
-            import datetime
-            for post in posts:
-                for key, value in post.items():
-                    if isinstance(value, (datetime.datetime, datetime.date)):
-                        post[key] = str(value)
+            # JSON-ready dicts, converting only the columns whose type needs it
+            posts = RowSerializer.for_result(result, schema, table_name).dicts(result.fetchall())
             
-            return {
+            return FastJSONResponse({
                 "site_id": site_id,
                 "table": table_name,
                 "count": len(posts),
                 "posts": posts
-            }
+            })
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -437,28 +435,29 @@ async def get_candidate_tables(
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/sites/{site_id}/stats")
-async def get_site_stats(site_id: str, manager: ConnectionManager = Depends(get_conn_manager)):
+async def get_site_stats(site_id: str, exact: bool = False, manager: ConnectionManager = Depends(get_conn_manager)):
     """
     Get statistics for a specific site including post count and table info.
+    Post counts come from maintained counters or catalog estimates unless exact=true.
     """
     from sqlalchemy import text
     
     try:
-        engine = manager.get_engine(site_id)
+        engine = await manager.get_async_engine(site_id)
         config = manager.get_config(site_id)
-        table_name = manager.resolve_table_name(engine, config.target_table_name)
         
-        with engine.connect() as conn:
+        async with engine.connect() as conn:
+            table_name = await manager.resolve_table_name_async(conn, config.target_table_name, site_id=site_id)
+
             # Get total post count
-            count_sql = text(f'SELECT COUNT(*) as total FROM "{table_name}"')
-            result = conn.execute(count_sql)
-            total_posts = result.scalar() or 0
+            counts = await manager.post_counter.get_counts(site_id, conn, table_name, exact=exact)
             
             return {
                 "site_id": site_id,
                 "name": config.name,
                 "table": table_name,
-                "total_posts": total_posts,
+                "total_posts": counts["total"],
+                "exact": counts["exact"],
                 "status": "connected"
             }
     except Exception as e:
@@ -490,20 +489,40 @@ async def get_sites_quick(manager: ConnectionManager = Depends(get_conn_manager)
     ]
 
 
-@app.get("/sites/detailed")
-async def get_sites_detailed(
-    background_tasks: BackgroundTasks,
-    manager: ConnectionManager = Depends(get_conn_manager)
-):
+@app.get("/sites/pool-usage")
+async def get_pool_usage(manager: ConnectionManager = Depends(get_conn_manager)):
     """
-    Get all sites with their statistics.
-    RETURNS CACHED DATA IMMEDIATELY to prevent blocking.
-    Triggers background refresh for stale data (> 5 minutes).
+    Connection budget across all site pools: global cap, reserved slots,
+    checked-out connections and per-pool sizing / idle time.
+    """
+    return manager.get_pool_usage()
+
+
+@app.get("/sites/connect-stats")
+async def get_connect_stats(manager: ConnectionManager = Depends(get_conn_manager)):
+    """
+    Engine creation counters: real connects vs. requests coalesced onto an in-flight connect.
+    """
+    return manager.get_connect_stats()
+
+
+@app.get("/sites/public-cache")
+async def get_public_cache_stats(manager: ConnectionManager = Depends(get_conn_manager)):
+    """Public feed response cache and hot single-post LRU: sizes and hit / miss counters."""
+    return {**manager.public_cache.snapshot(), "hot_posts": manager.hot_posts.snapshot()}
+
+
+def _collect_site_entries(manager: ConnectionManager):
+    """
+    Cached stats entry for every site, plus the ids of available sites whose
+    stats are missing or stale (> 5 minutes), stalest first.
+    Sites whose circuit breaker is open are reported as-is and not refreshed.
     """
     import time
     
     sites = manager.list_sites()
     detailed_sites = []
+    stale_site_ids = []
     
     CACHE_TTL = 300  # 5 minutes
     now = time.time()
@@ -511,39 +530,132 @@ async def get_sites_detailed(
     for site in sites:
         site_id = site["id"]
         cached = manager.get_cached_stats(site_id)
+        available = manager.is_site_available(site_id)
         
         if cached:
             # Check if stale
             last_updated = cached.get("last_updated", 0)
-            if now - last_updated > CACHE_TTL:
-                background_tasks.add_task(manager.refresh_site_stats, site_id)
+            if now - last_updated > CACHE_TTL and available:
+                stale_site_ids.append((last_updated, site_id))
             
-            detailed_sites.append(cached)
+            entry = dict(cached)
         else:
             # No cache? Return basic info and trigger refresh
-            detailed_sites.append({
+            entry = {
                 "id": site_id,
                 "name": site["name"],
                 "table": manager.normalize_table_name(site["target_table"]),
                 "total_posts": -1, # Loading
-                "status": "refreshing",
+                "status": "refreshing" if available else "unavailable",
                 "last_updated": 0
-            })
-            background_tasks.add_task(manager.refresh_site_stats, site_id)
-            
+            }
+            if available:
+                stale_site_ids.append((0, site_id))
+
+        entry["breaker"] = manager.get_breaker_state(site_id)
+        detailed_sites.append(entry)
+
+    stale_site_ids.sort()
+    return detailed_sites, [site_id for _, site_id in stale_site_ids]
+
+
+@app.get("/sites/detailed")
+async def get_sites_detailed(
+    manager: ConnectionManager = Depends(get_conn_manager)
+):
+    """
+    Get all sites with their statistics.
+    RETURNS CACHED DATA IMMEDIATELY to prevent blocking.
+    Schedules a refresh for stale data (> 5 minutes) on the stats refresher,
+    which bounds parallelism and shares refreshes that are already running.
+    Stats survive restarts (persisted in the admin DB); each call refreshes at most
+    SITE_STATS_REFRESH_BATCH of the stalest sites so refreshes spread out over time.
+    """
+    detailed_sites, stale_site_ids = _collect_site_entries(manager)
+    # Stalest first; the rest are picked up by later calls
+    manager.stats_refresher.schedule_many(stale_site_ids[:manager.stats_refresh_batch])
     return detailed_sites
 
 
+@app.get("/sites/detailed/stream")
+async def stream_sites_detailed(
+    manager: ConnectionManager = Depends(get_conn_manager)
+):
+    """
+    Streaming variant of /sites/detailed (NDJSON, like /generate/stream).
+    Sends every cached entry at once ("cached"), then one "updated" line per
+    stale site as soon as its refresh finishes, and a final "complete" line.
+    """
+    detailed_sites, stale_site_ids = _collect_site_entries(manager)
+    tasks = manager.stats_refresher.schedule_many(stale_site_ids)
+
+    async def event_generator():
+        for entry in detailed_sites:
+            yield json.dumps({"status": "cached", "data": entry}) + "\n"
+
+        refreshed = 0
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                stats = await next_done
+            except Exception as e:
+                yield json.dumps({"status": "error", "message": str(e)}) + "\n"
+                continue
+            if stats:
+                refreshed += 1
+                entry = dict(stats)
+                entry["breaker"] = manager.get_breaker_state(entry["id"])
+                yield json.dumps({"status": "updated", "data": entry}) + "\n"
+
+        yield json.dumps({"status": "complete", "refreshed": refreshed}) + "\n"
+
+    return StreamingResponse(event_generator(), media_type="application/x-ndjson")
+
+
+@app.post("/sites/refresh-stats")
+async def refresh_all_site_statistics(manager: ConnectionManager = Depends(get_conn_manager)):
+    """
+    Refresh statistics for every available site in parallel and wait for the batch.
+    Sites that exceed SITE_STATS_REFRESH_TIMEOUT come back with an error entry.
+    """
+    site_ids = [site["id"] for site in manager.list_sites() if manager.is_site_available(site["id"])]
+    results = await manager.stats_refresher.refresh_many(site_ids, force_refresh=True)
+    return [stats for stats in results if stats]
+
+
+@app.get("/sites/refresh-stats/status")
+async def get_stats_refresh_status(manager: ConnectionManager = Depends(get_conn_manager)):
+    """Stats refresher settings, in-flight sites and counters."""
+    return manager.stats_refresher.snapshot()
+
+
 @app.post("/sites/{site_id}/refresh-stats")
 async def refresh_site_statistics(
     site_id: str, 
     manager: ConnectionManager = Depends(get_conn_manager)
 ):
-    """Force refresh statistics for a specific site."""
-    stats = await manager.refresh_site_stats(site_id)
+    """Force refresh statistics for a specific site (re-resolving its content table)."""
+    stats = await manager.stats_refresher.refresh(site_id, force_refresh=True)
     return stats
 
 
+@app.post("/sites/{site_id}/schema/refresh")
+async def refresh_site_schema(
+    site_id: str,
+    manager: ConnectionManager = Depends(get_conn_manager)
+):
+    """
+    Re-reflect a site's tables, columns, keys and enums (e.g. after a migration)
+    and forget the table names resolved from the previous snapshot.
+    """
+    try:
+        manager.get_config(site_id)
+        manager.invalidate_schema(site_id)
+        schema = await manager.schema_registry.refresh(site_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"site_id": site_id, **schema.summary(), "table_names": schema.table_names}
+
+
 @app.get("/sites/{site_id}/posts")
 async def get_site_posts(
     site_id: str, 
@@ -553,20 +665,48 @@ async def get_site_posts(
     search: str = None,
     category: str = None,
     sort: str = "id_desc",
+    exact: bool = False,
+    cursor: str = None,
+    include_total: bool = True,
+    include_stats: bool = True,
+    fields: str = None,
     manager: ConnectionManager = Depends(get_conn_manager)
 ):
     """
     Fetch paginated posts with filtering and search.
+    Unfiltered (or status-only) totals and the per-status stats come from the
+    site's post counters; exact=true forces a real count. On a cold counter the
+    stats are null (stats_exact=false) until a background recount fills them in.
+
+    Pages are addressed either by `page` (OFFSET, fine for small tables) or by
+    the opaque `next_cursor` / `prev_cursor` of a previous response, which seek
+    on (sort key, id) so deep pages cost the same as the first. A cursor keeps
+    the sort it was issued for.
+
+    The page and its filtered total (a window count where the dialect has one)
+    come back from a single query; categories come from the site's category index. include_total=false and
+    include_stats=false skip the counting entirely.
+
+    fields=summary returns the lightweight columns plus a database-computed
+    excerpt instead of the full body; fields=a,b,c selects exactly those columns.
     """
     from sqlalchemy import text
+    from services import category_index, pagination, projection
+    from services.serialization import FastJSONResponse, RowSerializer
     
     try:
-        engine = manager.get_engine(site_id)
+        seek = pagination.decode_cursor(cursor) if cursor else None
+        if seek:
+            sort = seek["sort"]
+        elif sort not in pagination.SORTS:
+            sort = pagination.DEFAULT_SORT
+        engine = await manager.get_async_engine(site_id)
         config = manager.get_config(site_id)
-        table_name = manager.resolve_table_name(engine, config.target_table_name)
         offset = (page - 1) * limit
         
-        with engine.connect() as conn:
+        async with engine.connect() as conn:
+            table_name = await manager.resolve_table_name_async(conn, config.target_table_name, site_id=site_id)
+
             # Build WHERE clause
             where_clauses = []
             params = {"limit": limit, "offset": offset}
@@ -576,23 +716,21 @@ async def get_site_posts(
                 params["status"] = status
             
             if search:
-                where_clauses.append("(title ILIKE :search OR h1 ILIKE :search)")
-                params["search"] = f"%{search}%"
+                # Indexed full-text / trigram match where the site has one, portable LIKE otherwise
+                search_backend = await manager.search.backend(site_id, conn, table_name)
+                where_clauses.append(search_backend.match_clause(search, params))
             
-            # Check for BlogCategory relationships
-            has_cat_table = False
-            try:
-                # Introspect if relationship tables exist
-                from sqlalchemy import inspect
-                inspector = inspect(engine)
-                tables = inspector.get_table_names()
-                if "BlogCategory" in tables and "Category" in tables:
-                    has_cat_table = True
-            except:
-                pass
+            # Check for BlogCategory relationships (from the site's reflected schema)
+            schema = await manager.schema_registry.get_async(site_id, conn)
+            has_cat_table = schema.has_table("BlogCategory") and schema.has_table("Category")
 
             if category:
-                if has_cat_table:
+                category_id = await manager.category_index.category_id(site_id, conn, category) if has_cat_table else None
+                if category_id is not None:
+                    # Resolved from the category index: no join needed
+                    where_clauses.append('id IN (SELECT "blogId" FROM "BlogCategory" WHERE "categoryId" = :category_id)')
+                    params["category_id"] = category_id
+                elif has_cat_table:
                     where_clauses.append(f'id IN (SELECT "blogId" FROM "BlogCategory" bc JOIN "Category" c ON bc."categoryId" = c."categoryId" WHERE c.name = :category)')
                     params["category"] = category
                 else:
@@ -601,227 +739,366 @@ async def get_site_posts(
             
             where_sql = " WHERE " + " AND ".join(where_clauses) if where_clauses else ""
             
-            # Build ORDER BY
-            sort_map = {
-                "id_desc": "id DESC",
-                "id_asc": "id ASC",
-                "title_asc": "title ASC",
-                "title_desc": "title DESC",
-                "date_desc": "\"createdAt\" DESC",
-                "date_asc": "\"createdAt\" ASC"
-            }
-            order_by = sort_map.get(sort, "id DESC")
-            
-            # Get total count with filters
-            count_sql = text(f'SELECT COUNT(*) FROM "{table_name}"{where_sql}')
-            total = conn.execute(count_sql, params).scalar() or 0
-            
-            # Get stats by status
-            stats_sql = text(f'''
-                SELECT status, COUNT(*) as count 
-                FROM "{table_name}" 
-                GROUP BY status
-            ''')
-            stats_result = conn.execute(stats_sql)
-            stats = {row[0]: row[1] for row in stats_result.fetchall()}
-            
-            # Get paginated posts
-            sql = text(f'SELECT * FROM "{table_name}"{where_sql} ORDER BY {order_by} LIMIT :limit OFFSET :offset')
-            result = conn.execute(sql, params)
-            rows = result.fetchall()
-            columns = result.keys()
-            
-            # Convert to list of dicts
-            posts = [dict(zip(columns, row)) for row in rows]
-            
-            # Convert non-serializable types
-            import datetime
+            # Stats and unfiltered / status-only totals come from the post counters,
+            # which only touch the database when cold or when exact=true
+            counts = None
+            counter_total = not where_clauses or (status and not search and not category)
+            if include_stats or (include_total and counter_total):
+                counts = await manager.post_counter.get_counts(site_id, conn, table_name, exact=exact)
+            stats = counts["by_status"] if counts and include_stats else None
+            # stats stays null (stats_exact false) until the background recount knows the breakdown
+            stats_exact = counts["exact"] and stats is not None if counts and include_stats else None
+
+            total = None
+            total_exact = None
+            if include_total and counts is not None:
+                if not where_clauses:
+                    total, total_exact = counts["total"], counts["exact"]
+                elif counter_total and counts["exact"] and counts["by_status"] is not None:
+                    total, total_exact = counts["by_status"].get(status, 0), True
+            # Anything else is counted alongside the page itself
+            count_inline = include_total and total is None
+
+            # Each phase is one index-ordered query (a nullable sort key reads its NULLs apart)
+            nullable = pagination.nullable_sort(schema, table_name, sort)
+            if seek:
+                # Keyset: seek past the cursor row
+                phases, backwards = pagination.seek_phases(seek, params, nullable)
+            else:
+                phases, backwards = pagination.phases(sort, nullable=nullable), False
+
+            # id and the sort key are always selected: cursors are built from them
+            select_list = [projection.select_list(schema, table_name, fields, required=("id", pagination.sort_column(sort)))]
+            if count_inline:
+                if not seek and len(phases) == 1 and pagination.supports_window_count(conn.dialect):
+                    select_list.append('COUNT(*) OVER() AS "_total"')
+                else:
+                    # Seek clauses and phases must not narrow the total, so count the filters alone
+                    select_list.append(f'(SELECT COUNT(*) FROM "{table_name}"{where_sql}) AS "_total"')
+            select_sql = ", ".join(select_list)
+
+            # Get paginated posts, reading one extra row to tell whether more pages follow
+            posts = []
+            serializer = None
+            skip = 0 if seek else offset
+            for n, (phase_where, order) in enumerate(phases):
+                wanted = limit + 1 - len(posts)
+                if wanted <= 0:
+                    break
+                page_where = where_clauses + ([phase_where] if phase_where else [])
+                page_where_sql = " WHERE " + " AND ".join(page_where) if page_where else ""
+                sql = text(f'SELECT {select_sql} FROM "{table_name}" t{page_where_sql} ORDER BY {order} LIMIT :limit OFFSET :offset')
+                result = await conn.execute(sql, {**params, "limit": wanted, "offset": skip})
+                serializer = serializer or RowSerializer.for_result(result, schema, table_name)
+                # Raw values first: cursors are encoded from the typed sort keys
+                rows = [dict(zip(serializer.columns, row)) for row in result.fetchall()]
+                posts.extend(rows)
+                if skip and not rows and n + 1 < len(phases):
+                    # The offset reaches past this phase: skip only what remains of it
+                    count_sql = text(f'SELECT COUNT(*) FROM "{table_name}"{page_where_sql}')
+                    skip = max(0, skip - ((await conn.execute(count_sql, params)).scalar() or 0))
+                else:
+                    skip = 0
+            has_more = len(posts) > limit
+            posts = posts[:limit]
+
+            if count_inline:
+                if posts:
+                    total = posts[0]["_total"]
+                elif seek or offset:
+                    # Past the end: no row to carry the count
+                    count_sql = text(f'SELECT COUNT(*) FROM "{table_name}"{where_sql}')
+                    total = (await conn.execute(count_sql, params)).scalar() or 0
+                else:
+                    total = 0
+                total_exact = True
             for post in posts:
-                for key, value in post.items():
-                    if isinstance(value, (datetime.datetime, datetime.date)):
-                        post[key] = str(value)
-            
-            # Append Category details
-            if has_cat_table and posts:
-                post_ids = [str(p["id"]) for p in posts]
-                ids_str = ",".join(post_ids)
-                cat_sql = text(f'''
-                    SELECT bc."blogId", c.name 
-                    FROM "BlogCategory" bc 
-                    JOIN "Category" c ON bc."categoryId" = c."categoryId" 
-                    WHERE bc."blogId" IN ({ids_str})
-                ''')
-                cat_rows = conn.execute(cat_sql).fetchall()
-                cat_map = {row[0]: row[1] for row in cat_rows}
+                post.pop("_total", None)
+            if has_cat_table:
+                # From the category index; only posts it hasn't seen yet cost a (batched) query
+                categories = await manager.category_index.categories(site_id, conn, [post["id"] for post in posts])
                 for post in posts:
-                    post["category"] = cat_map.get(post["id"])
+                    names = categories.get(post["id"])
+                    post["category"] = category_index.primary(names or ())
+
+            if backwards:
+                posts.reverse()
+                cursors = pagination.page_cursors(sort, posts, has_before=has_more, has_after=True)
+            else:
+                cursors = pagination.page_cursors(sort, posts, has_before=bool(seek) or page > 1, has_after=has_more)
+            serializer.convert(posts)
                     
-            return {
+            return FastJSONResponse({
                 "site_id": site_id,
                 "table": table_name,
-                "page": page,
+                "page": None if seek else page,
                 "limit": limit,
                 "total": total,
-                "total_pages": (total + limit - 1) // limit if total > 0 else 1,
+                "total_exact": total_exact,
+                "total_pages": ((total + limit - 1) // limit if total > 0 else 1) if total is not None else None,
+                "sort": sort,
+                **cursors,
                 "stats": stats,
+                "stats_exact": stats_exact,
                 "posts": posts
-            }
+            })
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/sites/{site_id}/search")
+async def search_site_posts(
+    site_id: str,
+    q: str,
+    limit: int = 20,
+    status: str = None,
+    fields: str = "summary",
+    manager: ConnectionManager = Depends(get_conn_manager)
+):
+    """
+    Ranked search over a site's posts (title, h1 and body where indexed).
+    Uses the site's FTS / trigram index when one exists; see POST .../search/index.
+    """
+    from services.serialization import FastJSONResponse
+
+    try:
+        result = await manager.search.search(site_id, q, limit=limit, status=status, fields=fields)
+        return FastJSONResponse({"query": q, **result})
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.get("/search")
+async def search_all_sites(
+    q: str,
+    limit: int = 20,
+    per_site: int = 10,
+    status: str = None,
+    fields: str = "summary",
+    sites: str = None,
+    deadline: float = None,
+    manager: ConnectionManager = Depends(get_conn_manager)
+):
+    """
+    Search every connected site at once (or sites=a,b,c), e.g. to check whether
+    a topic is already covered anywhere. Sites are queried concurrently and the
+    hits merged by relevance (each site's best hit scores 1.0).
+
+    The search answers within deadline seconds (SEARCH_SITE_DEADLINE by
+    default): sites that are slower, down or failing are listed under "sites"
+    with their status and "partial" is true, instead of failing the request.
+    """
+    from services.serialization import FastJSONResponse
+
+    if deadline is not None and deadline <= 0:
+        raise HTTPException(status_code=400, detail="deadline must be positive")
+    site_ids = [site_id.strip() for site_id in sites.split(",") if site_id.strip()] if sites else None
+    result = await manager.search.search_all(
+        q, site_ids=site_ids, limit=limit, per_site=per_site, status=status, fields=fields, deadline=deadline
+    )
+    return FastJSONResponse(result)
+
+
+@app.post("/sites/{site_id}/search/index")
+async def create_site_search_index(
+    site_id: str,
+    kind: str = "fts",
+    manager: ConnectionManager = Depends(get_conn_manager)
+):
+    """
+    Build a search index for the site's content table: kind=fts (PostgreSQL
+    tsvector GIN index / SQLite FTS5 shadow table) or kind=trgm (PostgreSQL pg_trgm).
+    """
+    try:
+        config = manager.get_config(site_id)
+        engine = await manager.get_async_engine(site_id)
+        async with engine.connect() as conn:
+            table_name = await manager.resolve_table_name_async(conn, config.target_table_name, site_id=site_id)
+        backend = await manager.search.create_index(site_id, table_name, kind)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search index build failed: {e}")
+    return {"site_id": site_id, "table": table_name, **backend}
+
+
 # ==========================================
 # PUBLIC API FOR FRONTEND (algotradingbot.online)
 # ==========================================
+def _public_site_id(manager: ConnectionManager) -> Optional[str]:
+    """The site behind the public API: 'algotrading', else the first configured site."""
+    # Hardcoded site ID for the main public site
+    site_id = "algotrading"
+    sites = manager.list_sites()
+    if not any(s["id"] == site_id for s in sites):
+        # Fallback to the first available site if algotrading is missing
+        site_id = sites[0]["id"] if sites else None
+    return site_id
+
+
+def _conditional_response(request: Request, cache, cached) -> Response:
+    """Serve a cached JSON body with validators, or 304 when the client's copy still matches."""
+    from email.utils import formatdate, parsedate_to_datetime
+
+    headers = {
+        "ETag": cached.etag,
+        "Last-Modified": formatdate(cached.last_modified, usegmt=True),
+        "Cache-Control": f"public, max-age={int(cache.ttl)}, stale-while-revalidate={int(cache.stale_ttl)}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if cached.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    if if_none_match is None and request.headers.get("if-modified-since"):
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"]).timestamp()
+            if int(cached.last_modified) <= since:
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
 @app.get("/api/posts")
 async def get_public_posts(
+    request: Request,
     category: str = None,
     limit: int = 100,
+    fields: str = None,
+    page: int = None,
+    cursor: str = None,
+    lite: bool = False,
     manager: ConnectionManager = Depends(get_conn_manager)
 ):
     """
     Public endpoint for the frontend Next.js application to fetch published blogs.
     Always uses the 'algotrading' site connection.
+    fields=summary skips the post bodies (content comes back empty and the
+    description falls back to an excerpt of the body); fields=a,b,c keeps only
+    those BlogPost keys. lite=true returns cards without the content key; the
+    full post is at /api/posts/{slug}.
+
+    Without page / cursor the response is the plain list of posts, as before.
+    With page=N or cursor=<next_cursor> it is a page object:
+    { posts, page, limit, next_cursor[, total, total_pages] }.
+
+    Posts come from the site's precomputed public projection. Responses are
+    cached with ETag / Last-Modified, served stale while a background rebuild
+    runs, and dropped when posts are published, edited or deleted through this
+    API. Conditional requests that still match get a 304.
     """
-    from sqlalchemy import text
-    import datetime
-    
-    # Hardcoded site ID for the main public site
-    site_id = "algotrading"
-    
+    from services import pagination
+
+    if cursor:
+        try:
+            pagination.decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     try:
-        # Check if algotrading site is configured
-        sites = manager.list_sites()
-        if not any(s["id"] == site_id for s in sites):
-            # Fallback to the first available site if algotrading is missing
-            if sites:
-                site_id = sites[0]["id"]
-            else:
-                return []
-                
-        engine = manager.get_engine(site_id)
-        config = manager.get_config(site_id)
-        table_name = manager.resolve_table_name(engine, config.target_table_name)
-        
-        with engine.connect() as conn:
-            where_clauses = ["status = 'published'"]
-            params = {"limit": limit}
-            
-            # Check for BlogCategory relationships
-            has_cat_table = False
-            try:
-                from sqlalchemy import inspect
-                inspector = inspect(engine)
-                tables = inspector.get_table_names()
-                if "BlogCategory" in tables and "Category" in tables:
-                    has_cat_table = True
-            except:
-                pass
+        site_id = _public_site_id(manager)
+        if site_id is None:
+            return []
+
+        cache = manager.public_cache
+        key = ("api_posts", site_id, category, limit, fields, page, cursor, lite)
+        cached = await cache.get(
+            key, site_id, lambda: _build_public_posts(manager, site_id, category, limit, fields, page, cursor, lite)
+        )
+    except Exception as e:
+        print(f"Public API error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-            if category:
-                if category != "All":
-                    if has_cat_table:
-                        where_clauses.append(f'id IN (SELECT "blogId" FROM "BlogCategory" bc JOIN "Category" c ON bc."categoryId" = c."categoryId" WHERE c.name = :category)')
-                        params["category"] = category
-                    else:
-                        where_clauses.append("category = :category")
-                        params["category"] = category
-            
-            where_sql = " WHERE " + " AND ".join(where_clauses)
-            
-            # Get published posts
-            sql = text(f'''
-                SELECT * FROM "{table_name}" 
-                {where_sql} 
-                ORDER BY "createdAt" DESC 
-                LIMIT :limit
-            ''')
-            result = conn.execute(sql, params)
-            rows = result.fetchall()
-            columns = result.keys()
-            
-            posts = [dict(zip(columns, row)) for row in rows]
-            
-            # Append Category details
-            cat_map = {}
-            if has_cat_table and posts:
-                post_ids = [str(p["id"]) for p in posts]
-                ids_str = ",".join(post_ids)
-                cat_sql = text(f'''
-                    SELECT bc."blogId", c.name 
-                    FROM "BlogCategory" bc 
-                    JOIN "Category" c ON bc."categoryId" = c."categoryId" 
-                    WHERE bc."blogId" IN ({ids_str})
-                ''')
-                cat_res = conn.execute(cat_sql)
-                for row in cat_res.fetchall():
-                    pid = row[0]
-                    cname = row[1]
-                    if pid not in cat_map:
-                        cat_map[pid] = []
-                    cat_map[pid].append(cname)
-            
-            # Format to match the Next.js BlogPost interface
-            formatted_posts = []
-            for p in posts:
-                # Format date
-                pub_date = "Recently"
-                raw_date = p.get("createdAt") or p.get("created_at") or datetime.datetime.now()
-                if isinstance(raw_date, str):
-                    try:
-                        raw_date = datetime.datetime.fromisoformat(raw_date.replace('Z', '+00:00'))
-                    except:
-                        pass
-                        
-                if isinstance(raw_date, datetime.datetime):
-                    pub_date = raw_date.strftime("%b %d, %Y")
-                
-                # Format category
-                cat_name = "pre-built bots"
-                if has_cat_table:
-                    cats = cat_map.get(p["id"], [])
-                    if cats:
-                        cat_name = cats[0]
-                elif p.get("category"):
-                    cat_name = p.get("category")
-                    
-                # Parse featuredImages (stored as JSON string array like '["url1","url2"]')
-                raw_img = p.get("featuredImages") or p.get("image") or ""
-                fallback_img = "https://images.unsplash.com/photo-1611974765270-ca12586343bb?q=80&w=1000&auto=format&fit=crop"
-                if raw_img:
-                    try:
-                        parsed = json.loads(raw_img)
-                        if isinstance(parsed, list) and len(parsed) > 0:
-                            image_url = parsed[0]
-                        else:
-                            image_url = str(parsed) if parsed else fallback_img
-                    except (json.JSONDecodeError, TypeError):
-                        image_url = raw_img if raw_img.startswith("http") else fallback_img
-                else:
-                    image_url = fallback_img
-
-                formatted_posts.append({
-                    "id": str(p["id"]),
-                    "title": p.get("title") or p.get("h1") or "",
-                    "slug": p.get("seoSlug") or p.get("slug") or str(p["id"]),
-                    "description": p.get("excerpt") or p.get("meta_description") or "",
-                    "content": p.get("content") or p.get("body_html") or "",
-                    "category": cat_name,
-                    "author": p.get("author") or "AlgoTeam",
-                    "publishDate": pub_date,
-                    "image": image_url,
-                    "readTime": "5 min read",
-                    "isDownloadable": bool(p.get("downloadLink")),
-                    "downloadUrl": p.get("downloadLink"),
-                    "price": "Free" if p.get("downloadLink") else "Premium"
-                })
-                
-            return formatted_posts
-            
+    return _conditional_response(request, cache, cached)
+
+
+async def _build_public_posts(
+    manager: ConnectionManager, site_id: str, category: str, limit: int, fields: str,
+    page: int = None, cursor: str = None, lite: bool = False,
+):
+    """Slice the published posts served by /api/posts from the site's public projection."""
+    projection = await manager.public_projection.get(site_id)
+    view = "lite" if lite else "summary" if fields == "summary" else "full"
+
+    def select(posts):
+        if fields and fields not in ("*", "summary"):
+            keys = {"id", *(name.strip() for name in fields.split(","))}
+            return [{key: value for key, value in post.items() if key in keys} for post in posts]
+        return posts
+
+    if page is None and not cursor:
+        return select(projection.slice(category, limit, view))
+    result = projection.page(category, limit, view, page=page, cursor=cursor)
+    result["posts"] = select(result["posts"])
+    return result
+
+
+@app.get("/api/posts/{slug}")
+async def get_public_post(
+    slug: str,
+    request: Request,
+    manager: ConnectionManager = Depends(get_conn_manager)
+):
+    """
+    A single published post, by slug, in the BlogPost shape (with content).
+
+    Recently read posts are served from an in-memory LRU (PUBLIC_HOT_POSTS
+    entries) with no database work; writes through this API drop them. On a
+    miss the post comes from the public projection when it is built and up to
+    date, else from one indexed query on the slug column, so a single article
+    never waits for the whole projection to build.
+    """
+    from services import serialization
+    from services.response_cache import CachedResponse
+    import time
+
+    site_id = _public_site_id(manager)
+    if site_id is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    hot_posts = manager.hot_posts
+    try:
+        cached = hot_posts.get(site_id, slug)
+        if cached is None:
+            version = hot_posts.version(site_id)
+            projection = manager.public_projection.current(site_id)
+            post = projection.get_by_slug(slug) if projection is not None else None
+            if post is None and (projection is None or projection.truncated):
+                # Not built yet, behind, or older than the posts the projection holds
+                post = await manager.public_projection.lookup(site_id, slug)
+            if post is None:
+                raise HTTPException(status_code=404, detail="Post not found")
+            cached = CachedResponse(site_id, serialization.dumps(post.data), time.time())
+            hot_posts.put(site_id, slug, post.post_id, cached, version)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Public API error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    return _conditional_response(request, manager.public_cache, cached)
+
+
+@app.post("/sites/{site_id}/public-projection/rebuild")
+async def rebuild_public_projection(site_id: str, manager: ConnectionManager = Depends(get_conn_manager)):
+    """
+    Rebuild a site's public projection from its database, picking up posts
+    edited outside this API, and drop its cached /api/posts responses and hot posts.
+    """
+    try:
+        manager.get_config(site_id)
+        projection = await manager.public_projection.refresh(site_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    manager.public_cache.invalidate(site_id)
+    manager.hot_posts.invalidate(site_id)
+    return {"site_id": site_id, "table": projection.table_name, "published_posts": len(projection.posts)}
+
+
+@app.get("/sites/public-projection")
+async def get_public_projection_stats(manager: ConnectionManager = Depends(get_conn_manager)):
+    """Per-site public projection sizes, ages and build counters."""
+    return manager.public_projection.snapshot()
+
+
 @app.get("/sites/{site_id}/posts/{post_id}")
 async def get_single_post(
     site_id: str,
@@ -830,49 +1107,38 @@ async def get_single_post(
 ):
     """Get a single post by ID."""
     from sqlalchemy import text
+    from services import category_index
+    from services.serialization import FastJSONResponse, RowSerializer
     
     try:
-        engine = manager.get_engine(site_id)
         config = manager.get_config(site_id)
         
-        # Use auto-discovery like content injection
-        from services.content_orchestrator import ContentOrchestrator
+        # Use auto-discovery like content injection (cached per site)
         orchestrator = ContentOrchestrator()
-        table_name = await orchestrator._resolve_target_table(site_id, engine, config)
+        table_name = await orchestrator._resolve_target_table(site_id, config)
         
-        with engine.connect() as conn:
+        async_engine = await manager.get_async_engine(site_id)
+        async with async_engine.connect() as conn:
             sql = text(f'SELECT * FROM "{table_name}" WHERE id = :id')
-            result = conn.execute(sql, {"id": post_id})
+            result = await conn.execute(sql, {"id": post_id})
             row = result.fetchone()
             
             if not row:
                 raise HTTPException(status_code=404, detail="Post not found")
             
-            post = dict(zip(result.keys(), row))
-            
-            import datetime
-            for key, value in post.items():
-                if isinstance(value, (datetime.datetime, datetime.date)):
-                    post[key] = str(value)
+            schema = await manager.schema_registry.get_async(site_id, conn)
+            post = RowSerializer.for_result(result, schema, table_name).dicts([row])[0]
             
             # Append Category
             try:
-                from sqlalchemy import inspect
-                inspector = inspect(engine)
-                if "BlogCategory" in inspector.get_table_names():
-                    cat_sql = text('''
-                        SELECT c.name 
-                        FROM "BlogCategory" bc 
-                        JOIN "Category" c ON bc."categoryId" = c."categoryId" 
-                        WHERE bc."blogId" = :id
-                    ''')
-                    cat_row = conn.execute(cat_sql, {"id": post_id}).fetchone()
-                    if cat_row:
-                        post["category"] = cat_row[0]
+                if schema.has_table("BlogCategory"):
+                    names = (await manager.category_index.categories(site_id, conn, [post_id])).get(post_id)
+                    if names:
+                        post["category"] = category_index.primary(names)
             except Exception as e:
                 print(f"Failed to fetch single post category: {e}")
             
-            return post
+            return FastJSONResponse(post)
     except ValueError as e:
         if "No active engine for site ID" in str(e) or "No config for site ID" in str(e):
             raise HTTPException(status_code=404, detail=f"Site '{site_id}' not found or not connected")
@@ -897,12 +1163,12 @@ async def update_post(
     from sqlalchemy import text
     
     try:
-        engine = manager.get_engine(site_id)
+        engine = await manager.get_async_engine(site_id)
         config = manager.get_config(site_id)
         
         from services.content_orchestrator import ContentOrchestrator
         orchestrator = ContentOrchestrator()
-        table_name = await orchestrator._resolve_target_table(site_id, engine, config)
+        table_name = await orchestrator._resolve_target_table(site_id, config)
         
         # Remove id from updates if present
         updates.pop("id", None)
@@ -947,12 +1213,12 @@ async def update_post_status(
         raise HTTPException(status_code=400, detail="Status is required")
     
     try:
-        engine = manager.get_engine(site_id)
+        engine = await manager.get_async_engine(site_id)
         config = manager.get_config(site_id)
         
         from services.content_orchestrator import ContentOrchestrator
         orchestrator = ContentOrchestrator()
-        table_name = await orchestrator._resolve_target_table(site_id, engine, config)
+        table_name = await orchestrator._resolve_target_table(site_id, config)
         
         result = await orchestrator.update_content(
             engine, 
@@ -978,55 +1244,71 @@ async def bulk_post_action(
     action_data: dict,
     manager: ConnectionManager = Depends(get_conn_manager)
 ):
-    """Perform bulk actions on multiple posts."""
-    from sqlalchemy import text
-    
-    action = action_data.get("action")
-    post_ids = action_data.get("post_ids", [])
-    
-    if not action or not post_ids:
-        raise HTTPException(status_code=400, detail="Action and post_ids are required")
-    
+    """
+    Perform bulk actions on multiple posts.
+    Body: { action: publish|draft|delete|schedule, post_ids: [...],
+    scheduled_at (schedule only), chunk_size (optional) }. Posts are processed in
+    chunks of BULK_ACTION_CHUNK_SIZE, one short transaction each; see
+    /bulk-action/stream for per-chunk progress.
+    """
+    result = None
     try:
-        engine = manager.get_engine(site_id)
-        config = manager.get_config(site_id)
-        
-        # Use auto-discovery like content injection
-        from services.content_orchestrator import ContentOrchestrator
-        orchestrator = ContentOrchestrator()
-        table_name = await orchestrator._resolve_target_table(site_id, engine, config)
-        
-        with engine.connect() as conn:
-            if action == "publish":
-                sql = text(f'''
-                    UPDATE "{table_name}" 
-                    SET status = 'published'
-                    WHERE id = ANY(:ids)
-                ''')
-            elif action == "draft":
-                sql = text(f'''
-                    UPDATE "{table_name}" 
-                    SET status = 'draft'
-                    WHERE id = ANY(:ids)
-                ''')
-            elif action == "delete":
-                sql = text(f'DELETE FROM "{table_name}" WHERE id = ANY(:ids)')
-            else:
-                raise HTTPException(status_code=400, detail=f"Unknown action: {action}")
-            
-            result = conn.execute(sql, {"ids": post_ids})
-            conn.commit()
-            
-            return {
-                "status": "success",
-                "action": action,
-                "affected_count": result.rowcount
-            }
-    except HTTPException:
-        raise
+        async for event in manager.bulk_actions.run(
+            site_id, action_data.get("action"), action_data.get("post_ids") or [],
+            scheduled_at=action_data.get("scheduled_at"), chunk_size=action_data.get("chunk_size"),
+        ):
+            result = event
+    except Exception as e:
+        detail = str(e)
+        if result is not None:
+            detail += f" (stopped after {result['processed']} of {result['total']} posts; earlier chunks were applied)"
+        raise HTTPException(status_code=400, detail=detail)
+
+    return {
+        "status": "success",
+        "action": result["action"],
+        "affected_count": result["affected_count"]
+    }
+
+
+@app.post("/sites/{site_id}/posts/bulk-action/stream")
+async def bulk_post_action_stream(
+    site_id: str,
+    action_data: dict,
+    manager: ConnectionManager = Depends(get_conn_manager)
+):
+    """
+    Streaming variant of bulk-action (NDJSON, like /generate/stream): one
+    "progress" line per committed chunk, then "complete", or "error" with the
+    chunks applied so far if a chunk fails.
+    """
+    events = manager.bulk_actions.run(
+        site_id, action_data.get("action"), action_data.get("post_ids") or [],
+        scheduled_at=action_data.get("scheduled_at"), chunk_size=action_data.get("chunk_size"),
+    )
+    try:
+        # Bad requests fail before the stream starts
+        first = await events.__anext__()
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    async def event_generator():
+        last = first
+        yield json.dumps(first) + "\n"
+        try:
+            async for event in events:
+                last = event
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            yield json.dumps({
+                "status": "error",
+                "message": str(e),
+                "processed": last.get("processed", 0),
+                "affected_count": last.get("affected_count", 0),
+            }) + "\n"
+
+    return StreamingResponse(event_generator(), media_type="application/x-ndjson")
+
 
 @app.delete("/sites/{site_id}/posts/{post_id}")
 async def delete_post(
@@ -1038,22 +1320,26 @@ async def delete_post(
     from sqlalchemy import text
     
     try:
-        engine = manager.get_engine(site_id)
         config = manager.get_config(site_id)
         
-        # Use auto-discovery like content injection
-        from services.content_orchestrator import ContentOrchestrator
+        # Use auto-discovery like content injection (cached per site)
         orchestrator = ContentOrchestrator()
-        table_name = await orchestrator._resolve_target_table(site_id, engine, config)
+        table_name = await orchestrator._resolve_target_table(site_id, config)
         
-        with engine.connect() as conn:
-            sql = text(f'DELETE FROM "{table_name}" WHERE id = :id RETURNING id')
-            result = conn.execute(sql, {"id": post_id})
-            conn.commit()
+        async_engine = await manager.get_async_engine(site_id)
+        async with async_engine.connect() as conn:
+            sql = text(f'DELETE FROM "{table_name}" WHERE id = :id RETURNING id, status')
+            result = await conn.execute(sql, {"id": post_id})
+            row = result.fetchone()
+            await conn.commit()
             
-            if result.rowcount == 0:
+            if row is None:
                 raise HTTPException(status_code=404, detail="Post not found")
             
+            manager.post_counter.record_delete(site_id, table_name, {row[1]: 1})
+            manager.category_index.forget_posts(site_id, [post_id])
+            manager.posts_changed(site_id, [post_id])
+            
             return {"status": "deleted", "post_id": post_id}
     except HTTPException:
         raise
@@ -1172,27 +1458,29 @@ async def unschedule_post(
     from sqlalchemy import text
     
     try:
-        engine = manager.get_engine(site_id)
         config = manager.get_config(site_id)
         
-        # Use auto-discovery like content injection
+        # Use auto-discovery like content injection (cached per site)
         orchestrator = ContentOrchestrator()
-        table_name = await orchestrator._resolve_target_table(site_id, engine, config)
+        table_name = await orchestrator._resolve_target_table(site_id, config)
         
-        with engine.connect() as conn:
+        async_engine = await manager.get_async_engine(site_id)
+        async with async_engine.connect() as conn:
             sql = text(f'''
                 UPDATE "{table_name}" 
                 SET status = 'draft', scheduled_at = NULL
                 WHERE id = :id AND status = 'scheduled'
                 RETURNING id, status
             ''')
-            result = conn.execute(sql, {"id": post_id})
-            conn.commit()
-            
+            result = await conn.execute(sql, {"id": post_id})
             row = result.fetchone()
+            await conn.commit()
+            
             if not row:
                 raise HTTPException(status_code=404, detail="Scheduled post not found")
             
+            manager.post_counter.record_status_change(site_id, table_name, {"scheduled": 1}, "draft")
+            
             return {
                 "status": "unscheduled", 
                 "post_id": row[0], 
@@ -0,0 +1,36 @@
+"""
+Rebuild the public /api/posts projection of one or more sites on a running server,
+e.g. after posts were edited directly in a site's database.
+
+    python rebuild_public_projection.py                # every configured site
+    python rebuild_public_projection.py algotrading    # just these sites
+
+The server is reached at SERVER_URL (default http://localhost:8000).
+"""
+import json
+import os
+import sys
+import urllib.request
+
+SERVER_URL = os.getenv("SERVER_URL", "http://localhost:8000").rstrip("/")
+
+
+def _request(method: str, path: str):
+    req = urllib.request.Request(f"{SERVER_URL}{path}", method=method)
+    with urllib.request.urlopen(req, timeout=120) as resp:
+        return json.loads(resp.read())
+
+
+def rebuild_public_projection(site_ids):
+    if not site_ids:
+        site_ids = [site["id"] for site in _request("GET", "/sites")]
+    for site_id in site_ids:
+        try:
+            result = _request("POST", f"/sites/{site_id}/public-projection/rebuild")
+            print(f"Rebuilt {site_id}: {result['published_posts']} published posts from {result['table']}")
+        except Exception as e:
+            print(f"Rebuild failed for {site_id}: {e}")
+
+
+if __name__ == "__main__":
+    rebuild_public_projection(sys.argv[1:])
@@ -0,0 +1,143 @@
+"""
+Chunked bulk actions on a site's posts (publish, draft, delete, schedule).
+
+Ids are processed in chunks of BULK_ACTION_CHUNK_SIZE, each in its own short
+transaction, so a large cleanup never holds one long lock or builds one huge
+statement. Ids are bound as an array with = ANY(:ids) on PostgreSQL and as an
+expanded IN (...) list elsewhere (SQLite, MySQL). After every committed chunk
+the post counters, category index and public caches are updated for exactly
+the rows it touched, and a progress event is yielded to the caller.
+"""
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+import asyncio
+import datetime
+
+from sqlalchemy import bindparam, text
+
+ACTIONS = ("publish", "draft", "delete", "schedule")
+STATUS_FOR_ACTION = {"publish": "published", "draft": "draft", "schedule": "scheduled"}
+
+
+def parse_post_ids(post_ids: Iterable) -> List[int]:
+    """Integer ids in request order, without duplicates."""
+    try:
+        ids = [int(post_id) for post_id in post_ids]
+    except (TypeError, ValueError):
+        raise ValueError("post_ids must be a list of integer ids.")
+    return list(dict.fromkeys(ids))
+
+
+def parse_scheduled_at(value) -> datetime.datetime:
+    if isinstance(value, datetime.datetime):
+        return value
+    try:
+        return datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid scheduled_at '{value}'; use an ISO 8601 timestamp.")
+
+
+class BulkActions:
+    def __init__(self, manager, chunk_size: int = 500):
+        self.manager = manager
+        self.chunk_size = max(1, chunk_size)
+
+    @staticmethod
+    def _ids_clause(dialect: str):
+        """WHERE fragment matching :ids, and the bind parameter it needs (if any)."""
+        if dialect == "postgresql":
+            return "id = ANY(:ids)", None
+        return "id IN :ids", bindparam("ids", expanding=True)
+
+    def _statements(self, dialect: str, table_name: str, action: str):
+        where, ids_param = self._ids_clause(dialect)
+        before = text(f'SELECT id, status FROM "{table_name}" WHERE {where}')
+        if action == "delete":
+            write = text(f'DELETE FROM "{table_name}" WHERE {where}')
+        elif action == "schedule":
+            write = text(f'UPDATE "{table_name}" SET status = :status, scheduled_at = :scheduled_at WHERE {where}')
+        else:
+            write = text(f'UPDATE "{table_name}" SET status = :status WHERE {where}')
+        if ids_param is not None:
+            before, write = before.bindparams(ids_param), write.bindparams(ids_param)
+        return before, write
+
+    async def _ensure_scheduled_at(self, site_id: str, engine, table_name: str):
+        """Add the scheduled_at column when the table doesn't have one yet (like single-post scheduling)."""
+        schema = await self.manager.schema_registry.get_async(site_id)
+        if "scheduled_at" in {col["name"].lower() for col in schema.columns(table_name)}:
+            return
+        async with engine.begin() as conn:
+            await conn.execute(text(f'ALTER TABLE "{table_name}" ADD COLUMN "scheduled_at" TIMESTAMP'))
+        self.manager.invalidate_schema(site_id)
+
+    async def run(self, site_id: str, action: str, post_ids: Iterable,
+                  scheduled_at=None, chunk_size: Optional[int] = None) -> AsyncIterator[Dict]:
+        """
+        Apply action to post_ids chunk by chunk, yielding a "progress" event per
+        committed chunk and a final "complete" event. A failing chunk raises;
+        chunks before it stay committed (see the last progress event).
+        """
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action: {action}")
+        ids = parse_post_ids(post_ids)
+        if not ids:
+            raise ValueError("Action and post_ids are required")
+        params = {}
+        if action in STATUS_FOR_ACTION:
+            params["status"] = STATUS_FOR_ACTION[action]
+        if action == "schedule":
+            if not scheduled_at:
+                raise ValueError("scheduled_at is required to schedule posts.")
+            params["scheduled_at"] = parse_scheduled_at(scheduled_at)
+        size = max(1, chunk_size or self.chunk_size)
+
+        config = self.manager.get_config(site_id)
+        engine = await self.manager.get_async_engine(site_id)
+        async with engine.connect() as conn:
+            table_name = await self.manager.resolve_table_name_async(conn, config.target_table_name, site_id=site_id)
+        if action == "schedule":
+            await self._ensure_scheduled_at(site_id, engine, table_name)
+        before_sql, write_sql = self._statements(engine.dialect.name, table_name, action)
+
+        processed = affected = 0
+        chunks = (len(ids) + size - 1) // size
+        for number, start in enumerate(range(0, len(ids), size), 1):
+            chunk = ids[start:start + size]
+            async with engine.begin() as conn:
+                # Statuses of the rows actually present keep the post counters exact
+                rows = (await conn.execute(before_sql, {"ids": chunk})).fetchall()
+                await conn.execute(write_sql, {**params, "ids": chunk})
+            self._record(site_id, table_name, action, rows)
+
+            processed += len(chunk)
+            affected += len(rows)
+            yield {
+                "status": "progress",
+                "action": action,
+                "chunk": number,
+                "chunks": chunks,
+                "processed": processed,
+                "total": len(ids),
+                "affected_count": affected,
+            }
+            # Let other requests use the event loop (and the table) between chunks
+            await asyncio.sleep(0)
+
+        print(f"[BULK] {action} on {site_id}.{table_name}: {affected} of {len(ids)} posts in {chunks} chunk(s)")
+        yield {"status": "complete", "action": action, "total": len(ids), "affected_count": affected}
+
+    def _record(self, site_id: str, table_name: str, action: str, rows):
+        """Update counters and caches for the rows one committed chunk touched."""
+        if not rows:
+            return
+        old_statuses: Dict = {}
+        for _, status in rows:
+            old_statuses[status] = old_statuses.get(status, 0) + 1
+        touched = [row[0] for row in rows]
+
+        if action == "delete":
+            self.manager.post_counter.record_delete(site_id, table_name, old_statuses)
+            self.manager.category_index.forget_posts(site_id, touched)
+        else:
+            self.manager.post_counter.record_status_change(site_id, table_name, old_statuses, STATUS_FOR_ACTION[action])
+        self.manager.posts_changed(site_id, touched)
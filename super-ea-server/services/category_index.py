@@ -0,0 +1,195 @@
+"""
+Per-site in-memory index of Prisma categories.
+
+Listings, the public projection and category injection used to join
+"BlogCategory" to "Category" (or look a category up by name) on every call.
+The index keeps, per site:
+  * categoryId <-> name for the whole "Category" table (small), and
+  * blogId -> category names for recently read posts (bounded LRU),
+so decorating a page of posts is a dictionary lookup once its posts are warm.
+Misses are fetched in one parameterized batch query on "BlogCategory" alone.
+Writes made through this API update the index as they happen; everything is
+reloaded after SITE_CATEGORY_CACHE_TTL or a schema refresh so edits made
+outside this API are picked up.
+"""
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+import datetime
+import threading
+import time
+
+from sqlalchemy import bindparam, text
+
+# Link rows in insertion order, so each post's names start with its first-linked category
+_LINKS_SQL = text('SELECT "blogId", "categoryId" FROM "BlogCategory" WHERE "blogId" IN :ids ORDER BY id').bindparams(
+    bindparam("ids", expanding=True)
+)
+
+
+def primary(names: Iterable[str]) -> Optional[str]:
+    """
+    The one category shown for a post with several: the first one linked, as
+    names come in link order (see _LINKS_SQL).
+    """
+    return next(iter(names), None)
+
+
+class SiteCategories:
+    def __init__(self, names: Dict[int, str]):
+        # categoryId -> name, and back
+        self.names = names
+        self.ids = {name: category_id for category_id, name in names.items()}
+        # blogId -> category names, most recently used last
+        self.posts: "OrderedDict[int, List[str]]" = OrderedDict()
+        self.loaded_at = time.time()
+
+    def add_category(self, category_id: int, name: str):
+        self.names[category_id] = name
+        self.ids[name] = category_id
+
+
+class CategoryIndex:
+    def __init__(self, ttl: float = 600, max_posts: int = 5000):
+        self.ttl = ttl
+        self.max_posts = max(1, max_posts)
+        self.sites: Dict[str, SiteCategories] = {}
+        # Writes run on worker threads as well as the event loop
+        self._lock = threading.Lock()
+        self.stats = {"loads": 0, "post_hits": 0, "post_misses": 0}
+
+    def _cached(self, site_id: str) -> Optional[SiteCategories]:
+        site = self.sites.get(site_id)
+        if site is not None and self.ttl and time.time() - site.loaded_at > self.ttl:
+            return None
+        return site
+
+    def _store(self, site_id: str, rows) -> SiteCategories:
+        site = SiteCategories({category_id: name for category_id, name in rows})
+        with self._lock:
+            self.sites[site_id] = site
+        self.stats["loads"] += 1
+        return site
+
+    async def site(self, site_id: str, conn, reload: bool = False) -> SiteCategories:
+        """The site's category names, loaded with one query when missing or expired."""
+        site = None if reload else self._cached(site_id)
+        if site is None:
+            rows = (await conn.execute(text('SELECT "categoryId", name FROM "Category"'))).fetchall()
+            site = self._store(site_id, rows)
+        return site
+
+    async def category_id(self, site_id: str, conn, name: str) -> Optional[int]:
+        """categoryId of a category name, or None if the site has no such category."""
+        return (await self.site(site_id, conn)).ids.get(name)
+
+    async def _names(self, site_id: str, conn, site: SiteCategories, links) -> Dict[int, List[str]]:
+        """Group (blogId, categoryId) rows into blogId -> names, reloading names for unknown ids."""
+        if any(category_id not in site.names for _, category_id in links):
+            # Category created outside this API since the names were loaded
+            site = await self.site(site_id, conn, reload=True)
+        by_blog: Dict[int, List[str]] = {}
+        for blog_id, category_id in links:
+            name = site.names.get(category_id)
+            if name is not None:
+                by_blog.setdefault(blog_id, []).append(name)
+        return by_blog
+
+    async def categories(self, site_id: str, conn, blog_ids: Iterable) -> Dict[int, List[str]]:
+        """Category names of each post in blog_ids (warm posts cost no database work)."""
+        site = await self.site(site_id, conn)
+        found: Dict[int, List[str]] = {}
+        missing = []
+        with self._lock:
+            for blog_id in blog_ids:
+                names = site.posts.get(blog_id)
+                if names is None:
+                    missing.append(blog_id)
+                else:
+                    site.posts.move_to_end(blog_id)
+                    found[blog_id] = names
+        self.stats["post_hits"] += len(found)
+        if not missing:
+            return found
+
+        self.stats["post_misses"] += len(missing)
+        links = (await conn.execute(_LINKS_SQL, {"ids": [int(blog_id) for blog_id in missing]})).fetchall()
+        loaded = await self._names(site_id, conn, site, links)
+        site = self.sites.get(site_id, site)
+        with self._lock:
+            for blog_id in missing:
+                # Posts without categories are remembered too
+                found[blog_id] = site.posts[blog_id] = loaded.get(blog_id, [])
+            while len(site.posts) > self.max_posts:
+                site.posts.popitem(last=False)
+        return found
+
+    async def all_links(self, site_id: str, conn) -> Dict[int, List[str]]:
+        """blogId -> names for every post (full projection builds); not kept in the post LRU."""
+        site = await self.site(site_id, conn)
+        links = (await conn.execute(text('SELECT "blogId", "categoryId" FROM "BlogCategory" ORDER BY id'))).fetchall()
+        return await self._names(site_id, conn, site, links)
+
+    async def ensure_category(self, site_id: str, conn, name: str) -> int:
+        """
+        categoryId for name, creating the category when it doesn't exist yet.
+        Runs on the caller's transaction; known names need no query.
+        """
+        site = await self.site(site_id, conn)
+        category_id = site.ids.get(name)
+        if category_id is not None:
+            return category_id
+
+        # Not in the index: it may have been created outside this API since the last load
+        category_id = (await conn.execute(
+            text('SELECT "categoryId" FROM "Category" WHERE name = :name'), {"name": name}
+        )).scalar()
+        if category_id is None:
+            # Prisma requires both `id` and `categoryId` in schema
+            category_id = ((await conn.execute(text('SELECT MAX("categoryId") FROM "Category"'))).scalar() or 0) + 1
+            now = datetime.datetime.utcnow()
+            await conn.execute(text('''
+                INSERT INTO "Category" ("categoryId", name, status, "createdAt", "updatedAt")
+                VALUES (:cid, :name, 'active', :now, :now)
+            '''), {"cid": category_id, "name": name, "now": now})
+            print(f"[CATEGORY INDEX] Created category '{name}' ({category_id}) for {site_id}")
+        with self._lock:
+            site.add_category(category_id, name)
+        return category_id
+
+    def set_post(self, site_id: str, blog_id: int, names: List[str]):
+        """Record a post's categories after a committed write."""
+        with self._lock:
+            site = self.sites.get(site_id)
+            if site is None:
+                return
+            site.posts[int(blog_id)] = list(names)
+            site.posts.move_to_end(int(blog_id))
+            while len(site.posts) > self.max_posts:
+                site.posts.popitem(last=False)
+
+    def forget_posts(self, site_id: str, blog_ids: Optional[Iterable] = None):
+        """Drop cached categories of blog_ids (all posts when None)."""
+        with self._lock:
+            site = self.sites.get(site_id)
+            if site is None:
+                return
+            if blog_ids is None:
+                site.posts.clear()
+                return
+            for blog_id in blog_ids:
+                site.posts.pop(int(blog_id), None)
+
+    def invalidate(self, site_id: str):
+        with self._lock:
+            self.sites.pop(site_id, None)
+
+    def snapshot(self) -> Dict:
+        return {
+            "ttl": self.ttl,
+            "max_posts": self.max_posts,
+            **self.stats,
+            "sites": {
+                site_id: {"categories": len(site.names), "posts": len(site.posts)}
+                for site_id, site in self.sites.items()
+            },
+        }
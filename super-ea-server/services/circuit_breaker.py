@@ -0,0 +1,101 @@
+"""
+Per-site circuit breaker for tenant database connectivity.
+
+While a site's database is unreachable, callers fail fast with SiteUnavailableError
+instead of each paying the full connect timeout. Recovery is probed with
+exponential backoff (closed -> open -> half_open -> closed).
+"""
+from typing import Dict, Optional
+import threading
+import time
+
+
+class SiteUnavailableError(ValueError):
+    """Raised while a site's circuit is open."""
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, site_id: str, failure_threshold: int = 2, base_backoff: float = 5.0, max_backoff: float = 300.0):
+        self.site_id = site_id
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self.state = self.CLOSED
+        self.failures = 0        # consecutive failures
+        self.trips = 0           # consecutive opens, drives the backoff exponent
+        self.opened_at: Optional[float] = None
+        self.next_probe_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_attempt(self):
+        """
+        Gate a connect attempt. Passes when closed, lets exactly one probe through
+        once the backoff has elapsed, and raises SiteUnavailableError otherwise.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+
+            now = time.time()
+            if self.state == self.OPEN and now >= self.next_probe_at:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+
+            retry_in = max(0, int(self.next_probe_at - now))
+            raise SiteUnavailableError(
+                f"Site '{self.site_id}' is unavailable (circuit {self.state}, next probe in {retry_in}s). "
+                f"Last error: {self.last_error}"
+            )
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"[BREAKER] {self.site_id}: closed after successful probe")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.trips = 0
+            self.opened_at = None
+            self.next_probe_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self, error: Exception) -> bool:
+        """Count a failure. Returns True if this failure opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                now = time.time()
+                self.trips += 1
+                backoff = min(self.max_backoff, self.base_backoff * (2 ** (self.trips - 1)))
+                self.state = self.OPEN
+                self.opened_at = now
+                self.next_probe_at = now + backoff
+                print(f"[BREAKER] {self.site_id}: open for {backoff:.0f}s after {self.failures} failure(s)")
+                return True
+            return False
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            next_probe_in = None
+            if self.next_probe_at is not None:
+                next_probe_in = max(0.0, round(self.next_probe_at - time.time(), 1))
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "opened_at": self.opened_at,
+                "next_probe_in": next_probe_in,
+                "last_error": self.last_error,
+            }
@@ -1,13 +1,29 @@
-from typing import Dict, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Optional, Set
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import asyncio
+import hashlib
 import os
+import threading
+import time
 from sqlalchemy import create_engine, inspect
-from sqlalchemy.engine import Engine
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
 from pydantic import BaseModel, validator
 
 # Import database session and model
-from database import AdminSessionLocal, SiteConnection
+from database import AdminSessionLocal, SiteConnection, SiteStats
+from services.circuit_breaker import CircuitBreaker, SiteUnavailableError
+from services.pool_governor import PoolGovernor
+from services.schema_registry import SchemaRegistry
+from services.stats_refresher import StatsRefresher
+from services.post_counter import PostCounter
+from services.search import SiteSearch
+from services.response_cache import ResponseCache
+from services.public_projection import PublicProjection
+from services.hot_posts import HotPostCache
+from services.category_index import CategoryIndex
+from services.bulk_actions import BulkActions
 
 
 class DatabaseConfig(BaseModel):
@@ -36,24 +52,126 @@ class DatabaseConfig(BaseModel):
         return v
 
 
+# Async drivers used for the per-site AsyncEngine layer, keyed by backend name
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+}
+
+# libpq-only URL options that asyncpg.connect() does not accept
+ASYNCPG_UNSUPPORTED_QUERY_KEYS = ("sslmode", "channel_binding", "connect_timeout")
+
+# Used to normalize URLs that omit the port, so equivalent connection strings share an engine
+DEFAULT_PORTS = {"postgresql": 5432, "mysql": 3306}
+
+
+def _is_connectivity_error(exc: Exception) -> bool:
+    """True for errors that mean the site DB is unreachable, as opposed to a bad query."""
+    if isinstance(exc, DBAPIError) and exc.connection_invalidated:
+        return True
+    return isinstance(exc, (OperationalError, InterfaceError, ConnectionError, TimeoutError, asyncio.TimeoutError))
+
+
 class ConnectionManager:
     _instance = None
+    _instance_lock = threading.Lock()
     
     def __init__(self):
         self.connections: Dict[str, DatabaseConfig] = {}
         self.engines: Dict[str, Engine] = {}
+        # Non-blocking engines used by the async API handlers
+        self.async_engines: Dict[str, AsyncEngine] = {}
+        # Sites pointing at the same database share one engine per kind, keyed by
+        # "<normalized url>:<kind>" and reference-counted by the site ids using it
+        self.shared_engines: Dict[str, object] = {}
+        self.engine_refs: Dict[str, Set[str]] = {}
+        self.db_keys: Dict[str, str] = {}
+        # Single-flight engine creation (per pool key): one caller connects, concurrent callers wait on its result
+        self._engine_lock = threading.Lock()
+        self._engine_inflight: Dict[str, Future] = {}
+        self._async_engine_inflight: Dict[str, asyncio.Task] = {}
+        self.connect_stats = {"connects": 0, "coalesced": 0, "shared": 0}
+        # Per-site circuit breakers so an unreachable tenant fails fast
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.breaker_failure_threshold = max(1, int(os.getenv("SITE_BREAKER_FAILURE_THRESHOLD", "2")))
+        self.breaker_base_backoff = max(1.0, float(os.getenv("SITE_BREAKER_BASE_BACKOFF", "5")))
+        self.breaker_max_backoff = max(self.breaker_base_backoff, float(os.getenv("SITE_BREAKER_MAX_BACKOFF", "300")))
         # timestamped cache: { site_id: { "data": dict, "timestamp": float } }
         self.site_stats_cache: Dict[str, Dict] = {} 
+        # Incrementally maintained / estimated post counts per site
+        self.post_counter = PostCounter(self, exact_ttl=max(1, int(os.getenv("SITE_COUNT_EXACT_TTL", "600"))))
+        # Category names and recently read posts' categories, per site
+        self.category_index = CategoryIndex(
+            ttl=max(0, int(os.getenv("SITE_CATEGORY_CACHE_TTL", "600"))),
+            max_posts=max(1, int(os.getenv("SITE_CATEGORY_CACHE_POSTS", "5000"))),
+        )
+        # Per-site pipelines of /super-publish, /preview and /validate run concurrently
+        self.distribution_concurrency = max(1, int(os.getenv("DISTRIBUTION_CONCURRENCY", "5")))
+        self.distribution_timeout = max(1.0, float(os.getenv("DISTRIBUTION_SITE_TIMEOUT", "300")))
+        # The one long-form generation a distribution shares across its sites
+        self.generation_timeout = max(1.0, float(os.getenv("DISTRIBUTION_GENERATION_TIMEOUT", "600")))
+        # Chunked bulk publish / draft / delete / schedule
+        self.bulk_actions = BulkActions(self, chunk_size=max(1, int(os.getenv("BULK_ACTION_CHUNK_SIZE", "500"))))
+        # Ranked post search (FTS / trigram indexes where the site has them)
+        self.search = SiteSearch(
+            self,
+            deadline=max(0.1, float(os.getenv("SEARCH_SITE_DEADLINE", "3"))),
+            concurrency=max(1, int(os.getenv("SEARCH_FANOUT_CONCURRENCY", "20"))),
+        )
+        # Public feed responses (ETag / stale-while-revalidate), invalidated by our own writes
+        self.public_cache = ResponseCache(
+            ttl=max(0, int(os.getenv("PUBLIC_CACHE_TTL", "60"))),
+            stale_ttl=max(0, int(os.getenv("PUBLIC_CACHE_STALE_TTL", "600"))),
+        )
+        # Precomputed BlogPost shapes of published posts behind /api/posts
+        self.public_projection = PublicProjection(
+            self,
+            max_age=max(0, int(os.getenv("PUBLIC_PROJECTION_MAX_AGE", "1800"))),
+            max_posts=max(1, int(os.getenv("PUBLIC_PROJECTION_MAX_POSTS", "10000"))),
+        )
+        # Recently read single posts behind /api/posts/{slug}, dropped by our own writes
+        self.hot_posts = HotPostCache(
+            max_entries=max(1, int(os.getenv("PUBLIC_HOT_POSTS", "500"))),
+            ttl=self.public_projection.max_age,
+        )
+        # Bounded, deduplicated refreshes of site_stats_cache
+        self.stats_refresher = StatsRefresher(
+            self,
+            concurrency=max(1, int(os.getenv("SITE_STATS_REFRESH_CONCURRENCY", "10"))),
+            timeout=max(1, int(os.getenv("SITE_STATS_REFRESH_TIMEOUT", "15"))),
+        )
+        # Max stale sites one /sites/detailed call schedules for refresh
+        self.stats_refresh_batch = max(1, int(os.getenv("SITE_STATS_REFRESH_BATCH", "20")))
+        # { site_id: { requested_table: { "table": resolved_name, "timestamp": float } } }
+        self.table_name_cache: Dict[str, Dict[str, Dict]] = {}
+        self.table_cache_ttl = max(0, int(os.getenv("SITE_TABLE_CACHE_TTL", "600")))
+        # Reflected tables/columns/keys/enums per site, shared by the API, orchestrator and schema discovery
+        self.schema_registry = SchemaRegistry(self, ttl=max(0, int(os.getenv("SITE_SCHEMA_CACHE_TTL", "1800"))))
         self.restore_workers = max(1, int(os.getenv("SITE_RESTORE_WORKERS", "6")))
         self.connect_timeout = max(1, int(os.getenv("SITE_DB_CONNECT_TIMEOUT", "5")))
         self.eager_restore = os.getenv("SITE_EAGER_RESTORE", "false").lower() in ("1", "true", "yes", "on")
+        # Process-wide connection budget shared by every site pool
+        self.pool_governor = PoolGovernor(
+            global_max=max(1, int(os.getenv("SITE_POOL_GLOBAL_MAX", "100"))),
+            min_pool_size=max(1, int(os.getenv("SITE_POOL_MIN_SIZE", "1"))),
+            initial_pool_size=max(1, int(os.getenv("SITE_POOL_INITIAL_SIZE", "2"))),
+            max_pool_size=max(1, int(os.getenv("SITE_POOL_MAX_SIZE", "5"))),
+            max_overflow=max(0, int(os.getenv("SITE_POOL_MAX_OVERFLOW", "10"))),
+            idle_ttl=max(1, int(os.getenv("SITE_ENGINE_IDLE_TTL", "900"))),
+        )
+        self.evict_interval = max(1, int(os.getenv("SITE_ENGINE_EVICT_INTERVAL", "60")))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         # Load persisted connections from database on startup
         self._load_connections()
 
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
-            cls._instance = cls()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
         return cls._instance
 
     def _load_connections(self):
@@ -79,22 +197,73 @@ class ConnectionManager:
         except Exception as e:
             print(f"Error loading saved sites from database: {e}")
 
+        self._load_stats_cache()
+
+    def _load_stats_cache(self):
+        """Restore the persisted stats cache (with its timestamps) for known sites."""
+        try:
+            session = AdminSessionLocal()
+            saved_stats = session.query(SiteStats).all()
+            session.close()
+        except Exception as e:
+            print(f"Error loading site stats from database: {e}")
+            return
+
+        for row in saved_stats:
+            config = self.connections.get(row.site_id)
+            if config is None:
+                continue
+            stats = row.to_dict()
+            stats["name"] = config.name
+            self.site_stats_cache[row.site_id] = stats
+        print(f"Restored cached stats for {len(self.site_stats_cache)} site(s)")
+
+    def _save_stats_to_database(self, stats: Dict):
+        """Write one stats cache entry through to the admin database."""
+        try:
+            session = AdminSessionLocal()
+            row = session.query(SiteStats).filter(SiteStats.site_id == stats["id"]).first()
+            if row is None:
+                row = SiteStats(site_id=stats["id"])
+                session.add(row)
+            row.table_name = stats.get("table")
+            row.total_posts = stats.get("total_posts", 0)
+            row.exact = stats.get("exact", True)
+            row.status = stats.get("status", "error")
+            row.error = stats.get("error")
+            row.last_updated = stats.get("last_updated", 0)
+            session.commit()
+            session.close()
+        except Exception as e:
+            print(f"Error saving site stats to database: {e}")
+
+    async def save_site_stats(self, site_id: str, stats: Dict):
+        """Update the in-memory stats cache and persist it off the event loop."""
+        self.site_stats_cache[site_id] = stats
+        await asyncio.to_thread(self._save_stats_to_database, stats)
+
     def _warmup_connections_parallel(self, configs):
-        """Optionally pre-connect configured sites in parallel."""
+        """Optionally pre-connect configured sites in parallel, once per distinct database."""
+        groups: Dict[str, list] = {}
+        for config in configs:
+            groups.setdefault(self._pool_key(config.id, "sync"), []).append(config)
+
         work_items: Dict = {}
-        with ThreadPoolExecutor(max_workers=min(self.restore_workers, len(configs) or 1)) as executor:
-            for config in configs:
-                future = executor.submit(self._create_engine_and_test, config)
-                work_items[future] = config
+        with ThreadPoolExecutor(max_workers=min(self.restore_workers, len(groups) or 1)) as executor:
+            for key, group in groups.items():
+                future = executor.submit(self._create_engine_and_test, group[0], key)
+                work_items[future] = (key, group)
 
             for future in as_completed(work_items):
-                config = work_items[future]
+                key, group = work_items[future]
+                names = ", ".join(config.name for config in group)
                 try:
                     engine = future.result()
-                    self.engines[config.id] = engine
-                    print(f"Restored connection: {config.name}")
+                    for config in group:
+                        engine = self._attach_engine(config.id, "sync", key, engine)
+                    print(f"Restored connection: {names}")
                 except Exception as e:
-                    print(f"Restore skipped for {config.name}: {self._format_db_error(e)}")
+                    print(f"Restore skipped for {names}: {self._format_db_error(e)}")
 
     def _format_db_error(self, exc: Exception) -> str:
         """Return a short DB error message without SQLAlchemy docs noise."""
@@ -122,36 +291,73 @@ class ConnectionManager:
 
         return normalized
 
-    def resolve_table_name(self, engine: Engine, configured_table_name: Optional[str]) -> str:
+    def get_cached_table_name(self, site_id: str, requested_table: str) -> Optional[str]:
+        """Return a resolved table name from the per-site cache if it is still fresh."""
+        entry = self.table_name_cache.get(site_id, {}).get(requested_table)
+        if entry and time.time() - entry["timestamp"] < self.table_cache_ttl:
+            return entry["table"]
+        return None
+
+    def cache_table_name(self, site_id: str, requested_table: str, resolved_table: str):
+        self.table_name_cache.setdefault(site_id, {})[requested_table] = {
+            "table": resolved_table,
+            "timestamp": time.time(),
+        }
+
+    def invalidate_table_cache(self, site_id: str):
+        """Forget every table-name resolution for a site (config change, deletion, manual refresh)."""
+        self.table_name_cache.pop(site_id, None)
+
+    def invalidate_schema(self, site_id: str):
+        """Drop the site's reflected schema together with the table names and categories resolved from it."""
+        self.schema_registry.invalidate(site_id)
+        self.invalidate_table_cache(site_id)
+        self.category_index.invalidate(site_id)
+
+    def posts_changed(self, site_id: Optional[str], post_ids=None):
+        """
+        Note a write to a site's posts made through this API: the public projection
+        re-reads those ids (all posts when post_ids is None) and cached public
+        responses and hot posts are dropped. Safe to call from worker threads.
+        """
+        if not site_id:
+            return
+        self.public_projection.mark_changed(site_id, post_ids)
+        self.public_cache.invalidate(site_id)
+        self.hot_posts.invalidate(site_id, post_ids)
+
+    def resolve_table_name(
+        self,
+        engine: Engine,
+        configured_table_name: Optional[str],
+        site_id: Optional[str] = None,
+        force_refresh: bool = False,
+    ) -> str:
         """
         Resolve the best queryable table name with recovery for common
         misconfigurations (case mismatch and singular/plural blog names).
+        With a site_id the lookup is answered from the schema registry and
+        cached for SITE_TABLE_CACHE_TTL seconds.
         """
         target_table = self.normalize_table_name(configured_table_name)
-        inspector = inspect(engine)
+        if not site_id:
+            return self._match_table_name(inspect(engine).get_table_names(), target_table)
 
-        # Prefer exact configured/default name first.
-        has_exact = False
-        try:
-            has_exact = inspector.has_table(target_table)
-        except Exception:
-            has_exact = False
-
-        if not has_exact:
-            try:
-                has_exact = inspector.has_table(target_table)
-            except Exception:
-                has_exact = False
-
-        if has_exact:
-            return target_table
+        if force_refresh:
+            self.schema_registry.invalidate(site_id)
+        else:
+            cached = self.get_cached_table_name(site_id, target_table)
+            if cached:
+                return cached
 
-        try:
-            all_tables = inspector.get_table_names()
-        except Exception:
-            all_tables = inspector.get_table_names()
+        schema = self.schema_registry.get(site_id, bind=engine)
+        resolved = self._match_table_name(schema.table_names, target_table)
+        self.cache_table_name(site_id, target_table, resolved)
+        return resolved
 
-        if not all_tables:
+    def _match_table_name(self, all_tables, target_table: str) -> str:
+        """Pick the table to query for target_table out of the site's table list."""
+        if not all_tables or target_table in all_tables:
             return target_table
 
         target_lower = target_table.lower()
@@ -178,13 +384,40 @@ class ConnectionManager:
 
         return target_table
 
-    def _build_engine_kwargs(self, config: DatabaseConfig) -> Dict:
+    async def resolve_table_name_async(
+        self,
+        conn: AsyncConnection,
+        configured_table_name: Optional[str],
+        site_id: Optional[str] = None,
+        force_refresh: bool = False,
+    ) -> str:
+        """Async counterpart of resolve_table_name; cache hits never touch the connection."""
+        target_table = self.normalize_table_name(configured_table_name)
+        if not site_id:
+            all_tables = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names())
+            return self._match_table_name(all_tables, target_table)
+
+        if force_refresh:
+            self.schema_registry.invalidate(site_id)
+        else:
+            cached = self.get_cached_table_name(site_id, target_table)
+            if cached:
+                return cached
+
+        schema = await self.schema_registry.get_async(site_id, conn)
+        resolved = self._match_table_name(schema.table_names, target_table)
+        self.cache_table_name(site_id, target_table, resolved)
+        return resolved
+
+    def _build_engine_kwargs(self, config: DatabaseConfig, is_async: bool = False) -> Dict:
         """Build SQLAlchemy engine kwargs with bounded connection timeout."""
         db_type = (config.db_type or "").lower()
         conn = (config.connection_string or "").lower()
         
         # SQLite doesn't support connection pooling size or timeouts in the same way
         if db_type == "sqlite" or conn.startswith("sqlite"):
+            if is_async:
+                return {"pool_pre_ping": True}
             return {
                 "pool_pre_ping": True,
                 "connect_args": {"check_same_thread": False}
@@ -201,7 +434,8 @@ class ConnectionManager:
         connect_args = {}
 
         if db_type == "postgresql" or conn.startswith("postgresql"):
-            connect_args["connect_timeout"] = self.connect_timeout
+            # asyncpg names its connect timeout "timeout"
+            connect_args["timeout" if is_async else "connect_timeout"] = self.connect_timeout
         elif db_type == "mysql" or conn.startswith("mysql"):
             connect_args["connect_timeout"] = self.connect_timeout
 
@@ -210,16 +444,171 @@ class ConnectionManager:
 
         return kwargs
 
-    def _create_engine_and_test(self, config: DatabaseConfig) -> Engine:
+    def _normalize_db_url(self, config: DatabaseConfig) -> str:
+        """
+        Identity of the physical database behind a site: backend, user, host, port,
+        database and options, with the credentials folded into a short digest so
+        the key can be shown in pool usage without leaking them.
+        """
+        url = make_url(config.connection_string)
+        backend = url.get_backend_name()
+        if backend == "postgres":
+            backend = "postgresql"
+
+        if backend == "sqlite":
+            database = url.database or ""
+            if not database or database == ":memory:":
+                # In-memory databases are private to their engine
+                return f"sqlite:memory:{config.id}"
+            return f"sqlite:///{os.path.abspath(database)}"
+
+        host = (url.host or "").lower()
+        port = url.port or DEFAULT_PORTS.get(backend)
+        query = "&".join(f"{k}={v}" for k, v in sorted(url.query.items()))
+        identity = f"{backend}|{url.username}|{url.password}|{host}|{port}|{url.database}|{query}"
+        digest = hashlib.sha1(identity.encode()).hexdigest()[:8]
+        return f"{backend}://{url.username or ''}@{host}:{port}/{url.database}#{digest}"
+
+    def _pool_key(self, site_id: str, kind: str) -> str:
+        """Key of the (possibly shared) engine a site uses for the given kind."""
+        db_key = self.db_keys.get(site_id)
+        if db_key is None:
+            db_key = self._normalize_db_url(self.connections[site_id])
+            self.db_keys[site_id] = db_key
+        return f"{db_key}:{kind}"
+
+    def _attach_engine(self, site_id: str, kind: str, key: str, engine):
+        """
+        Register a site as a user of the engine under key and return the engine it
+        should use. If another engine was published for the key in the meantime,
+        that one wins and the redundant one is disposed.
+        """
+        registry = self.async_engines if kind == "async" else self.engines
+        with self._engine_lock:
+            current = self.shared_engines.setdefault(key, engine)
+            self.engine_refs.setdefault(key, set()).add(site_id)
+            registry[site_id] = current
+        if current is not engine:
+            # The redundant engine's reservation goes with it; the winner's stays
+            self.pool_governor.release(key)
+            self._dispose(kind, engine, key)
+        return current
+
+    def _dispose(self, kind: str, engine, label: str):
+        try:
+            if kind == "async":
+                self._dispose_async_engine(engine)
+            else:
+                engine.dispose()
+        except Exception as e:
+            print(f"Error disposing {kind} engine {label}: {e}")
+
+    def _governed_engine_kwargs(self, config: DatabaseConfig, key: str, is_async: bool = False) -> Dict:
+        """
+        Engine kwargs with pool size and overflow granted by the pool governor.
+        When the global cap is reached, least-recently-used idle engines are evicted to make room.
+        """
+        kwargs = self._build_engine_kwargs(config, is_async=is_async)
+        sized = "pool_size" in kwargs
+
+        reservation = self.pool_governor.reserve(key, sized=sized)
+        if reservation is None:
+            for idle_key in self.pool_governor.idle_candidates():
+                # Never the key's own engine (a second one is being built for it)
+                if idle_key == key or not self._drop_engine_by_key(idle_key):
+                    continue
+                print(f"[POOL] Evicted idle engine {idle_key} to make room for {key}")
+                reservation = self.pool_governor.reserve(key, sized=sized)
+                if reservation is not None:
+                    break
+
+        if reservation is None:
+            usage = self.pool_governor.snapshot()
+            raise ValueError(
+                f"Site connection budget exhausted for {config.name} "
+                f"({usage['allocated']}/{usage['global_max']} connections reserved, none idle)"
+            )
+
+        if sized:
+            kwargs["pool_size"], kwargs["max_overflow"] = reservation
+        return kwargs
+
+    def _create_engine_and_test(self, config: DatabaseConfig, key: Optional[str] = None) -> Engine:
         """Create an engine and immediately test connectivity."""
-        engine = create_engine(
-            config.connection_string,
-            **self._build_engine_kwargs(config)
-        )
-        with engine.connect():
-            pass
+        key = key or f"{self._normalize_db_url(config)}:sync"
+        # Raises without reserving when the budget is exhausted
+        kwargs = self._governed_engine_kwargs(config, key)
+        try:
+            engine = create_engine(config.connection_string, **kwargs)
+            self.pool_governor.attach(key, engine)
+            with engine.connect():
+                pass
+        except Exception:
+            self.pool_governor.release(key)
+            raise
         return engine
 
+    def _build_async_url(self, config: DatabaseConfig):
+        """
+        Translate a site's sync connection string into its async-driver URL,
+        e.g. postgresql://... -> postgresql+asyncpg://...
+        """
+        url = make_url(config.connection_string)
+        backend = url.get_backend_name()
+        async_driver = ASYNC_DRIVERS.get(backend)
+        if not async_driver:
+            raise ValueError(f"No async driver available for '{backend}' ({config.name})")
+
+        url = url.set(drivername=async_driver)
+
+        if async_driver == "postgresql+asyncpg":
+            # asyncpg takes "ssl" instead of libpq's "sslmode"
+            sslmode = url.query.get("sslmode")
+            url = url.difference_update_query(ASYNCPG_UNSUPPORTED_QUERY_KEYS)
+            if sslmode and "ssl" not in url.query:
+                url = url.update_query_dict({"ssl": sslmode})
+
+        return url
+
+    async def _create_async_engine_and_test(self, config: DatabaseConfig, key: Optional[str] = None) -> AsyncEngine:
+        """Create an AsyncEngine and immediately test connectivity."""
+        key = key or f"{self._normalize_db_url(config)}:async"
+        url = self._build_async_url(config)
+        # Raises without reserving when the budget is exhausted
+        kwargs = self._governed_engine_kwargs(config, key, is_async=True)
+        try:
+            engine = create_async_engine(url, **kwargs)
+        except Exception:
+            self.pool_governor.release(key)
+            raise
+
+        self.pool_governor.attach(key, engine.sync_engine)
+        try:
+            async with engine.connect():
+                pass
+        except Exception:
+            self.pool_governor.release(key)
+            await engine.dispose()
+            raise
+        return engine
+
+    def _dispose_async_engine(self, engine: AsyncEngine):
+        """
+        Dispose an AsyncEngine from sync code. Async connections belong to the loop
+        that opened them, so disposal is scheduled there, even from worker threads.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop:
+            loop.create_task(engine.dispose())
+        elif self._loop is not None and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(engine.dispose(), self._loop)
+        else:
+            asyncio.run(engine.dispose())
+
     def _save_to_database(self, config: DatabaseConfig):
         """Save a single connection to the database."""
         try:
@@ -271,7 +660,8 @@ class ConnectionManager:
             site = session.query(SiteConnection).filter(SiteConnection.id == site_id).first()
             if site:
                 session.delete(site)
-                session.commit()
+            session.query(SiteStats).filter(SiteStats.site_id == site_id).delete()
+            session.commit()
             session.close()
             print(f"Deleted site '{site_id}' from database")
         except Exception as e:
@@ -279,10 +669,28 @@ class ConnectionManager:
             raise e
 
     def _connect_without_save(self, config: DatabaseConfig):
-        """Connect to a database without saving to database (used for loading)."""
-        engine = self._create_engine_and_test(config)
-        self.connections[config.id] = config
-        self.engines[config.id] = engine
+        """
+        Connect to a database without saving to database (used for loading).
+        Reuses the engine of another site on the same database when there is one.
+        """
+        db_key = self._normalize_db_url(config)
+        key = f"{db_key}:sync"
+        engine = self.shared_engines.get(key)
+        if engine is not None:
+            with engine.connect():
+                pass
+        else:
+            engine = self._create_engine_and_test(config, key)
+
+        # Release whatever the site used before if its connection string now points elsewhere
+        if config.id in self.connections and self.db_keys.get(config.id) != db_key:
+            self._drop_engines(config.id)
+            self._forget_site_data(config.id)
+        with self._engine_lock:
+            self.connections[config.id] = config
+            self.db_keys[config.id] = db_key
+        self._attach_engine(config.id, "sync", key, engine)
+        self.invalidate_schema(config.id)
         return True
 
     def add_connection(self, config: DatabaseConfig):
@@ -302,17 +710,14 @@ class ConnectionManager:
         if site_id not in self.connections:
             raise ValueError(f"No site found with ID: {site_id}")
         
-        # Close the engine connection pool
-        if site_id in self.engines:
-            try:
-                self.engines[site_id].dispose()
-            except Exception as e:
-                print(f"Error disposing engine for {site_id}: {e}")
-            del self.engines[site_id]
+        # Close the engine connection pools
+        self._drop_engines(site_id)
         
         # Remove from connections
         site_name = self.connections[site_id].name
         del self.connections[site_id]
+        self.db_keys.pop(site_id, None)
+        self._forget_site_data(site_id)
         
         # Delete from database
         self._delete_from_database(site_id)
@@ -320,22 +725,257 @@ class ConnectionManager:
         print(f"Deleted connection: {site_name} ({site_id})")
         return True
 
+    def _forget_site_data(self, site_id: str):
+        """Drop everything derived from the site's database: stats, breaker, schema, counts and caches."""
+        self.site_stats_cache.pop(site_id, None)
+        self.breakers.pop(site_id, None)
+        self.invalidate_schema(site_id)
+        self.post_counter.invalidate(site_id)
+        self.public_projection.invalidate(site_id)
+        self.public_cache.invalidate(site_id)
+        self.hot_posts.invalidate(site_id)
+
+    def _drop_engines(self, site_id: str):
+        """Detach and dispose both of a site's engines."""
+        self._drop_engine(site_id, "sync")
+        self._drop_engine(site_id, "async")
+
+    def _drop_engine_by_key(self, key: str) -> bool:
+        """
+        Dispose a shared engine for every site using it and return its pool budget
+        (idle eviction). Engines with connections checked out are kept; returns
+        whether the engine was dropped.
+        """
+        if not self.pool_governor.release_idle(key):
+            return False
+        kind = key.rsplit(":", 1)[1]
+        registry = self.async_engines if kind == "async" else self.engines
+        with self._engine_lock:
+            engine = self.shared_engines.pop(key, None)
+            for site_id in self.engine_refs.pop(key, set()):
+                registry.pop(site_id, None)
+        if engine is not None:
+            self._dispose(kind, engine, key)
+        return True
+
+    def _drop_engine(self, site_id: str, kind: str):
+        """
+        Detach a site from one of its engines. The engine is only disposed (and its
+        pool budget returned) once no other site on the same database uses it.
+        """
+        registry = self.async_engines if kind == "async" else self.engines
+        if site_id not in self.db_keys and site_id not in self.connections:
+            return
+        key = self._pool_key(site_id, kind)
+        with self._engine_lock:
+            registry.pop(site_id, None)
+            users = self.engine_refs.get(key)
+            if users is None or site_id not in users:
+                # The site never attached to this engine: its budget belongs to other users (or a connect in progress)
+                return
+            users.discard(site_id)
+            if users:
+                return
+            self.engine_refs.pop(key, None)
+            engine = self.shared_engines.pop(key, None)
+        self.pool_governor.release(key)
+        if engine is not None:
+            self._dispose(kind, engine, key)
+
+    def evict_idle_engines(self) -> int:
+        """Dispose engines that have been idle longer than SITE_ENGINE_IDLE_TTL, oldest first."""
+        keys = [
+            key for key in self.pool_governor.idle_candidates(max_idle=self.pool_governor.idle_ttl)
+            if self._drop_engine_by_key(key)
+        ]
+        if keys:
+            print(f"[POOL] Evicted {len(keys)} idle engine(s): {', '.join(keys)}")
+        return len(keys)
+
+    async def run_idle_eviction(self):
+        """Background loop that periodically evicts idle engines."""
+        self._loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.evict_interval)
+            try:
+                self.evict_idle_engines()
+            except Exception as e:
+                print(f"Idle engine eviction failed: {e}")
+
+    def get_pool_usage(self) -> Dict:
+        """Current connection budget usage across all site pools."""
+        usage = self.pool_governor.snapshot()
+        with self._engine_lock:
+            usage["engines"] = {
+                "sync": sum(1 for key in self.shared_engines if key.endswith(":sync")),
+                "async": sum(1 for key in self.shared_engines if key.endswith(":async")),
+                "sites": {key: sorted(users) for key, users in self.engine_refs.items()},
+            }
+        return usage
+
+    def get_breaker(self, site_id: str) -> CircuitBreaker:
+        breaker = self.breakers.get(site_id)
+        if breaker is None:
+            with self._engine_lock:
+                breaker = self.breakers.setdefault(site_id, CircuitBreaker(
+                    site_id,
+                    failure_threshold=self.breaker_failure_threshold,
+                    base_backoff=self.breaker_base_backoff,
+                    max_backoff=self.breaker_max_backoff,
+                ))
+        return breaker
+
+    def get_breaker_state(self, site_id: str) -> Dict:
+        return self.get_breaker(site_id).snapshot()
+
+    def is_site_available(self, site_id: str) -> bool:
+        """False while the site's circuit is open and its next probe is not due yet."""
+        state = self.get_breaker(site_id).snapshot()
+        return state["state"] != CircuitBreaker.OPEN or not state["next_probe_in"]
+
+    def report_failure(self, site_id: str, exc: Exception):
+        """
+        Feed a query-time failure on an existing engine into the site's breaker.
+        Non-connectivity errors (bad SQL, missing table) are ignored. When the
+        circuit opens the engines are dropped, so later calls hit the breaker.
+        The database itself is unreachable, so shared engines are dropped for
+        every site using them.
+        """
+        if site_id not in self.connections or not _is_connectivity_error(exc):
+            return
+        if self.get_breaker(site_id).record_failure(exc):
+            for kind in ("sync", "async"):
+                self._drop_engine_by_key(self._pool_key(site_id, kind))
+
+    def _connection_error(self, config: DatabaseConfig, exc: Exception) -> ValueError:
+        """Wrap a connect failure in the ValueError the API layer expects."""
+        if isinstance(exc, ValueError):
+            return exc
+        if isinstance(exc, SQLAlchemyError):
+            return ValueError(f"Connection failed for {config.name}: {self._format_db_error(exc)}")
+        return ValueError(f"Connection failed for {config.name}: {exc}")
+
     def get_engine(self, site_id: str) -> Engine:
-        if site_id in self.engines:
-            return self.engines[site_id]
+        """
+        Return the site's sync Engine, creating it on first use.
+        Sites on the same database share one engine, and concurrent cold callers
+        share a single connect attempt instead of each building a pool.
+        """
+        engine = self.engines.get(site_id)
+        if engine is not None:
+            self.pool_governor.touch(self._pool_key(site_id, "sync"))
+            return engine
 
         if site_id not in self.connections:
             raise ValueError(f"No config for site ID: {site_id}")
 
+        key = self._pool_key(site_id, "sync")
+        with self._engine_lock:
+            engine = self.engines.get(site_id)
+            if engine is not None:
+                return engine
+
+            engine = self.shared_engines.get(key)
+            future = self._engine_inflight.get(key)
+            is_leader = engine is None and future is None
+            if engine is not None:
+                # Another site on the same database already has a live engine
+                self.connect_stats["shared"] += 1
+            elif is_leader:
+                future = Future()
+                self._engine_inflight[key] = future
+                self.connect_stats["connects"] += 1
+            else:
+                self.connect_stats["coalesced"] += 1
+
+        if engine is not None:
+            return self._attach_engine(site_id, "sync", key, engine)
+        if not is_leader:
+            return self._attach_engine(site_id, "sync", key, future.result())
+
         config = self.connections[site_id]
+        breaker = self.get_breaker(site_id)
         try:
-            engine = self._create_engine_and_test(config)
-            self.engines[site_id] = engine
+            breaker.before_attempt()
+            engine = self._create_engine_and_test(config, key)
+        except Exception as e:
+            error = self._connection_error(config, e)
+            if not isinstance(e, SiteUnavailableError):
+                breaker.record_failure(error)
+            with self._engine_lock:
+                self._engine_inflight.pop(key, None)
+            future.set_exception(error)
+            raise error
+
+        breaker.record_success()
+        engine = self._attach_engine(site_id, "sync", key, engine)
+        with self._engine_lock:
+            self._engine_inflight.pop(key, None)
+        future.set_result(engine)
+        return engine
+
+    async def get_async_engine(self, site_id: str) -> AsyncEngine:
+        """
+        Return the site's AsyncEngine (asyncpg / aiosqlite), creating it on first use.
+        Queries on it never block the event loop, so requests to different sites overlap.
+        Sites on the same database share one engine; concurrent cold callers await the same connect task.
+        """
+        engine = self.async_engines.get(site_id)
+        if engine is not None:
+            self.pool_governor.touch(self._pool_key(site_id, "async"))
             return engine
-        except SQLAlchemyError as e:
-            raise ValueError(f"Connection failed for {config.name}: {self._format_db_error(e)}")
+
+        if site_id not in self.connections:
+            raise ValueError(f"No config for site ID: {site_id}")
+
+        key = self._pool_key(site_id, "async")
+        engine = self.shared_engines.get(key)
+        if engine is not None:
+            with self._engine_lock:
+                self.connect_stats["shared"] += 1
+            return self._attach_engine(site_id, "async", key, engine)
+
+        self._loop = asyncio.get_running_loop()
+        # No await between lookup and registration, so this is atomic on the loop
+        task = self._async_engine_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._connect_async_engine(site_id, key))
+            self._async_engine_inflight[key] = task
+            stat = "connects"
+        else:
+            stat = "coalesced"
+        with self._engine_lock:
+            self.connect_stats[stat] += 1
+
+        # Shield so a cancelled waiter doesn't abort the connect the others are waiting on
+        engine = await asyncio.shield(task)
+        return self._attach_engine(site_id, "async", key, engine)
+
+    async def _connect_async_engine(self, site_id: str, key: str) -> AsyncEngine:
+        """Leader side of get_async_engine: connect once and publish the engine."""
+        config = self.connections[site_id]
+        breaker = self.get_breaker(site_id)
+        try:
+            breaker.before_attempt()
+            engine = await self._create_async_engine_and_test(config, key)
         except Exception as e:
-            raise ValueError(f"Connection failed for {config.name}: {e}")
+            error = self._connection_error(config, e)
+            if not isinstance(e, SiteUnavailableError):
+                breaker.record_failure(error)
+            raise error
+        finally:
+            self._async_engine_inflight.pop(key, None)
+
+        breaker.record_success()
+        return self._attach_engine(site_id, "async", key, engine)
+
+    def get_connect_stats(self) -> Dict:
+        """Counters for engine creation, including connects coalesced onto an in-flight attempt."""
+        with self._engine_lock:
+            return {
+                **self.connect_stats,
+                "in_flight": len(self._engine_inflight) + len(self._async_engine_inflight),
+            }
 
     def get_config(self, site_id: str) -> DatabaseConfig:
         if site_id not in self.connections:
@@ -400,6 +1040,7 @@ class ConnectionManager:
             raise e
         
         self.connections[site_id] = current_config
+        self.invalidate_schema(site_id)
         
         print(f"Updated config for site {site_id}")
         return current_config
@@ -408,14 +1049,13 @@ class ConnectionManager:
         """Get cached stats for a site if available."""
         return self.site_stats_cache.get(site_id)
 
-    async def refresh_site_stats(self, site_id: str):
+    async def refresh_site_stats(self, site_id: str, force_refresh: bool = False):
         """
         Connect to the site DB and update the stats cache.
-        This is an async method intended to be run in background or on-demand.
+        Runs on the site's AsyncEngine, so it can be awaited or scheduled without blocking the loop.
+        force_refresh also re-resolves the content table instead of using the cached name
+        and counts posts exactly instead of using counters or catalog estimates.
         """
-        import time
-        from sqlalchemy import text
-        
         if site_id not in self.connections:
             return None
             
@@ -432,25 +1072,26 @@ class ConnectionManager:
         }
         
         try:
-            # We use the existing synchronous engine but run the query
-            # inside a thread pool if called from async context (handled by FastAPI usually)
-            # For now, we just execute it.
-            engine = self.get_engine(site_id)
-            table_name = self.resolve_table_name(engine, config.target_table_name)
-            stats["table"] = table_name
+            engine = await self.get_async_engine(site_id)
             
-            with engine.connect() as conn:
-                count_sql = text(f'SELECT COUNT(*) as total FROM "{table_name}"')
-                result = conn.execute(count_sql)
-                total_posts = result.scalar() or 0
+            async with engine.connect() as conn:
+                table_name = await self.resolve_table_name_async(
+                    conn, config.target_table_name, site_id=site_id, force_refresh=force_refresh
+                )
+                stats["table"] = table_name
+
+                counts = await self.post_counter.get_counts(site_id, conn, table_name, exact=force_refresh)
                 
-                stats["total_posts"] = total_posts
+                stats["total_posts"] = counts["total"]
+                stats["exact"] = counts["exact"]
                 stats["status"] = "connected"
                 
         except Exception as e:
             stats["error"] = str(e)
+            self.report_failure(site_id, e)
+            stats["breaker"] = self.get_breaker_state(site_id)
             print(f"Error refreshing stats for {site_id}: {e}")
             
-        # Update cache
-        self.site_stats_cache[site_id] = stats
+        # Update cache (written through to the admin database)
+        await self.save_site_stats(site_id, stats)
         return stats
@@ -0,0 +1,238 @@
+"""
+Deterministic mapping of one generated article onto a site's content table.
+
+Multi-site distribution generates a single canonical article (BlogContent)
+and adapts it to each site here, with the same smart-mapping rules that
+_inject_content applies on insert. Only columns that nothing maps to and the
+insert can't auto-fill are left for a small LLM call (see
+ContentOrchestrator), so LLM time scales with articles, not articles x sites.
+"""
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+# Semantic synonyms: a column whose name contains the concept takes the first of these payload keys
+SYNONYMS = {
+    'title': ['title', 'h1', 'headline', 'subject', 'topic', 'name', 'seotitle'],
+    'content': ['content', 'body', 'bodyhtml', 'text', 'article', 'articlebody', 'htmlcontent', 'fulltext', 'description'],
+    'slug': ['slug', 'seoslug', 'url', 'uri', 'path', 'alias'],
+    'image': ['image', 'featuredimage', 'heroimage', 'thumbnail', 'cover', 'picture', 'img'],
+    'status': ['status', 'poststatus', 'state', 'visibility', 'ispublished'],
+    'author': ['author', 'creator', 'writer', 'postedby', 'username'],
+    'excerpt': ['excerpt', 'summary', 'shortdescription', 'intro', 'teaser'],
+    'createdat': ['createdat', 'date', 'publishdate', 'postedat', 'time', 'timestamp'],
+    'updatedat': ['updatedat', 'lastmodified', 'modified', 'editedat']
+}
+
+STATUS_COLUMNS = ("status", "poststatus", "state", "visibility", "ispublished", "published")
+# Preferred labels per requested status, matched case-insensitively against enum labels
+STATUS_LABELS = {
+    "published": ["published", "publish", "live", "active", "public"],
+    "draft": ["draft", "pending", "unpublished", "private", "inactive"],
+    "scheduled": ["scheduled", "schedule", "future", "pending", "draft"],
+}
+# Columns the insert fills on its own (random author, slug from the title, ...)
+AUTO_FILLED = ("author", "writer", "byline", "slug")
+
+
+def _norm(name: str) -> str:
+    return name.lower().replace('_', '').replace(' ', '')
+
+
+def find_value_for_column(col_info: Dict, payload: Dict[str, Any]):
+    """Value for a table column from a loosely keyed payload, or None (the smart-mapping rules)."""
+    possible_keys = [
+        col_info['name'],
+        col_info['name'].lower(),
+        col_info['name'].lower().replace('_', ''),
+        col_info['name'].lower().replace(' ', '')
+    ]
+    norm_col_name = col_info['name'].lower().replace('_', '')
+
+    # 1. Check exact matches in payload
+    for key in possible_keys:
+        if key in payload:
+            return payload[key]
+
+    # 2. Check synonyms: is this column a 'title' (e.g. 'article_title' contains 'title')?
+    for concept, keys in SYNONYMS.items():
+        if concept in norm_col_name:
+            for key in keys:
+                if key in payload:
+                    return payload[key]
+
+    # 3. Direct Fuzzy Match
+    for k, v in payload.items():
+        if k.lower().replace('_', '') == norm_col_name:
+            return v
+    return None
+
+
+class _PlainText(HTMLParser):
+    """HTML body -> the plain-text layout sites expect (blank line between blocks, "• " bullets)."""
+    BLOCKS = ("p", "div", "section", "article", "blockquote", "table", "tr")
+    HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+    def __init__(self):
+        super().__init__()
+        self.parts: List[str] = []
+        self.lists: List[List] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.BLOCKS or tag in self.HEADINGS:
+            self.parts.append("\n\n")
+        elif tag in ("ul", "ol"):
+            self.lists.append([tag, 0])
+            self.parts.append("\n\n")
+        elif tag == "li":
+            marker = "• "
+            if self.lists and self.lists[-1][0] == "ol":
+                self.lists[-1][1] += 1
+                marker = f"{self.lists[-1][1]}. "
+            self.parts.append("\n" + marker)
+        elif tag == "br":
+            self.parts.append("\n")
+        elif tag in ("strong", "b"):
+            self.parts.append("**")
+
+    def handle_endtag(self, tag):
+        if tag in self.BLOCKS or tag in self.HEADINGS:
+            self.parts.append("\n\n")
+        elif tag in ("ul", "ol"):
+            if self.lists:
+                self.lists.pop()
+            self.parts.append("\n\n")
+        elif tag in ("strong", "b"):
+            self.parts.append("**")
+
+    def handle_data(self, data):
+        self.parts.append(re.sub(r"\s+", " ", data))
+
+    def text(self) -> str:
+        raw = "".join(self.parts)
+        lines = [line.strip() for line in raw.split("\n")]
+        return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def html_to_text(html: str) -> str:
+    parser = _PlainText()
+    parser.feed(html or "")
+    parser.close()
+    return parser.text()
+
+
+def slugify(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', (text or 'untitled-post').lower()).strip('-') or 'untitled-post'
+
+
+def normalize_status(post_status: Optional[str]) -> str:
+    status = (post_status or "").lower()
+    if status.startswith("publish"):
+        return "published"
+    if status.startswith("schedul"):
+        return "scheduled"
+    return "draft"
+
+
+def status_value(col_info: Dict, allowed: Optional[List[str]], post_status: str):
+    """The column's value for the requested status: an exact enum label, a bool or a lowercase word."""
+    wanted = normalize_status(post_status)
+    str_type = str(col_info['type']).upper()
+    if 'BOOL' in str_type:
+        return wanted == "published"
+    if allowed:
+        by_lower = {label.lower(): label for label in allowed}
+        for candidate in STATUS_LABELS[wanted]:
+            if candidate in by_lower:
+                return by_lower[candidate]
+        return allowed[0]
+    return wanted
+
+
+def canonical_payload(article, req) -> Dict[str, Any]:
+    """The article and request as a loosely keyed payload for find_value_for_column (timestamps are left to the insert)."""
+    body = html_to_text(article.body_html)
+    keywords = ", ".join(article.lsi_used)
+    faq = [item.model_dump() if hasattr(item, "model_dump") else dict(item) for item in article.faq_schema_json]
+    payload = {
+        'title': article.h1, 'h1': article.h1, 'headline': article.h1,
+        'metatitle': article.meta_title, 'meta_title': article.meta_title, 'seotitle': article.meta_title,
+        'description': article.meta_description, 'metadescription': article.meta_description,
+        'meta_description': article.meta_description, 'seodescription': article.meta_description,
+        'excerpt': article.meta_description, 'summary': article.meta_description,
+        'content': body, 'body': body, 'bodyhtml': body, 'articlebody': body, 'htmlcontent': body, 'postcontent': body,
+        'slug': slugify(article.h1), 'seoslug': slugify(article.h1),
+        'keywords': keywords, 'metakeywords': keywords, 'seokeywords': keywords, 'lsiused': article.lsi_used,
+        'faq': faq, 'faqschema': faq, 'faqschemajson': faq,
+    }
+    category = getattr(req.distribution, 'category', None)
+    if category:
+        payload['category'] = category
+    images = list(getattr(req.seo_technical, 'featured_image_urls', None) or [])
+    if images:
+        payload['image'] = images[0]
+    return payload
+
+
+def _enum_labels(col_info: Dict, enums: Dict[str, List[str]]) -> Optional[List[str]]:
+    # Reflected ENUM types carry their labels (and render as VARCHAR(n), so the name can't be matched)
+    labels = getattr(col_info['type'], 'enums', None)
+    if labels:
+        return list(labels)
+    type_str = str(col_info['type']).lower()
+    for enum_name, values in enums.items():
+        if enum_name.lower() in type_str:
+            return values
+    return None
+
+
+def _needs_fill(col_info: Dict, foreign_keys: set) -> bool:
+    """Whether an unmapped column must come from the LLM: required text the insert can't auto-fill."""
+    name = col_info['name']
+    norm_name = _norm(name)
+    if name.lower() == 'id' or name in foreign_keys:
+        return False
+    if col_info['nullable'] or col_info.get('default') is not None or col_info.get('autoincrement') is True:
+        return False
+    if any(word in norm_name for word in AUTO_FILLED):
+        return False
+    str_type = str(col_info['type']).upper()
+    return any(word in str_type for word in ('CHAR', 'TEXT', 'JSON', 'ARRAY', 'ENUM'))
+
+
+def adapt(article, req, post_status: str, schema, table_name: str,
+          extra_fields: Optional[List[str]] = None) -> Tuple[Dict[str, Any], List[Dict]]:
+    """
+    Map the article onto table_name of the site's schema snapshot.
+    Returns (payload keyed by actual column names, columns still to fill).
+    extra_fields are canonical keys carried along as-is (e.g. for an SEO side table).
+    """
+    payload = canonical_payload(article, req)
+    images = list(getattr(req.seo_technical, 'featured_image_urls', None) or [])
+    foreign_keys = {col for fk in schema.foreign_keys(table_name) for col in fk.get("constrained_columns", [])}
+
+    adapted: Dict[str, Any] = {}
+    missing: List[Dict] = []
+    for col_info in schema.columns(table_name):
+        name = col_info['name']
+        norm_name = _norm(name)
+        if name.lower() == 'id':
+            continue
+        # Exact names only: statusUpdatedAt or paymentStatus are not the post's status
+        if norm_name in STATUS_COLUMNS:
+            adapted[name] = status_value(col_info, _enum_labels(col_info, schema.enums), post_status)
+            continue
+        if images and (norm_name.endswith('images') or 'gallery' in norm_name):
+            # Multi-image columns take every URL as a JSON array
+            adapted[name] = images
+            continue
+        value = find_value_for_column(col_info, payload)
+        if value is not None:
+            adapted[name] = value
+        elif _needs_fill(col_info, foreign_keys):
+            missing.append({"name": name, "type": str(col_info['type']), "allowed": _enum_labels(col_info, schema.enums)})
+
+    for key in extra_fields or []:
+        if key in payload and key not in adapted:
+            adapted[key] = payload[key]
+    return adapted, missing
@@ -1,162 +1,240 @@
 from typing import List, Dict, Any
-from sqlalchemy import text, inspect
+from sqlalchemy import text
 from datetime import datetime
 from schemas import ContentGenerationRequest
 from services.connection_manager import ConnectionManager
 from services.schema_discovery import SchemaDiscovery
+from services import content_adapter
 from services.xai_engine import ContentGenerator
 from services.name_generator import get_random_american_name
-import time
+import asyncio
 
-# Cache TTL in seconds (30 minutes)
-SCHEMA_CACHE_TTL = 1800
+# Table-name cache key for sites resolved through LLM auto-discovery
+AUTO_DISCOVERED_TABLE = "__auto__"
 
 class ContentOrchestrator:
-    # Class-level caches (shared across instances)
-    _schema_cache: Dict[str, Dict] = {}  # key: "site_id:table_name" -> { "columns": [...], "timestamp": ... }
-    _seo_cache: Dict[str, Dict] = {}     # key: "site_id:table_name" -> { "seo_info": {...}, "timestamp": ... }
-    
     def __init__(self):
         self.conn_manager = ConnectionManager.get_instance()
         self.gemini = ContentGenerator()
 
+    async def _site_schema(self, site_id: str, conn=None):
+        """
+        Reflected schema for the site from the shared registry. A miss is reflected
+        on conn (an AsyncConnection) or on the site's AsyncEngine, never blocking the loop.
+        """
+        registry = self.conn_manager.schema_registry
+        if conn is not None:
+            return await registry.get_async(site_id, conn)
+        engine = await self.conn_manager.get_async_engine(site_id)
+        async with engine.connect() as conn:
+            return await registry.get_async(site_id, conn)
+
+    def _get_table_map(self, schema, table_name: str):
+        """
+        Return (columns_info, table_map) for a table of a schema snapshot. table_map
+        maps normalized and lowercase column names to { 'name', 'type', 'nullable',
+        'default' } and is memoized on the snapshot.
+        """
+        try:
+            columns_info = schema.columns(table_name)
+        except ValueError as e:
+            print(f"Error getting columns for table {table_name}: {e}")
+            raise ValueError(f"Could not introspect table '{table_name}': {e}")
+
+        def build():
+            # Map simplified names to actual column names (e.g., 'title' -> 'Title', 'post_title' -> 'Title')
+            table_map = {}
+            for col in columns_info:
+                # Normalize: lowercase, remove underscores and spaces
+                norm_name = col['name'].lower().replace('_', '').replace(' ', '')
+                table_map[norm_name] = {
+                    'name': col['name'],
+                    'type': str(col['type']),
+                    'nullable': col['nullable'],
+                    'default': col.get('default')
+                }
+                # Also map the exact lowercase name for easier lookups
+                table_map[col['name'].lower()] = table_map[norm_name]
+            return table_map
+
+        return columns_info, schema.remember(("table_map", table_name), build)
+
+    async def _for_each_site(self, site_ids: List[str], pipeline) -> List[Any]:
+        """
+        Run pipeline(site_id) for every site concurrently, at most
+        DISTRIBUTION_CONCURRENCY at a time, and return the results in site order.
+        Pipelines report their own failures, so one site can't sink the others.
+        """
+        limit = asyncio.Semaphore(self.conn_manager.distribution_concurrency)
+
+        async def run(site_id: str):
+            async with limit:
+                return await pipeline(site_id)
+
+        return await asyncio.gather(*(run(site_id) for site_id in site_ids))
+
+    async def _with_timeout(self, label: str, coro, timeout: float):
+        """Await coro, failing with a TimeoutError that names label after timeout seconds."""
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"{label} did not finish within {timeout}s")
+
+    async def _with_site_timeout(self, label: str, coro):
+        """Await coro under the per-site DISTRIBUTION_SITE_TIMEOUT."""
+        return await self._with_timeout(label, coro, self.conn_manager.distribution_timeout)
+
+    async def _site_table(self, site_id: str, override_table: str = None):
+        """The site's AsyncEngine and resolved target table."""
+        engine = await self.conn_manager.get_async_engine(site_id)
+        config = self.conn_manager.get_config(site_id)
+        target_table = await self._resolve_target_table(site_id, config, override_table)
+        return engine, target_table
+
+    async def _site_schema_prompt(self, site_id: str, override_table: str = None):
+        """Resolve the site's target table and describe it for the LLM."""
+        _, target_table = await self._site_table(site_id, override_table)
+        schema = await self._site_schema(site_id)
+        schema_prompt = SchemaDiscovery(site_id=site_id, schema=schema).get_structure_for_prompt(target_table)
+        return target_table, schema_prompt
+
+    async def _generate_article(self, req: ContentGenerationRequest):
+        """
+        The canonical article shared by every site of a distribution (one long-form
+        generation), under its own DISTRIBUTION_GENERATION_TIMEOUT.
+        """
+        print(f"Generating canonical article for: {req.core_identity.primary_keyword} ...")
+        return await self._with_timeout(
+            "Article generation", self.gemini.generate_blog_post(req), self.conn_manager.generation_timeout
+        )
+
+    async def _adapt_article(self, site_id: str, article, req: ContentGenerationRequest, post_status: str,
+                             override_table: str = None):
+        """
+        Map the canonical article onto the site's table with the smart-mapping rules.
+        The LLM is only asked for required columns nothing could be mapped onto.
+        """
+        engine, target_table = await self._site_table(site_id, override_table)
+        schema = await self._site_schema(site_id)
+        # A separate SEO table receives the meta fields through the insert's payload split
+        seo_fields = ["meta_title", "meta_description", "keywords"] if self._detect_seo_table(schema, target_table) else None
+        content_payload, missing = content_adapter.adapt(article, req, post_status, schema, target_table, extra_fields=seo_fields)
+        if missing:
+            print(f"[ADAPT] {site_id}.{target_table}: asking the LLM for {[col['name'] for col in missing]}")
+            content_payload.update(await self.gemini.fill_schema_columns(req, article, missing))
+        else:
+            print(f"[ADAPT] {site_id}.{target_table}: fully mapped, no LLM call")
+        return engine, target_table, content_payload
+
     async def validate_distribution(self, req: ContentGenerationRequest, target_site_ids: List[str]):
         from schemas import SiteValidationResult, ValidationResponse # Lazy import to avoid circular dependency if any
-        
-        results = []
-        has_issues = False
 
-        for site_id in target_site_ids:
+        async def validate_site(site_id: str):
+            async def check():
+                # 1. Discover Schema (Auto-Resolution)
+                _, schema_prompt = await self._site_schema_prompt(site_id)
+                # 2. Validate
+                return await self.gemini.validate_content_against_schema(req, schema_prompt)
+
             try:
-                # 1. Get Connection & Config
-                engine = self.conn_manager.get_engine(site_id)
-                config = self.conn_manager.get_config(site_id)
-                
-                # 2. Discover Schema
-                # 2. Discover Schema (Auto-Resolution)
-                target_table = await self._resolve_target_table(site_id, engine, config)
-                
-                discovery = SchemaDiscovery(engine)
-                schema_prompt = discovery.get_structure_for_prompt(target_table)
-                
-                # 3. Validate
-                validation_data = await self.gemini.validate_content_against_schema(req, schema_prompt)
+                validation_data = await self._with_site_timeout(f"Site {site_id}", check())
                 missing_fields = validation_data.get("missing_fields", [])
-                
-                is_valid = len(missing_fields) == 0
-                if not is_valid:
-                    has_issues = True
-                
-                results.append(SiteValidationResult(
+                return SiteValidationResult(
                     site_id=site_id,
-                    valid=is_valid,
+                    valid=len(missing_fields) == 0,
                     missing_fields=missing_fields
-                ))
-                
+                )
             except Exception as e:
                 print(f"Validation error for {site_id}: {e}")
-                has_issues = True
-                results.append(SiteValidationResult(
+                return SiteValidationResult(
                     site_id=site_id,
                     valid=False,
                     missing_fields=[],
                     message=str(e)
-                ))
+                )
 
+        results = await self._for_each_site(target_site_ids, validate_site)
+        has_issues = any(not result.valid for result in results)
         return ValidationResponse(results=results, has_issues=has_issues)
 
     async def orchestrate_distribution(self, req: ContentGenerationRequest, target_site_ids: List[str], supplementary_data: Dict[str, Dict[str, Any]] = None):
-        results = []
+        # Handle scheduling
+        post_status = req.distribution.post_status.lower()
+        if post_status == "schedule" and req.distribution.scheduled_at:
+            post_status = "scheduled"
+
+        # 1. Generate the article once for all sites
+        try:
+            article = await self._generate_article(req)
+        except Exception as e:
+            print(f"Error generating content: {e}")
+            return [{"site_id": site_id, "status": "failed", "error": str(e)} for site_id in target_site_ids]
 
-        for site_id in target_site_ids:
+        async def distribute_site(site_id: str):
             try:
                 print(f"Starting orchestration for site: {site_id}")
-                
-                # 1. Get Connection & Config
-                engine = self.conn_manager.get_engine(site_id)
-                config = self.conn_manager.get_config(site_id)
-                
-                # 2. Discover Schema
-                # 2. Discover Schema (Auto-Resolution)
-                target_table = await self._resolve_target_table(site_id, engine, config)
-                
-                discovery = SchemaDiscovery(engine)
-                schema_prompt = discovery.get_structure_for_prompt(target_table)
-                
-                # 3. Generate Schema-Specific Content
-                print(f"Generating content for table: {target_table} with status: {req.distribution.post_status} ...")
-                
-                # Handle scheduling
-                post_status = req.distribution.post_status.lower()
-                if post_status == "schedule" and req.distribution.scheduled_at:
-                    post_status = "scheduled"
-                
-                content_payload = await self.gemini.generate_schema_aware_content(
-                    req, 
-                    schema_prompt, 
-                    post_status=post_status
+
+                # 2. Adapt it to the site's schema. The timeout covers resolution
+                # and adaptation only: once the insert starts it runs to
+                # completion, so no post is written for a site reported as failed
+                engine, target_table, content_payload = await self._with_site_timeout(
+                    f"Site {site_id}", self._adapt_article(site_id, article, req, post_status)
                 )
-                
+
                 # Add scheduled_at if scheduling
                 if post_status == "scheduled" and req.distribution.scheduled_at:
                     content_payload["scheduled_at"] = req.distribution.scheduled_at
-                
-                # 4. Merge Supplementary Data (if any)
+
+                # 3. Merge Supplementary Data (if any)
                 if supplementary_data and site_id in supplementary_data:
                     print(f"Merging supplementary data for {site_id}...")
                     content_payload.update(supplementary_data[site_id])
 
-                # 5. Inject into DB
-                # Ensure complex dicts are serialized for JSONB columns if needed
-                # (SQLAlchemy often handles this but explicit checks help for raw text queries)
-                blog_id = self._inject_content(engine, target_table, content_payload, site_id)
-                
-                # 6. Inject Category Relation (if category is provided)
-                category_name = req.distribution.category
-                if getattr(req.distribution, 'category', None) and blog_id:
-                    self._inject_category_relation(engine, blog_id, req.distribution.category)
-                
-                results.append({"site_id": site_id, "status": "success", "table": target_table, "blog_id": blog_id})
-                
+                # 4. Inject into DB and link the category
+                blog_id = await self._write_site_post(engine, target_table, content_payload, site_id, req.distribution.category)
+                return {"site_id": site_id, "status": "success", "table": target_table, "blog_id": blog_id}
+
             except Exception as e:
                 print(f"Error distributing to {site_id}: {e}")
-                results.append({"site_id": site_id, "status": "failed", "error": str(e)})
+                return {"site_id": site_id, "status": "failed", "error": str(e)}
 
-        return results
+        return await self._for_each_site(target_site_ids, distribute_site)
+
+    async def _write_site_post(self, engine, target_table: str, content_payload: Dict[str, Any], site_id: str, category_name: str = None):
+        # Ensure complex dicts are serialized for JSONB columns if needed
+        # (SQLAlchemy often handles this but explicit checks help for raw text queries)
+        blog_id = await self._inject_content(engine, target_table, content_payload, site_id)
+
+        # Inject Category Relation (if category is provided)
+        if category_name and blog_id:
+            await self._inject_category_relation(engine, blog_id, category_name, site_id)
+            self.conn_manager.posts_changed(site_id, [blog_id])
+        return blog_id
 
     async def preview_distribution(self, req: ContentGenerationRequest, target_site_ids: List[str], table_overrides: Dict[str, str] = None):
-        results = []
-        for site_id in target_site_ids:
+        # Previews use the requested status so the 'status' field shows what publishing would write
+        try:
+            article = await self._generate_article(req)
+        except Exception as e:
+            return [{"site_id": site_id, "error": str(e)} for site_id in target_site_ids]
+
+        async def preview_site(site_id: str):
+            # Check for override first
+            override_table = table_overrides.get(site_id) if table_overrides else None
             try:
-                engine = self.conn_manager.get_engine(site_id)
-                config = self.conn_manager.get_config(site_id)
-                
-                # Check for override first
-                override_table = table_overrides.get(site_id) if table_overrides else None
-                target_table = await self._resolve_target_table(site_id, engine, config, override_table)
-                
-                discovery = SchemaDiscovery(engine)
-                schema_prompt = discovery.get_structure_for_prompt(target_table)
-                
-                # FIX: Use the requested status from the request, NOT hardcoded "Draft"
-                # But typically previews ARE drafts. However, user wants to see what it looks like with "Publish Immediately".
-                # If we want to strictly preview what will happen, we should respect the request.
-                # BUT, usually preview means "don't save to DB".
-                # I will use the requested status so the 'status' field in the generated JSON is correct.
-                content_payload = await self.gemini.generate_schema_aware_content(
-                    req, 
-                    schema_prompt,
-                    post_status=req.distribution.post_status 
+                _, target_table, content_payload = await self._with_site_timeout(
+                    f"Site {site_id}",
+                    self._adapt_article(site_id, article, req, req.distribution.post_status, override_table),
                 )
-                
-                results.append({
+                return {
                     "site_id": site_id,
                     "target_table": target_table,
                     "preview_content": content_payload
-                })
+                }
             except Exception as e:
-                results.append({"site_id": site_id, "error": str(e)})
-        return results
+                return {"site_id": site_id, "error": str(e)}
+
+        return await self._for_each_site(target_site_ids, preview_site)
 
     async def inject_edited_content(self, injections: List[Any]):
         """
@@ -166,8 +244,8 @@ class ContentOrchestrator:
         results = []
         for injection in injections:
             try:
-                engine = self.conn_manager.get_engine(injection.site_id)
-                blog_id = self._inject_content(engine, injection.target_table, injection.content, injection.site_id)
+                engine = await self.conn_manager.get_async_engine(injection.site_id)
+                blog_id = await self._inject_content(engine, injection.target_table, injection.content, injection.site_id)
                 results.append({
                     "site_id": injection.site_id, 
                     "status": "success", 
@@ -186,21 +264,22 @@ class ContentOrchestrator:
     async def schedule_blog_post(self, blog_id: int, scheduled_at: datetime, site_id: str):
         """Schedule an existing blog post for future publication"""
         try:
-            engine = self.conn_manager.get_engine(site_id)
             config = self.conn_manager.get_config(site_id)
             
             # Get the target table
-            target_table = await self._resolve_target_table(site_id, engine, config)
+            target_table = await self._resolve_target_table(site_id, config)
             
             # Update the blog post status and add scheduled_at
-            with engine.connect() as conn:
+            engine = await self.conn_manager.get_async_engine(site_id)
+            async with engine.connect() as conn:
                 # Check if scheduled_at column exists, if not add it
-                inspector = inspect(engine)
-                columns = [col['name'].lower() for col in inspector.get_columns(target_table)]
+                schema = await self.conn_manager.schema_registry.get_async(site_id, conn)
+                columns = [col['name'].lower() for col in schema.columns(target_table)]
                 
                 if 'scheduled_at' not in columns:
                     # Add scheduled_at column
-                    conn.execute(text(f'ALTER TABLE "{target_table}" ADD COLUMN "scheduled_at" TIMESTAMP'))
+                    await conn.execute(text(f'ALTER TABLE "{target_table}" ADD COLUMN "scheduled_at" TIMESTAMP'))
+                    self.conn_manager.schema_registry.invalidate(site_id)
                 
                 # Update the blog post
                 update_sql = text(f'''
@@ -209,12 +288,15 @@ class ContentOrchestrator:
                     WHERE id = :blog_id
                 ''')
                 
-                conn.execute(update_sql, {
+                await conn.execute(update_sql, {
                     'status': 'scheduled',
                     'scheduled_at': scheduled_at,
                     'blog_id': blog_id
                 })
-                conn.commit()
+                await conn.commit()
+                # Previous status is unknown; the per-status counts are recounted on next read
+                self.conn_manager.post_counter.apply(site_id, target_table, 0, None)
+                self.conn_manager.posts_changed(site_id, [blog_id])
                 
                 return {
                     "success": True,
@@ -234,13 +316,13 @@ class ContentOrchestrator:
     async def get_scheduled_posts(self, site_id: str):
         """Get all scheduled posts for a site"""
         try:
-            engine = self.conn_manager.get_engine(site_id)
             config = self.conn_manager.get_config(site_id)
             
             # Get the target table
-            target_table = await self._resolve_target_table(site_id, engine, config)
+            target_table = await self._resolve_target_table(site_id, config)
             
-            with engine.connect() as conn:
+            engine = await self.conn_manager.get_async_engine(site_id)
+            async with engine.connect() as conn:
                 # Query scheduled posts
                 query_sql = text(f'''
                     SELECT id, title, scheduled_at, status 
@@ -249,7 +331,7 @@ class ContentOrchestrator:
                     ORDER BY scheduled_at ASC
                 ''')
                 
-                result = conn.execute(query_sql)
+                result = await conn.execute(query_sql)
                 scheduled_posts = []
                 
                 for row in result:
@@ -282,13 +364,13 @@ class ContentOrchestrator:
             
             for current_site_id in sites_to_process:
                 try:
-                    engine = self.conn_manager.get_engine(current_site_id)
                     config = self.conn_manager.get_config(current_site_id)
                     
                     # Get the target table
-                    target_table = await self._resolve_target_table(current_site_id, engine, config)
+                    target_table = await self._resolve_target_table(current_site_id, config)
                     
-                    with engine.connect() as conn:
+                    engine = await self.conn_manager.get_async_engine(current_site_id)
+                    async with engine.connect() as conn:
                         # Find posts ready to publish
                         query_sql = text(f'''
                             UPDATE "{target_table}" 
@@ -298,7 +380,7 @@ class ContentOrchestrator:
                             RETURNING id, title
                         ''')
                         
-                        result = conn.execute(query_sql)
+                        result = await conn.execute(query_sql)
                         published_posts = []
                         
                         for row in result:
@@ -307,9 +389,13 @@ class ContentOrchestrator:
                                 "title": row.title
                             })
                         
-                        conn.commit()
+                        await conn.commit()
                         
                         if published_posts:
+                            self.conn_manager.post_counter.record_status_change(
+                                current_site_id, target_table, {"scheduled": len(published_posts)}, "published"
+                            )
+                            self.conn_manager.posts_changed(current_site_id, [post["id"] for post in published_posts])
                             results.append({
                                 "site_id": current_site_id,
                                 "published_count": len(published_posts),
@@ -318,6 +404,7 @@ class ContentOrchestrator:
                             
                 except Exception as e:
                     print(f"Error processing scheduled posts for {current_site_id}: {e}")
+                    self.conn_manager.report_failure(current_site_id, e)
                     results.append({
                         "site_id": current_site_id,
                         "error": str(e)
@@ -335,7 +422,19 @@ class ContentOrchestrator:
                 "message": str(e)
             }
 
-    async def _resolve_target_table(self, site_id, engine, config, override_table: str = None) -> str:
+    async def _resolve_target_table(self, site_id, config, override_table: str = None, force_refresh: bool = False) -> str:
+        """
+        Resolve the content table for a site. Results are cached per site in the
+        ConnectionManager, so repeat calls skip catalog lookups and auto-discovery.
+        Misses read the site's reflected schema through its AsyncEngine.
+        """
+        requested = override_table or config.target_table_name or AUTO_DISCOVERED_TABLE
+        if not force_refresh:
+            cached = self.conn_manager.get_cached_table_name(site_id, requested)
+            if cached:
+                return cached
+
+        schema = await self._site_schema(site_id)
         target_name = None
         
         if override_table:
@@ -345,8 +444,7 @@ class ContentOrchestrator:
             target_name = config.target_table_name
         else:
             print(f"Target table not specified for {site_id}. Initiating Auto-Discovery...")
-            discovery = SchemaDiscovery(engine)
-            all_tables = discovery.get_all_table_names()
+            all_tables = schema.table_names
             
             best_table = await self.gemini.identify_best_content_table(all_tables)
             
@@ -356,12 +454,19 @@ class ContentOrchestrator:
             print(f"Auto-Discovered target table: {best_table}")
             target_name = best_table
 
+        resolved = self._recover_table_name(schema, target_name)
+        self.conn_manager.cache_table_name(site_id, requested, resolved)
+        return resolved
+
+    def _recover_table_name(self, schema, target_name: str) -> str:
+        """
+        Verify the target table exists in the schema snapshot, recovering from
+        case and singular/plural mismatches (e.g. 'Blog' -> 'blogs').
+        """
         # Case-Insensitivity Check: Verify if table exists exactly as requested
-        from sqlalchemy import inspect
-        inspector = inspect(engine)
-        if not inspector.has_table(target_name):
+        if not schema.has_table(target_name):
             print(f"[RECOVERY] Table '{target_name}' not found. Checking for case-insensitive matches...")
-            all_tables = inspector.get_table_names()
+            all_tables = schema.table_names
             match = next((t for t in all_tables if t.lower() == target_name.lower()), None)
             
             if match:
@@ -397,11 +502,9 @@ class ContentOrchestrator:
         """
         Discovers potential content tables for a given site.
         """
-        engine = self.conn_manager.get_engine(site_id)
-        
-        # 1. Get all tables
-        discovery = SchemaDiscovery(engine)
-        all_tables = discovery.get_all_table_names()
+        # 1. Get all tables (reflected through the site's AsyncEngine on a miss)
+        schema = await self._site_schema(site_id)
+        all_tables = schema.table_names
         
         # 2. Try Gemini first, fallback to heuristic if quota exceeded
         try:
@@ -466,28 +569,18 @@ class ContentOrchestrator:
             "best_match": candidates[0] if candidates else None
         }
 
-    def _detect_seo_table(self, engine, main_table: str, site_id: str = None) -> Dict[str, Any]:
+    def _detect_seo_table(self, schema, main_table: str) -> Dict[str, Any]:
         """
         Detect if there's a separate SEO/meta table related to the main content table.
         Returns table name and foreign key column if found, None otherwise.
-        Uses cache to avoid repeated database introspection.
+        The result is memoized on the site's registry snapshot.
         """
-        from sqlalchemy import inspect
-        
-        # Generate cache key
-        cache_key = f"{site_id or str(engine.url)}:{main_table}"
-        
-        # Check cache first
-        if cache_key in ContentOrchestrator._seo_cache:
-            cached = ContentOrchestrator._seo_cache[cache_key]
-            if time.time() - cached["timestamp"] < SCHEMA_CACHE_TTL:
-                print(f"[SEO CACHE HIT] Using cached SEO info for {main_table}")
-                return cached["seo_info"]
-            else:
-                print(f"[SEO CACHE EXPIRED] Refreshing cache for {main_table}")
-        
-        inspector = inspect(engine)
-        all_tables = inspector.get_table_names()
+        memo_key = ("seo_table", main_table)
+        if memo_key in schema.memo:
+            print(f"[SEO CACHE HIT] Using cached SEO info for {main_table}")
+            return schema.memo[memo_key]
+
+        all_tables = schema.table_names
         
         # Common SEO table name patterns
         seo_patterns = [
@@ -506,16 +599,15 @@ class ContentOrchestrator:
         
         # Try exact matches first
         for pattern in seo_patterns:
-            if pattern in all_tables or pattern.lower() in [t.lower() for t in all_tables]:
-                # Find the actual table name (case-sensitive)
-                seo_table = next((t for t in all_tables if t.lower() == pattern.lower()), None)
-                if seo_table:
-                    # Try to find the foreign key column
-                    fk_col = self._find_foreign_key_column(engine, seo_table, main_table)
-                    if fk_col:
-                        print(f"[SEO DETECTION] Found SEO table: {seo_table} with FK: {fk_col}")
-                        seo_info = {"table": seo_table, "fk_column": fk_col}
-                        break
+            # Find the actual table name (case-sensitive)
+            seo_table = schema.find_table(pattern)
+            if seo_table:
+                # Try to find the foreign key column
+                fk_col = self._find_foreign_key_column(schema, seo_table, main_table)
+                if fk_col:
+                    print(f"[SEO DETECTION] Found SEO table: {seo_table} with FK: {fk_col}")
+                    seo_info = {"table": seo_table, "fk_column": fk_col}
+                    break
         
         # Check for tables with 'seo' or 'meta' in the name (if not found yet)
         if not seo_info:
@@ -523,32 +615,25 @@ class ContentOrchestrator:
                 table_lower = table.lower()
                 if 'seo' in table_lower or 'meta' in table_lower:
                     # Verify it has a foreign key to main table
-                    fk_col = self._find_foreign_key_column(engine, table, main_table)
+                    fk_col = self._find_foreign_key_column(schema, table, main_table)
                     if fk_col:
                         print(f"[SEO DETECTION] Found SEO table: {table} with FK: {fk_col}")
                         seo_info = {"table": table, "fk_column": fk_col}
                         break
         
         # Cache the result (even if None to avoid repeated lookups)
-        ContentOrchestrator._seo_cache[cache_key] = {
-            "seo_info": seo_info,
-            "timestamp": time.time()
-        }
+        schema.memo[memo_key] = seo_info
         print(f"[SEO CACHE MISS] Cached SEO detection result for {main_table}")
         
         return seo_info
     
-    def _find_foreign_key_column(self, engine, seo_table: str, main_table: str) -> str:
+    def _find_foreign_key_column(self, schema, seo_table: str, main_table: str) -> str:
         """
         Find the foreign key column in SEO table that references the main table.
         """
-        from sqlalchemy import inspect
-        
-        inspector = inspect(engine)
-        
         try:
             # Get foreign keys for the SEO table
-            foreign_keys = inspector.get_foreign_keys(seo_table)
+            foreign_keys = schema.foreign_keys(seo_table)
 
             for fk in foreign_keys:
                 if fk['referred_table'].lower() == main_table.lower():
@@ -556,7 +641,7 @@ class ContentOrchestrator:
                     return fk['constrained_columns'][0] if fk['constrained_columns'] else None
 
             # If no FK constraint found, try common column name patterns
-            columns = inspector.get_columns(seo_table)
+            columns = schema.columns(seo_table)
             common_fk_names = [
                 f"{main_table}_id",
                 f"{main_table}_integer",
@@ -649,28 +734,17 @@ class ContentOrchestrator:
         
         return blog_payload, seo_payload
 
-    def _inject_seo_data(self, conn, seo_table: str, fk_column: str, blog_id: int, seo_payload: Dict[str, Any], engine):
+    async def _inject_seo_data(self, conn, seo_table: str, fk_column: str, blog_id: int, seo_payload: Dict[str, Any], schema):
         """
         Insert SEO metadata into the SEO table with foreign key reference to blog.
         """
         import json
-        from sqlalchemy import inspect, text
+        from sqlalchemy import text
         
         print(f"[SEO INJECT] Inserting SEO data into {seo_table} for blog ID: {blog_id}")
 
-        # Introspect SEO table
-        inspector = inspect(engine)
-        seo_columns_info = inspector.get_columns(seo_table)
-        seo_table_map = {}
-        
-        for col in seo_columns_info:
-            norm_name = col['name'].lower().replace('_', '').replace(' ', '')
-            seo_table_map[norm_name] = {
-                'name': col['name'],
-                'type': col['type'],
-                'nullable': col['nullable']
-            }
-            seo_table_map[col['name'].lower()] = seo_table_map[norm_name]
+        # SEO table columns come from the schema registry
+        _, seo_table_map = self._get_table_map(schema, seo_table)
         
         # Build SEO final payload
         seo_final_payload = {
@@ -743,23 +817,24 @@ class ContentOrchestrator:
             
             seo_sql = text(f'INSERT INTO "{seo_table}" ({columns_sql}) VALUES ({placeholders_sql})')
             
-            conn.execute(seo_sql, clean_seo_payload)
+            await conn.execute(seo_sql, clean_seo_payload)
             print(f"[SEO INJECT] Successfully inserted {len(clean_seo_payload)-1} SEO fields into {seo_table}")
         else:
             print(f"[SEO INJECT] No SEO fields to insert (only FK)")
 
-    def _inject_content(self, engine, table_name: str, payload: Dict[str, Any], site_id: str = None) -> int:
+    async def _inject_content(self, engine, table_name: str, payload: Dict[str, Any], site_id: str = None) -> int:
         """
         Dynamically inserts the payload dictionary into the table with Smart Mapping and Auto-Filling.
         NOW SUPPORTS MULTI-TABLE INJECTION for SEO metadata!
-        Uses schema cache for improved performance.
+        Table metadata comes from the per-site schema registry; engine is the site's AsyncEngine.
         """
         import json
-        from sqlalchemy import inspect, text
+        from sqlalchemy import text
         from datetime import datetime
         
         # 0. DETECT SEO TABLE (if exists) - now uses cache
-        seo_table_info = self._detect_seo_table(engine, table_name, site_id)
+        schema = await self._site_schema(site_id)
+        seo_table_info = self._detect_seo_table(schema, table_name)
         
         # If SEO table exists, split the payload
         if seo_table_info:
@@ -773,113 +848,16 @@ class ContentOrchestrator:
             seo_payload = None
             print(f"[SINGLE-TABLE] No SEO table detected, using single-table injection")
         
-        # 1. Introspect Table (with caching)
-        cache_key = f"{site_id or str(engine.url)}:{table_name}"
-        
-        # Check schema cache first
-        cached_schema = None
-        if cache_key in ContentOrchestrator._schema_cache:
-            cached = ContentOrchestrator._schema_cache[cache_key]
-            if time.time() - cached["timestamp"] < SCHEMA_CACHE_TTL:
-                print(f"[SCHEMA CACHE HIT] Using cached schema for {table_name}")
-                cached_schema = cached
-        
-        if cached_schema:
-            columns_info = cached_schema["columns_info"]
-            table_map = cached_schema["table_map"]
-        else:
-            # Cache miss - do full introspection
-            print(f"[SCHEMA CACHE MISS] Introspecting table {table_name}")
-            inspector = inspect(engine)
-            try:
-                columns_info = inspector.get_columns(table_name)
-                # Map simplified names to actual column names (e.g., 'title' -> 'Title', 'post_title' -> 'Title')
-                # dict of { lowercase_normalized_name: { 'name': actual_name, 'type': type_obj, 'nullable': bool } }
-                table_map = {} 
-                for col in columns_info:
-                    # Normalize: lowercase, remove underscores and spaces
-                    norm_name = col['name'].lower().replace('_', '').replace(' ', '')
-                    table_map[norm_name] = {
-                        'name': col['name'],
-                        'type': str(col['type']),  # Convert to string for JSON serialization in cache
-                        'nullable': col['nullable'],
-                        'default': col.get('default')
-                    }
-                    # Also map the exact lowercase name for easier lookups
-                    table_map[col['name'].lower()] = table_map[norm_name]
-                
-                # Cache the result
-                ContentOrchestrator._schema_cache[cache_key] = {
-                    "columns_info": columns_info,
-                    "table_map": table_map,
-                    "timestamp": time.time()
-                }
-                    
-            except Exception as e:
-                print(f"Error getting columns for table {table_name}: {e}")
-                raise ValueError(f"Could not introspect table '{table_name}': {e}")
+        # 1. Introspect Table (answered by the schema registry)
+        columns_info, table_map = self._get_table_map(schema, table_name)
         
         print(f"Target Table '{table_name}' Columns: {[c['name'] for c in columns_info]}")
 
         # 2. Smart Mapping Logic
-        # We want to construct a final_payload where keys are ACTUAL column names
+        # We want to construct a final_payload where keys are ACTUAL column names,
+        # looking values up with the shared rules in services.content_adapter
         final_payload = {}
         
-        # Helper: Try to find a value in payload for a given column config
-        def find_value_for_column(col_info):
-            possible_keys = [
-                col_info['name'], 
-                col_info['name'].lower(),
-                col_info['name'].lower().replace('_', ''),
-                col_info['name'].lower().replace(' ', '')
-            ]
-            
-            # Add semantic synonyms
-            synonyms = {
-                'title': ['title', 'h1', 'headline', 'subject', 'topic', 'name', 'seotitle'],
-                'content': ['content', 'body', 'bodyhtml', 'text', 'article', 'articlebody', 'htmlcontent', 'fulltext', 'description'],
-                'slug': ['slug', 'seoslug', 'url', 'uri', 'path', 'alias'],
-                'image': ['image', 'featuredimage', 'heroimage', 'thumbnail', 'cover', 'picture', 'img'],
-                'status': ['status', 'poststatus', 'state', 'visibility', 'ispublished'],
-                'author': ['author', 'creator', 'writer', 'postedby', 'username'],
-                'excerpt': ['excerpt', 'summary', 'shortdescription', 'intro', 'teaser'], 
-                'createdat': ['createdat', 'date', 'publishdate', 'postedat', 'time', 'timestamp'],
-                'updatedat': ['updatedat', 'lastmodified', 'modified', 'editedat']
-            }
-            
-            # Check synonyms if the column name matches a known concept
-            norm_col_name = col_info['name'].lower().replace('_', '')
-            
-            # 1. Check exact matches in payload
-            for key in possible_keys:
-                if key in payload:
-                    return payload[key]
-            
-            # 2. Check synonyms
-            # Reverse lookup: is this column a 'title'?
-            for concept, keys in synonyms.items():
-                # If column name looks like this concept (e.g. 'article_title' contains 'title')
-                if concept in norm_col_name:
-                    # Check if payload has any of the concept keys
-                    for key in keys:
-                        if key in payload:
-                            return payload[key]
-                # If payload has this concept as a key (e.g. payload['title'])
-                if concept in payload:
-                     # Already handled by direct key checks if keys match perfectly, 
-                     # but this loop is for checking if 'title' column should take payload['h1'] etc.
-                     pass
-
-            # 3. Direct Fuzzy Match
-            # Iterate through payload keys and see if they loosely match column name
-            for k, v in payload.items():
-                norm_k = k.lower().replace('_', '')
-                if norm_k == norm_col_name:
-                    return v
-                # Partial match for common things? Be careful.
-            
-            return None
-
         # 3. Build Final Payload
         for norm_name, col_info in table_map.items():
             actual_name = col_info['name']
@@ -893,7 +871,7 @@ class ContentOrchestrator:
                 continue
 
             # Try to get value
-            val = find_value_for_column(col_info)
+            val = content_adapter.find_value_for_column(col_info, payload)
             
             if val is not None:
                 final_payload[actual_name] = val
@@ -979,139 +957,91 @@ class ContentOrchestrator:
 
         # 6. Execute Insert (with SEO table support)
         inserted_id = None
-        with engine.begin() as conn:
+        async with engine.begin() as conn:
             columns_sql = ", ".join([f'"{k}"' for k in clean_payload.keys()])
             placeholders_sql = ", ".join([f":{k}" for k in clean_payload.keys()])
             
             try:
                 # Use RETURNING if supported to get the inserted ID (for SEO table)
                 sql = text(f'INSERT INTO "{table_name}" ({columns_sql}) VALUES ({placeholders_sql}) RETURNING id')
-                result = conn.execute(sql, clean_payload)
+                result = await conn.execute(sql, clean_payload)
                 inserted_id = result.scalar()
                 print(f"Successfully injected record into {table_name}. ID: {inserted_id}")
             except Exception as e:
                 # If RETURNING fails (e.g. SQLite sometimes), fallback to standard insert
                 print(f"RETURNING failed, trying standard insert: {e}")
                 sql = text(f'INSERT INTO "{table_name}" ({columns_sql}) VALUES ({placeholders_sql})')
-                conn.execute(sql, clean_payload)
+                await conn.execute(sql, clean_payload)
                 
                 # Fetch last insert rowid for sqlite
                 if engine.dialect.name == "sqlite":
-                    result = conn.execute(text("SELECT last_insert_rowid()"))
+                    result = await conn.execute(text("SELECT last_insert_rowid()"))
                     inserted_id = result.scalar()
                 
                 print(f"Successfully injected record into {table_name} (No RETURNING). ID: {inserted_id}")
 
             if seo_payload and seo_table_info and inserted_id:
                 try:
-                    self._inject_seo_data(conn, seo_table_info['table'], seo_table_info['fk_column'], inserted_id, seo_payload, engine)
+                    await self._inject_seo_data(conn, seo_table_info['table'], seo_table_info['fk_column'], inserted_id, seo_payload, schema)
                 except Exception as e:
                     print(f"Error injecting SEO data: {e}")
+
+        inserted_status = next((v for k, v in clean_payload.items() if k.lower() == "status"), None)
+        self.conn_manager.post_counter.record_insert(site_id, table_name, inserted_status)
+        # Without RETURNING the new id may be unknown; the projection then rebuilds
+        self.conn_manager.posts_changed(site_id, [inserted_id] if inserted_id else None)
                     
         return inserted_id
         
-    def _inject_category_relation(self, engine, blog_id: int, category_name: str):
+    async def _inject_category_relation(self, engine, blog_id: int, category_name: str, site_id: str):
         """
         Create a link between a Blog post and a Category in the Prisma DB.
-        If the category doesn't exist, it creates it.
+        If the category doesn't exist, it creates it. Category ids come from the
+        site's category index, so known names cost no lookup query.
         """
         from sqlalchemy import text
         from datetime import datetime
         print(f"[CATEGORY INJECT] Linking Blog {blog_id} to Category: '{category_name}'")
+        index = self.conn_manager.category_index
+        index_key = site_id
         
         try:
-            with engine.begin() as conn:
-                # 1. Check if Category exists
-                cat_sql = text('SELECT "categoryId" FROM "Category" WHERE name = :name')
-                result = conn.execute(cat_sql, {"name": category_name}).fetchone()
-                
-                if result:
-                    category_id = result[0]
-                    print(f"[CATEGORY INJECT] Category exists. ID: {category_id}")
-                else:
-                    # Determine next categoryId (Prisma requires both `id` and `categoryId` in schema)
-                    max_id_sql = text('SELECT MAX("categoryId") FROM "Category"')
-                    max_id_res = conn.execute(max_id_sql).scalar()
-                    next_cat_id = (max_id_res or 0) + 1
-                    
-                    # 2. Create new Category
-                    insert_cat_sql = text('''
-                        INSERT INTO "Category" ("categoryId", name, status, "createdAt", "updatedAt") 
-                        VALUES (:cid, :name, 'active', :now, :now)
-                    ''')
-                    conn.execute(insert_cat_sql, {
-                        "cid": next_cat_id, 
-                        "name": category_name, 
-                        "now": datetime.utcnow()
-                    })
-                    category_id = next_cat_id
-                    print(f"[CATEGORY INJECT] Created new Category. ID: {category_id}")
+            async with engine.begin() as conn:
+                # 1. Resolve (or create) the category
+                category_id = await index.ensure_category(index_key, conn, category_name)
                 
-                # 3. Create mapping in BlogCategory table
+                # 2. Create mapping in BlogCategory table
                 map_sql = text('''
                     INSERT INTO "BlogCategory" ("blogId", "categoryId", "createdAt") 
                     VALUES (:bid, :cid, :now)
                 ''')
-                conn.execute(map_sql, {
+                await conn.execute(map_sql, {
                     "bid": blog_id, 
                     "cid": category_id, 
                     "now": datetime.utcnow()
                 })
-                print(f"[CATEGORY INJECT] Successfully mapped Blog {blog_id} to Category {category_id}")
+            # Injection and category updates leave the post with exactly this category
+            index.set_post(index_key, blog_id, [category_name])
+            print(f"[CATEGORY INJECT] Successfully mapped Blog {blog_id} to Category {category_id}")
                 
         except Exception as e:
+            # A rolled-back insert may have left a category id in the index that was never created
+            index.invalidate(index_key)
             print(f"[CATEGORY INJECT] Error linking category: {e}")
+
     async def update_content(self, engine, table_name: str, post_id: int, updates: Dict[str, Any], site_id: str = None):
         """
         Updates an existing record in the table with Smart Mapping.
         Only updates columns that exist in the target table.
+        engine is the site's AsyncEngine, so the update never blocks the event loop.
         """
         import json
-        from sqlalchemy import inspect, text
+        from sqlalchemy import text
         from datetime import datetime
 
-        # 1. Introspect Table (using cache if available)
-        cache_key = f"{site_id or str(engine.url)}:{table_name}"
-        
-        # Check cache (exact same logic as _inject_content)
-        cached_schema = None
-        if cache_key in ContentOrchestrator._schema_cache:
-            cached = ContentOrchestrator._schema_cache[cache_key]
-            if time.time() - cached["timestamp"] < SCHEMA_CACHE_TTL:
-                cached_schema = cached
-        
-        if cached_schema:
-            columns_info = cached_schema["columns_info"]
-            table_map = cached_schema["table_map"]
-        else:
-            inspector = inspect(engine)
-            try:
-                # Try fetching with 'public' schema first (common in PostgreSQL)
-                try:
-                    columns_info = inspector.get_columns(table_name)
-                except Exception:
-                    # Fallback to default schema (useful for SQLite or other setups)
-                    columns_info = inspector.get_columns(table_name)
-                
-                table_map = {} 
-                for col in columns_info:
-                    norm_name = col['name'].lower().replace('_', '').replace(' ', '')
-                    table_map[norm_name] = {
-                        'name': col['name'],
-                        'type': str(col['type']),
-                        'nullable': col['nullable'],
-                        'default': col.get('default')
-                    }
-                    table_map[col['name'].lower()] = table_map[norm_name]
-                
-                ContentOrchestrator._schema_cache[cache_key] = {
-                    "columns_info": columns_info,
-                    "table_map": table_map,
-                    "timestamp": time.time()
-                }
-            except Exception as e:
-                print(f"Error getting columns for table {table_name}: {e}")
-                raise ValueError(f"Could not introspect table '{table_name}': {e}")
+        # 1. Introspect Table (answered by the schema registry)
+        schema = await self._site_schema(site_id)
+        columns_info, table_map = self._get_table_map(schema, table_name)
 
         # 2. Build Set Clause with Smart Mapping
         set_parts = []
@@ -1132,21 +1062,8 @@ class ContentOrchestrator:
             if norm_key in table_map:
                 matched_col = table_map[norm_key]['name']
             else:
-                # Try fuzzy/synonym match if not exact
-                # Synonyms from _inject_content logic (could refactor to share)
-                synonyms = {
-                    'title': ['title', 'h1', 'headline', 'subject', 'topic', 'name', 'seotitle'],
-                    'content': ['content', 'body', 'bodyhtml', 'text', 'article', 'articlebody', 'htmlcontent', 'fulltext', 'description'],
-                    'slug': ['slug', 'seoslug', 'url', 'uri', 'path', 'alias'],
-                    'image': ['image', 'featuredimage', 'heroimage', 'thumbnail', 'cover', 'picture', 'img'],
-                    'status': ['status', 'poststatus', 'state', 'visibility', 'ispublished'],
-                    'author': ['author', 'creator', 'writer', 'postedby', 'username'],
-                    'excerpt': ['excerpt', 'summary', 'shortdescription', 'intro', 'teaser'], 
-                    'createdat': ['createdat', 'date', 'publishdate', 'postedat', 'time', 'timestamp'],
-                    'updatedat': ['updatedat', 'lastmodified', 'modified', 'editedat']
-                }
-                
-                for concept, keys in synonyms.items():
+                # Try fuzzy/synonym match if not exact, with the insert's synonyms
+                for concept, keys in content_adapter.SYNONYMS.items():
                     if norm_key == concept or norm_key in keys:
                         # Find if any column name matches this concept
                         for norm_col, col_info in table_map.items():
@@ -1184,31 +1101,40 @@ class ContentOrchestrator:
             sql = text(f'UPDATE "{table_name}" SET {set_sql} WHERE id = :id')
 
             print(f"Executing UPDATE on {table_name} for ID {post_id}...")
+            status_col = next((col for col in mapped_updates if col.lower() == "status"), None)
+            old_status = None
             try:
-                with engine.begin() as conn:
-                    result = conn.execute(sql, params)
+                async with engine.begin() as conn:
+                    if status_col:
+                        # Previous status keeps the site's post counters in step
+                        old_status = (await conn.execute(
+                            text(f'SELECT "{status_col}" FROM "{table_name}" WHERE id = :id'), {"id": post_id}
+                        )).scalar()
+                    result = await conn.execute(sql, params)
                     if result.rowcount == 0:
                         raise ValueError(f"No record found with ID {post_id} in {table_name}")
             except Exception as e:
                 print(f"Update failed: {e}")
                 raise
 
+            if status_col:
+                self.conn_manager.post_counter.record_status_change(
+                    site_id, table_name, {old_status: 1}, mapped_updates[status_col]
+                )
+
         if category_name:
             try:
-                with engine.begin() as conn:
-                    # Check if it's a DB with Category mapping table (PostgreSQL-compatible)
-                    from sqlalchemy import inspect as sa_inspect
-                    inspector = sa_inspect(engine)
-                    all_tables = inspector.get_table_names()
-                    has_cat_table = "Category" in all_tables or "BlogCategory" in all_tables
-                    if has_cat_table:
+                # Check if it's a DB with Category mapping table (PostgreSQL-compatible)
+                has_cat_table = schema.has_table("Category") or schema.has_table("BlogCategory")
+                if has_cat_table:
+                    async with engine.begin() as conn:
                         # Clear old mappings before injecting new one
                         delete_old_sql = text('DELETE FROM "BlogCategory" WHERE "blogId" = :bid')
-                        conn.execute(delete_old_sql, {"bid": post_id})
-                
-                if 'has_cat_table' in locals() and has_cat_table:
-                    self._inject_category_relation(engine, post_id, category_name)
+                        await conn.execute(delete_old_sql, {"bid": post_id})
+                    self.conn_manager.category_index.forget_posts(site_id, [post_id])
+                    await self._inject_category_relation(engine, post_id, category_name, site_id)
             except Exception as e:
                 print(f"Error handling category update: {e}")
 
+        self.conn_manager.posts_changed(site_id, [post_id])
         return {"status": "success", "post_id": post_id}
@@ -86,99 +86,6 @@ class ContentGenerator:
         response_text = self._call_openrouter(prompt, json_mode=True)
         return BlogContent.model_validate_json(response_text)
 
-    async def generate_schema_aware_content(self, req: ContentGenerationRequest, target_schema_text: str, post_status: str = "publish") -> Dict[str, Any]:
-        """
-        Generates content that strictly adheres to the provided database schema description.
-        Returns a raw dictionary that maps 1:1 to the target table columns.
-        """
-        if self.model_name == "mock-openrouter":
-            print(f"Mocking schema-aware generation for schema:\n{target_schema_text}")
-            return {"mock_col_1": "Content", "mock_col_2": "Meta"}
-
-        prompt = f"""
-        You are a Database Content Adapter.
-        
-        CORE STRATEGY:
-        - Campaign Name: {req.core_identity.campaign_name}
-        - Persona: {req.personalization.act_as} {f"({req.personalization.custom_persona})" if req.personalization.act_as == PersonaType.CUSTOM else ""}
-        - Topic: {req.core_identity.primary_keyword}
-        - Target Audience: {req.core_identity.target_audience}
-        - Search Intent: {req.core_identity.intent}
-        - Content Type: {req.core_identity.content_type}
-        
-        SEO PARAMETERS:
-        - Secondary Keywords: {", ".join(req.seo_technical.secondary_keywords)}
-        - Meta Description Goal: {req.seo_technical.meta_description_goal or "Auto-generate"}
-        - Internal Links to Include: {", ".join(req.seo_technical.internal_links)}
-        - Use External Authority Links: {"Yes" if req.seo_technical.external_authority_links else "No"}
-        - Featured Image URLs: {', '.join(req.seo_technical.featured_image_urls) if req.seo_technical.featured_image_urls else "None provided"}
-        
-        IMAGE MAPPING INSTRUCTION:
-        If Featured Image URLs are provided above, you MUST:
-        - Use the FIRST URL as the primary value for columns named:
-          "image", "featured_image", "hero_image", "thumbnail", "cover_image", "main_image", "post_image" or similar.
-        - If the database has a column for multiple images (like "images", "gallery", "featured_images"), store ALL URLs as a JSON array.
-        - Use the EXACT URLs provided, do not generate placeholder text.
-        
-        TONE, STYLE & PERSONALITY:
-        - Tone of Voice: {req.personalization.tone}
-        - Writing Style: {req.personalization.style}
-        - Point of View: {req.personalization.pov}
-        - Emoji Usage: {req.personalization.emoji_usage}
-        - Humanization Level (0-100): {req.personalization.humanization_level}
-        - Negative Constraints: {req.personalization.negative_constraints or "None"}
-        
-        STRUCTURE & FORMATTING:
-        - Target Word Count: {req.structure.target_word_count[0]} - {req.structure.target_word_count[1]}
-        - Header Structure: {", ".join(req.structure.header_structure)}
-        - Final CTA: {req.structure.cta}
-        
-        TASK:
-        Generate a blog post/article according to these parameters and format it strictly as a JSON object.
-        The JSON object keys MUST exactly match the column names defined in the schema below.
-        
-        {target_schema_text}
-        
-        CRITICAL - DO NOT INCLUDE THESE COLUMNS IN YOUR OUTPUT:
-        - Do NOT include PRIMARY KEY columns (marked as PRIMARY KEY in the schema) - the database auto-generates these
-        - Do NOT include columns named "id", "post_id", "article_id", or any auto-increment ID column
-        - The database will automatically assign the ID when inserting
-        
-        Constraint: Do not include fields that are not in the schema.
-        Ensure content types (VARCHAR, TEXT, INT) are respected.
-        
-        CRITICAL INSTRUCTION - CONTENT FORMATTING:
-        For columns named "content", "body", "body_html", "post_content", "article_body", "html_content" or similar TEXT/VARCHAR columns meant for the main article body:
-        - Generate PLAIN TEXT content with proper formatting using line breaks (\n\n for paragraphs)
-        - Use clear section headings followed by double line breaks
-        - Structure the content with proper hierarchy (Main sections, then subsections)
-        - Separate paragraphs with double line breaks (\n\n)
-        - Use bullet points with "• " or numbered lists with "1. ", "2. ", etc. for lists
-        - Use UPPERCASE or **text** for emphasis on important terms (but avoid actual markdown/HTML)
-        - Keep it clean, readable plain text that will display properly without HTML rendering
-        - Example format: "Introduction\n\nYour text here with proper sentences.\n\nSection Title\n\nMore content with clear paragraphs."
-        
-        CRITICAL INSTRUCTION - STATUS MAPPING:
-        The user has requested the post status be: "{post_status}".
-        Look for a column named "status", "post_status", "state", "published", "is_published", "visibility" or similar.
-        
-        IMPORTANT: If the schema shows "ALLOWED VALUES:" for this column, you MUST use one of those EXACT values (case-sensitive).
-        - For Draft/Save requests: Use the lowercase value like 'draft', 'pending', 'unpublished', or false/0
-        - For Publish requests: Use the lowercase value like 'published', 'live', 'active', or true/1
-        
-        Examples:
-        - If schema says "ALLOWED VALUES: ['draft', 'published']" and user wants Draft → use 'draft' (lowercase, exact match)
-        - If schema says "ALLOWED VALUES: ['DRAFT', 'PUBLISHED']" and user wants Draft → use 'DRAFT' (uppercase, exact match)
-        - If the column is boolean: Draft → false, Publish → true
-        
-        NEVER use a value that is not in the ALLOWED VALUES list. Match case exactly.
-        
-        Return ONLY a valid JSON object with the column names as keys.
-        """
-
-        response_text = self._call_openrouter(prompt, json_mode=True)
-        return json.loads(response_text)
-
     async def validate_content_against_schema(self, req: ContentGenerationRequest, target_schema_text: str) -> Dict[str, Any]:
         """
         Analyzes the target schema and the content request to identify any mandatory fields
@@ -0,0 +1,79 @@
+"""
+Bounded LRU of recently read public posts, in front of /api/posts/{slug}.
+
+Entries hold the encoded BlogPost with its ETag, keyed by (site_id, slug), so
+the most-read articles are served (or answered with 304) without touching the
+tenant database or the public projection. Writes made through this API drop
+the affected post ids (ConnectionManager.posts_changed); entries older than
+ttl are re-read so edits made outside this API are picked up eventually.
+"""
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+import threading
+
+from services.response_cache import CachedResponse
+
+
+class HotPostCache:
+    def __init__(self, max_entries: int = 500, ttl: float = 1800):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, CachedResponse]]" = OrderedDict()
+        # Bumped by invalidate(); lookups started before a bump are served but not stored
+        self._versions: Dict[str, int] = {}
+        # invalidate() is also called from worker threads running sync writes
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def version(self, site_id: str) -> int:
+        return self._versions.get(site_id, 0)
+
+    def get(self, site_id: str, slug: str) -> Optional[CachedResponse]:
+        key = (site_id, slug)
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None and self.ttl and hit[1].age() >= self.ttl:
+                del self._entries[key]
+                hit = None
+            if hit is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return hit[1]
+
+    def put(self, site_id: str, slug: str, post_id, entry: CachedResponse, version: int):
+        """Store entry unless the site was invalidated since version was read."""
+        with self._lock:
+            if self._versions.get(site_id, 0) != version:
+                return
+            key: Hashable = (site_id, slug)
+            self._entries[key] = (int(post_id), entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, site_id: Optional[str], post_ids: Optional[Iterable] = None):
+        """Drop the site's cached posts (only post_ids when given)."""
+        if not site_id:
+            return
+        ids = None if post_ids is None else {int(post_id) for post_id in post_ids}
+        with self._lock:
+            self._versions[site_id] = self._versions.get(site_id, 0) + 1
+            stale_keys = [
+                key for key, (post_id, _) in self._entries.items()
+                if key[0] == site_id and (ids is None or post_id in ids)
+            ]
+            for key in stale_keys:
+                del self._entries[key]
+        if stale_keys:
+            self.stats["invalidations"] += 1
+
+    def snapshot(self) -> Dict:
+        return {
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "entries": len(self._entries),
+            **self.stats,
+        }
@@ -0,0 +1,161 @@
+"""
+Keyset (cursor) pagination for site content tables.
+
+Instead of OFFSET, a page is located by seeking past the (sort key, id) of the
+last row already seen, so page 5,000 costs the same index range scan as page 1.
+Cursors are opaque to clients: base64url-encoded JSON carrying the sort, the
+seek values and the direction.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import datetime
+import json
+import sqlite3
+
+
+# sort name -> (quoted column, direction); id is always the tie-breaker
+SORTS: Dict[str, Tuple[str, str]] = {
+    "id_desc": ("id", "DESC"),
+    "id_asc": ("id", "ASC"),
+    "title_asc": ("title", "ASC"),
+    "title_desc": ("title", "DESC"),
+    "date_desc": ('"createdAt"', "DESC"),
+    "date_asc": ('"createdAt"', "ASC"),
+}
+DEFAULT_SORT = "id_desc"
+
+
+def _column_key(column: str) -> str:
+    """Row dict key for a (possibly quoted) column."""
+    return column.strip('"')
+
+
+def sort_column(sort: str) -> str:
+    """Name of the column a sort orders by (besides id)."""
+    return _column_key(SORTS.get(sort, SORTS[DEFAULT_SORT])[0])
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    # Drivers like asyncpg want real datetimes bound against timestamp columns
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return datetime.date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(sort: str, row: Dict, direction: str = "next") -> str:
+    column, _ = SORTS[sort]
+    payload = {
+        "s": sort,
+        "k": _encode_value(row.get(_column_key(column))),
+        "i": _encode_value(row.get("id")),
+        "d": direction,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["s"] not in SORTS or payload["d"] not in ("next", "prev"):
+            raise KeyError(payload["s"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid pagination cursor.")
+    return {
+        "sort": payload["s"],
+        "key": _decode_value(payload["k"]),
+        "id": _decode_value(payload["i"]),
+        "direction": payload["d"],
+    }
+
+
+def nullable_sort(schema, table_name: str, sort: str) -> bool:
+    """Whether the sort's column can hold NULLs in the table (unknown columns count as nullable)."""
+    name = sort_column(sort)
+    if name == "id":
+        return False
+    return next((col["nullable"] for col in schema.columns(table_name) if col["name"] == name), True)
+
+
+def phases(sort: str, reverse: bool = False, nullable: bool = True) -> List[Tuple[Optional[str], str]]:
+    """
+    The queries that read the sort in order, as (WHERE fragment or None, ORDER BY
+    body) pairs, id being the tie-breaker so the order is total. NULL sort keys
+    order as larger than any value (PostgreSQL's default) on every dialect: a
+    nullable column is read in two phases, its NULL rows by id and the rest by
+    (column, id), so each phase is a plain index scan rather than a sort on a
+    computed key.
+    """
+    column, direction = SORTS.get(sort, SORTS[DEFAULT_SORT])
+    if reverse:
+        direction = "ASC" if direction == "DESC" else "DESC"
+    if column == "id":
+        return [(None, f"id {direction}")]
+    order = f"{column} {direction}, id {direction}"
+    if not nullable:
+        return [(None, order)]
+    nulls = (f"{column} IS NULL", f"id {direction}")
+    values = (f"{column} IS NOT NULL", order)
+    return [nulls, values] if direction == "DESC" else [values, nulls]
+
+
+def seek_phases(cursor: Dict, params: Dict, nullable: bool = True) -> Tuple[List[Tuple[str, str]], bool]:
+    """
+    phases() for the rows after (or before) the cursor, and whether the page must
+    be read in reverse order. Phases wholly behind the cursor are left out. Adds
+    the seek values to params.
+    """
+    column, direction = SORTS[cursor["sort"]]
+    backwards = cursor["direction"] == "prev"
+    # DESC pages continue downwards; going back flips the comparison
+    op = "<" if (direction == "DESC") != backwards else ">"
+    read = "ASC" if op == ">" else "DESC"
+
+    params["cursor_id"] = cursor["id"]
+    if column == "id":
+        return [(f"id {op} :cursor_id", f"id {read}")], backwards
+
+    order = f"{column} {read}, id {read}"
+    if nullable and cursor["key"] is None:
+        # Among the NULLs only id orders; moving down leaves them for every non-NULL key
+        nulls = (f"{column} IS NULL AND id {op} :cursor_id", f"id {read}")
+        return ([nulls] if op == ">" else [nulls, (f"{column} IS NOT NULL", order)]), backwards
+
+    params["cursor_key"] = cursor["key"]
+    values = (f"({column}, id) {op} (:cursor_key, :cursor_id)", order)
+    if nullable and op == ">":
+        # Moving up reaches the NULLs after the last non-NULL key
+        return [values, (f"{column} IS NULL", f"id {read}")], backwards
+    return [values], backwards
+
+
+def page_cursors(sort: str, rows: List[Dict], has_before: bool, has_after: bool) -> Dict[str, Optional[str]]:
+    """next_cursor / prev_cursor for a page of rows in display order."""
+    return {
+        "next_cursor": encode_cursor(sort, rows[-1], "next") if rows and has_after else None,
+        "prev_cursor": encode_cursor(sort, rows[0], "prev") if rows and has_before else None,
+    }
+
+
+def supports_window_count(dialect) -> bool:
+    """Whether COUNT(*) OVER() can carry the filtered total on the page query."""
+    if dialect.name == "postgresql":
+        return True
+    if dialect.name == "sqlite":
+        return sqlite3.sqlite_version_info >= (3, 25)
+    if dialect.name in ("mysql", "mariadb"):
+        version = dialect.server_version_info or ()
+        return version >= ((10, 2) if dialect.is_mariadb else (8, 0))
+    return False
@@ -0,0 +1,182 @@
+"""
+Process-wide connection budget for tenant database pools.
+
+Every site engine reserves pool_size + max_overflow slots from a global cap.
+Pools are sized from the peak concurrency observed for that engine, usage is
+tracked through pool checkout/checkin events, and engines are ordered by last
+use so the least-recently-used idle ones can be evicted.
+
+Two engines can briefly exist for one key (a race where the loser is disposed
+by ConnectionManager._attach_engine); each keeps its own reservation under the
+key until release() returns it.
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class PoolGovernor:
+    def __init__(
+        self,
+        global_max: int = 100,
+        min_pool_size: int = 1,
+        initial_pool_size: int = 2,
+        max_pool_size: int = 5,
+        max_overflow: int = 10,
+        idle_ttl: float = 900,
+    ):
+        self.global_max = global_max
+        self.min_pool_size = min_pool_size
+        self.initial_pool_size = initial_pool_size
+        self.max_pool_size = max_pool_size
+        self.max_overflow = max_overflow
+        self.idle_ttl = idle_ttl
+
+        # key ("site_id:kind") -> pool accounting, kept in least-recently-used order
+        self.pools: "OrderedDict[str, Dict]" = OrderedDict()
+        # key -> peak checked-out connections seen during the last engine lifetime
+        self.demand: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _allocated(self) -> int:
+        return sum(p["pool_size"] + p["max_overflow"] for p in self.pools.values())
+
+    def reserve(self, key: str, sized: bool = True) -> Optional[Tuple[int, int]]:
+        """
+        Reserve budget for a new pool and return (pool_size, max_overflow),
+        or None when the cap leaves no room. Unsized pools (SQLite) are only
+        tracked for LRU/idle eviction and take no budget.
+        """
+        with self._lock:
+            if not sized:
+                self._register(key, 0, 0)
+                return 0, 0
+
+            free = self.global_max - self._allocated()
+            if free < self.min_pool_size:
+                return None
+
+            observed = self.demand.get(key) or self.initial_pool_size
+            pool_size = max(self.min_pool_size, min(observed, self.max_pool_size, free))
+            max_overflow = max(0, min(self.max_overflow, max(observed, pool_size), free - pool_size))
+            self._register(key, pool_size, max_overflow)
+            return pool_size, max_overflow
+
+    def _register(self, key: str, pool_size: int, max_overflow: int):
+        now = time.time()
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = {
+                "pool_size": 0,
+                "max_overflow": 0,
+                "reservations": [],
+                "checked_out": 0,
+                "peak": 0,
+                "created_at": now,
+            }
+        # A second engine for the key (lost race) adds its own reservation instead of replacing the first
+        pool["reservations"].append((pool_size, max_overflow))
+        pool["pool_size"] += pool_size
+        pool["max_overflow"] += max_overflow
+        pool["last_used"] = now
+        self.pools.move_to_end(key)
+
+    def attach(self, key: str, engine: Engine):
+        """Count checkouts on the engine's pool (use AsyncEngine.sync_engine for async engines)."""
+        event.listen(engine.pool, "checkout", lambda *args: self._on_checkout(key))
+        event.listen(engine.pool, "checkin", lambda *args: self._on_checkin(key))
+
+    def _on_checkout(self, key: str):
+        with self._lock:
+            pool = self.pools.get(key)
+            if pool is None:
+                return
+            pool["checked_out"] += 1
+            pool["peak"] = max(pool["peak"], pool["checked_out"])
+            pool["last_used"] = time.time()
+            self.pools.move_to_end(key)
+
+    def _on_checkin(self, key: str):
+        with self._lock:
+            pool = self.pools.get(key)
+            if pool is not None and pool["checked_out"] > 0:
+                pool["checked_out"] -= 1
+
+    def touch(self, key: str):
+        with self._lock:
+            pool = self.pools.get(key)
+            if pool is not None:
+                pool["last_used"] = time.time()
+                self.pools.move_to_end(key)
+
+    def release(self, key: str):
+        """
+        Return the budget of one engine under key (the key's record goes with
+        its last engine) and remember its peak demand for the next sizing.
+        """
+        with self._lock:
+            pool = self.pools.get(key)
+            if pool is None:
+                return
+            pool_size, max_overflow = pool["reservations"].pop()
+            pool["pool_size"] -= pool_size
+            pool["max_overflow"] -= max_overflow
+            if not pool["reservations"]:
+                self._forget(key)
+
+    def release_idle(self, key: str) -> bool:
+        """
+        Return all of key's budget for eviction, unless a connection was checked
+        out since it was listed as idle; the caller must then keep the engine.
+        """
+        with self._lock:
+            pool = self.pools.get(key)
+            if pool is not None and pool["checked_out"] > 0:
+                return False
+            self._forget(key)
+            return True
+
+    def _forget(self, key: str):
+        pool = self.pools.pop(key, None)
+        if pool is not None and pool["peak"]:
+            self.demand[key] = pool["peak"]
+
+    def idle_candidates(self, max_idle: Optional[float] = None, limit: Optional[int] = None) -> List[str]:
+        """
+        Keys of pools with nothing checked out, least recently used first.
+        With max_idle set, only pools unused for longer than that are returned.
+        """
+        now = time.time()
+        with self._lock:
+            keys = [
+                key for key, pool in self.pools.items()
+                if pool["checked_out"] == 0 and (max_idle is None or now - pool["last_used"] > max_idle)
+            ]
+        return keys[:limit] if limit else keys
+
+    def snapshot(self) -> Dict:
+        now = time.time()
+        with self._lock:
+            allocated = self._allocated()
+            return {
+                "global_max": self.global_max,
+                "allocated": allocated,
+                "available": max(0, self.global_max - allocated),
+                "checked_out": sum(p["checked_out"] for p in self.pools.values()),
+                "idle_ttl": self.idle_ttl,
+                "pools": {
+                    key: {
+                        "engines": len(p["reservations"]),
+                        "pool_size": p["pool_size"],
+                        "max_overflow": p["max_overflow"],
+                        "checked_out": p["checked_out"],
+                        "peak": p["peak"],
+                        "idle_for": round(now - p["last_used"], 1),
+                    }
+                    for key, p in self.pools.items()
+                },
+            }
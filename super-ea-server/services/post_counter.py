@@ -0,0 +1,213 @@
+"""
+Post counts for site content tables without a full COUNT(*) per request.
+
+Counts come from, in order of preference:
+  1. counters kept per site and adjusted by our own writes (inject, delete,
+     bulk actions, status changes),
+  2. catalog estimates (pg_class.reltuples, sqlite_stat1, information_schema)
+     when the caller does not need an exact figure,
+  3. an exact COUNT(*) ... GROUP BY status, run inline only when exact=True or
+     no estimate exists, and otherwise lazily in the background.
+Counters older than SITE_COUNT_EXACT_TTL are recounted in the background to
+pick up writes made outside this service.
+"""
+from typing import Dict, Optional
+import asyncio
+import threading
+import time
+
+from sqlalchemy import text
+
+
+class PostCounter:
+    def __init__(self, manager, exact_ttl: float = 600):
+        self.manager = manager
+        self.exact_ttl = exact_ttl
+        # site_id -> { "table", "total", "by_status" (None if unknown), "exact", "stale", "counted_at", "version" }
+        self.counts: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._recounts: Dict[str, asyncio.Task] = {}
+
+    def _entry(self, site_id: str, table_name: str) -> Optional[Dict]:
+        entry = self.counts.get(site_id)
+        if entry is not None and entry["table"] == table_name:
+            return entry
+        return None
+
+    def _view(self, entry: Dict) -> Dict:
+        return {
+            "total": max(0, entry["total"]),
+            # None while only an estimate is known: never an empty breakdown that looks real
+            "by_status": dict(entry["by_status"]) if entry["by_status"] is not None else None,
+            "exact": entry["exact"] and not entry["stale"],
+        }
+
+    def _store(self, site_id: str, table_name: str, total: int, by_status: Optional[Dict[str, int]], exact: bool):
+        with self._lock:
+            previous = self.counts.get(site_id)
+            self.counts[site_id] = {
+                "table": table_name,
+                "total": total,
+                "by_status": by_status,
+                "exact": exact,
+                "stale": False,
+                "counted_at": time.time(),
+                "version": (previous or {}).get("version", 0) + 1,
+            }
+            return self.counts[site_id]
+
+    async def get_counts(self, site_id: str, conn, table_name: str, exact: bool = False) -> Dict:
+        """
+        Return {"total", "by_status", "exact"} for the site's content table.
+        by_status is None when it isn't known yet (estimate on a cold cache) or
+        the table has no status column.
+        conn is an AsyncConnection already open on the site.
+        """
+        entry = self._entry(site_id, table_name)
+        if entry is not None:
+            fresh = entry["exact"] and not entry["stale"] and time.time() - entry["counted_at"] < self.exact_ttl
+            if fresh:
+                return self._view(entry)
+            if not exact:
+                self._schedule_recount(site_id, table_name)
+                return self._view(entry)
+
+        if not exact:
+            estimate = await self._estimate(conn, table_name)
+            if estimate is not None:
+                entry = self._store(site_id, table_name, estimate, None, exact=False)
+                self._schedule_recount(site_id, table_name)
+                return self._view(entry)
+
+        total, by_status = await self._count_exact(site_id, conn, table_name)
+        return self._view(self._store(site_id, table_name, total, by_status, exact=True))
+
+    def apply(self, site_id: Optional[str], table_name: str, total_delta: int = 0, status_deltas: Optional[Dict] = None):
+        """
+        Adjust the counters after a write made through this service.
+        Pass status_deltas=None when the affected statuses are unknown; the
+        per-status breakdown is then recounted on the next read.
+        """
+        if not site_id:
+            return
+        with self._lock:
+            entry = self._entry(site_id, table_name)
+            if entry is None:
+                return
+            entry["total"] += total_delta
+            entry["version"] += 1
+            if status_deltas is None:
+                entry["stale"] = True
+            elif entry["by_status"] is not None:
+                for status, delta in status_deltas.items():
+                    key = str(status) if status is not None else None
+                    entry["by_status"][key] = entry["by_status"].get(key, 0) + delta
+                    if entry["by_status"][key] <= 0:
+                        entry["by_status"].pop(key)
+
+    def record_insert(self, site_id: Optional[str], table_name: str, status: Optional[str]):
+        """One row inserted; status=None when the inserted status is not known."""
+        self.apply(site_id, table_name, 1, {status: 1} if status is not None else None)
+
+    def record_delete(self, site_id: Optional[str], table_name: str, old_statuses: Dict[str, int]):
+        """Rows deleted, given as {status: count} of the deleted rows."""
+        self.apply(site_id, table_name, -sum(old_statuses.values()), {s: -n for s, n in old_statuses.items()})
+
+    def record_status_change(self, site_id: Optional[str], table_name: str, old_statuses: Dict[str, int], new_status: str):
+        """Rows moved to new_status, given as {old_status: count} of the updated rows."""
+        deltas = {s: -n for s, n in old_statuses.items()}
+        deltas[new_status] = deltas.get(new_status, 0) + sum(old_statuses.values())
+        self.apply(site_id, table_name, 0, deltas)
+
+    def invalidate(self, site_id: str):
+        with self._lock:
+            self.counts.pop(site_id, None)
+
+    async def _estimate(self, conn, table_name: str) -> Optional[int]:
+        """Row estimate from the catalog, or None when statistics are unavailable."""
+        dialect = conn.dialect.name
+        try:
+            if dialect == "postgresql":
+                result = await conn.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+                    {"name": f'"{table_name}"'},
+                )
+            elif dialect == "sqlite":
+                has_stats = (await conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+                )).scalar()
+                if not has_stats:
+                    return None
+                stat = (await conn.execute(
+                    text("SELECT stat FROM sqlite_stat1 WHERE tbl = :name LIMIT 1"), {"name": table_name}
+                )).scalar()
+                return int(stat.split()[0]) if stat else None
+            elif dialect == "mysql":
+                result = await conn.execute(
+                    text("SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = :name"),
+                    {"name": table_name},
+                )
+            else:
+                return None
+            estimate = result.scalar()
+        except Exception as e:
+            print(f"[COUNT] Estimate unavailable for {table_name}: {e}")
+            return None
+        # reltuples is -1 for tables that were never vacuumed/analyzed
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+
+    async def _count_exact(self, site_id: str, conn, table_name: str):
+        schema = await self.manager.schema_registry.get_async(site_id, conn)
+        has_status = schema.has_table(table_name) and any(
+            col["name"] == "status" for col in schema.columns(table_name)
+        )
+        if not has_status:
+            total = (await conn.execute(text(f'SELECT COUNT(*) FROM "{table_name}"'))).scalar() or 0
+            return total, None
+
+        rows = (await conn.execute(
+            text(f'SELECT status, COUNT(*) FROM "{table_name}" GROUP BY status')
+        )).fetchall()
+        by_status = {str(row[0]) if row[0] is not None else None: row[1] for row in rows}
+        return sum(by_status.values()), by_status
+
+    def _schedule_recount(self, site_id: str, table_name: str):
+        task = self._recounts.get(site_id)
+        if task is not None and not task.done():
+            return
+        task = asyncio.create_task(self._recount(site_id, table_name))
+        self._recounts[site_id] = task
+        task.add_done_callback(lambda t: self._recounts.pop(site_id, None) if self._recounts.get(site_id) is t else None)
+
+    async def _recount(self, site_id: str, table_name: str):
+        entry = self._entry(site_id, table_name)
+        version = entry["version"] if entry else None
+        try:
+            engine = await self.manager.get_async_engine(site_id)
+            async with engine.connect() as conn:
+                total, by_status = await self._count_exact(site_id, conn, table_name)
+        except Exception as e:
+            print(f"[COUNT] Background recount failed for {site_id}: {e}")
+            return
+
+        entry = self._store(site_id, table_name, total, by_status, exact=True)
+        if version is not None and entry["version"] != version + 1:
+            # Writes landed while counting; verify on the next read
+            entry["stale"] = True
+        print(f"[COUNT] Recounted {site_id}.{table_name}: {total} rows")
+
+    def snapshot(self) -> Dict:
+        now = time.time()
+        return {
+            site_id: {
+                "table": entry["table"],
+                "total": entry["total"],
+                "by_status": entry["by_status"],
+                "exact": entry["exact"],
+                "stale": entry["stale"],
+                "age": round(now - entry["counted_at"], 1),
+            }
+            for site_id, entry in self.counts.items()
+        }
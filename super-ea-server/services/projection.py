@@ -0,0 +1,86 @@
+"""
+Column projection for list endpoints.
+
+List views only need a handful of columns, but SELECT * drags the full post
+body (tens of KB of HTML) from the tenant database and through JSON encoding.
+Callers pass fields= as either:
+  * nothing or "*"  -> every column (the previous behaviour),
+  * "summary"       -> every lightweight column of the resolved table plus an
+                       excerpt computed by the database,
+  * "a,b,c"         -> exactly those columns (validated against the schema).
+"""
+from typing import Iterable, List, Optional
+
+from sqlalchemy.sql import sqltypes
+
+# Columns that hold the post body; excluded from the summary projection
+HEAVY_COLUMNS = ("content", "body_html", "content_html", "body", "html", "markdown")
+SUMMARY = "summary"
+EXCERPT_CHARS = 280
+# How much of the body the database strips tags from before cutting the excerpt
+EXCERPT_SCAN_CHARS = 2000
+
+
+def _quote(alias: str, column: str) -> str:
+    return f'{alias}."{column}"'
+
+
+def _is_heavy(column: dict) -> bool:
+    return column["name"] in HEAVY_COLUMNS or isinstance(column["type"], sqltypes.LargeBinary)
+
+
+def _excerpt_expr(dialect: str, source: str) -> str:
+    """Plain-text excerpt of an HTML column, computed in the database."""
+    head = f"SUBSTR({source}, 1, {EXCERPT_SCAN_CHARS})"
+    if dialect == "postgresql":
+        head = f"regexp_replace({head}, '<[^>]*>', '', 'g')"
+    elif dialect in ("mysql", "mariadb"):
+        head = f"REGEXP_REPLACE({head}, '<[^>]*>', '')"
+    # SQLite has no regexp_replace; the excerpt keeps any markup
+    return f"SUBSTR({head}, 1, {EXCERPT_CHARS})"
+
+
+def summary_columns(schema, table_name: str, alias: str = "t") -> List[str]:
+    """Select list of the table's summary projection, memoized on the schema snapshot."""
+    def build():
+        columns = schema.columns(table_name)
+        names = {col["name"] for col in columns}
+        select = [_quote(alias, col["name"]) for col in columns if not _is_heavy(col) and col["name"] != "excerpt"]
+
+        source = next((name for name in HEAVY_COLUMNS if name in names), None)
+        if source is not None:
+            excerpt = _excerpt_expr(schema.dialect, _quote(alias, source))
+            if "excerpt" in names:
+                # Prefer the stored excerpt when there is one
+                excerpt = f"COALESCE(NULLIF({_quote(alias, 'excerpt')}, ''), {excerpt})"
+            select.append(f'{excerpt} AS "excerpt"')
+        elif "excerpt" in names:
+            select.append(_quote(alias, "excerpt"))
+        return select
+
+    return list(schema.remember(("summary_projection", table_name, alias), build))
+
+
+def select_list(schema, table_name: str, fields: Optional[str], required: Iterable[str] = ("id",), alias: str = "t") -> str:
+    """
+    SQL select list for fields= on table_name. Columns in `required` (keys the
+    endpoint itself needs, e.g. id and the sort column) are always included.
+    Raises ValueError for columns the table does not have.
+    """
+    fields = (fields or "").strip()
+    if not fields or fields == "*":
+        return f"{alias}.*"
+    if fields == SUMMARY:
+        select = summary_columns(schema, table_name, alias)
+        present = set(select)
+        select += [_quote(alias, name) for name in required if _quote(alias, name) not in present]
+        return ", ".join(select)
+
+    known = {col["name"] for col in schema.columns(table_name)}
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown field(s) for table '{table_name}': {', '.join(unknown)}")
+
+    names = list(dict.fromkeys([*[name for name in required if name in known], *requested]))
+    return ", ".join(_quote(alias, name) for name in names)
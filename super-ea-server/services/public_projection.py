@@ -0,0 +1,414 @@
+"""
+Materialized public projection of published posts.
+
+/api/posts used to reparse featuredImages, reformat createdAt, pick a category
+and rebuild the Next.js BlogPost shape for every post on every request. The
+projection keeps those BlogPost dicts per site in memory, newest first, so
+serving the feed is a filter-and-slice. Derived fields such as readTime (from
+the body's word count) are computed once, when a post is projected after a write.
+
+  * The first request for a site builds the projection with one query, reading
+    only the columns the BlogPost shape uses, streamed in batches and capped at
+    the PUBLIC_PROJECTION_MAX_POSTS newest posts; older posts are served by
+    lookup() from the database.
+  * Writes made through this API mark the affected post ids
+    (ConnectionManager.posts_changed); the next read re-reads only those rows.
+  * Posts edited outside this API are picked up by a background rebuild once
+    the projection is older than PUBLIC_PROJECTION_MAX_AGE, or immediately via
+    POST /sites/{id}/public-projection/rebuild (see rebuild_public_projection.py).
+"""
+from typing import Dict, Iterable, List, Optional, Set
+import asyncio
+import bisect
+import datetime
+import itertools
+import json
+import math
+import re
+import threading
+import time
+
+from sqlalchemy import bindparam, text
+
+from services import category_index, pagination
+
+FALLBACK_IMAGE = "https://images.unsplash.com/photo-1611974765270-ca12586343bb?q=80&w=1000&auto=format&fit=crop"
+DEFAULT_CATEGORY = "pre-built bots"
+# Unique slug columns, in the order format_public_post prefers them
+SLUG_COLUMNS = ("seoSlug", "slug")
+# Every column format_public_post and the category fallback read
+PUBLIC_COLUMNS = (
+    "id", "title", "h1", "seoSlug", "slug", "excerpt", "meta_description", "content", "body_html",
+    "author", "createdAt", "created_at", "featuredImages", "image", "downloadLink", "category",
+)
+LOAD_BATCH_SIZE = 500
+SUMMARY_DESCRIPTION_CHARS = 280
+WORDS_PER_MINUTE = 200
+# Feed cursors reuse the admin listing's cursor format, always newest first
+CURSOR_SORT = "date_desc"
+_TAG_RE = re.compile(r"<[^>]*>")
+_WORD_RE = re.compile(r"\w+")
+
+
+def _created_at(post: Dict):
+    raw_date = post.get("createdAt") or post.get("created_at")
+    if isinstance(raw_date, str):
+        try:
+            raw_date = datetime.datetime.fromisoformat(raw_date.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return raw_date if isinstance(raw_date, datetime.datetime) else None
+
+
+def _image_url(post: Dict) -> str:
+    # featuredImages is stored as a JSON string array like '["url1","url2"]'
+    raw_img = post.get("featuredImages") or post.get("image") or ""
+    if not raw_img:
+        return FALLBACK_IMAGE
+    try:
+        parsed = json.loads(raw_img)
+        if isinstance(parsed, list) and len(parsed) > 0:
+            return parsed[0]
+        return str(parsed) if parsed else FALLBACK_IMAGE
+    except (json.JSONDecodeError, TypeError):
+        return raw_img if raw_img.startswith("http") else FALLBACK_IMAGE
+
+
+def read_time(content: str) -> str:
+    """Reading time from the body's word count, tags excluded."""
+    words = len(_WORD_RE.findall(_TAG_RE.sub(" ", content)))
+    return f"{max(1, math.ceil(words / WORDS_PER_MINUTE))} min read"
+
+
+def format_public_post(post: Dict, categories: List[str]) -> Dict:
+    """Shape one content row as the Next.js BlogPost interface."""
+    has_date = post.get("createdAt") or post.get("created_at")
+    created = _created_at(post) if has_date else datetime.datetime.now()
+    content = post.get("content") or post.get("body_html") or ""
+    description = post.get("excerpt") or post.get("meta_description") or ""
+    return {
+        "id": str(post["id"]),
+        "title": post.get("title") or post.get("h1") or "",
+        "slug": post.get("seoSlug") or post.get("slug") or str(post["id"]),
+        "description": description,
+        "content": content,
+        "category": category_index.primary(categories) or DEFAULT_CATEGORY,
+        "author": post.get("author") or "AlgoTeam",
+        "publishDate": created.strftime("%b %d, %Y") if created else "Recently",
+        "image": _image_url(post),
+        "readTime": read_time(content),
+        "isDownloadable": bool(post.get("downloadLink")),
+        "downloadUrl": post.get("downloadLink"),
+        "price": "Free" if post.get("downloadLink") else "Premium",
+    }
+
+
+class ProjectedPost:
+    """
+    One published post, formatted once when it is written (or the projection is
+    rebuilt): the full BlogPost, a summary without the body and a lite card.
+    """
+    __slots__ = ("post_id", "created", "sort_key", "categories", "data", "summary", "lite")
+
+    def __init__(self, post: Dict, categories: List[str]):
+        self.post_id = post["id"]
+        self.created = _created_at(post)
+        # Newest first; undated rows sort first, like NULLs under ORDER BY "createdAt" DESC in PostgreSQL
+        self.sort_key = (self.created.timestamp() if self.created else float("inf"), post["id"])
+        self.categories = categories
+        self.data = format_public_post(post, categories)
+        self.lite = {k: v for k, v in self.data.items() if k != "content"}
+        if not self.lite["description"]:
+            self.lite["description"] = _TAG_RE.sub("", self.data["content"][:2000])[:SUMMARY_DESCRIPTION_CHARS]
+        self.summary = {**self.lite, "content": ""}
+
+    def view(self, name: str) -> Dict:
+        return self.lite if name == "lite" else self.summary if name == "summary" else self.data
+
+    def cursor(self) -> str:
+        return pagination.encode_cursor(CURSOR_SORT, {"createdAt": self.created, "id": self.post_id})
+
+
+class SiteProjection:
+    def __init__(self, table_name: str, posts: List[ProjectedPost], max_posts: Optional[int] = None):
+        self.table_name = table_name
+        self.posts = posts
+        self.max_posts = max_posts
+        # True when the build hit max_posts: posts older than the last one are not held
+        self.truncated = bool(max_posts) and len(posts) >= max_posts
+        self.by_slug: Dict[str, ProjectedPost] = {}
+        self.built_at = time.time()
+        self._reindex()
+
+    def _reindex(self):
+        self.posts.sort(key=lambda p: p.sort_key, reverse=True)
+        if self.max_posts and len(self.posts) > self.max_posts:
+            del self.posts[self.max_posts:]
+            self.truncated = True
+        self.by_slug = {post.data["slug"]: post for post in self.posts}
+
+    def _matching(self, category: Optional[str], start: int = 0):
+        for post in self.posts[start:]:
+            if category and category != "All" and category not in post.categories:
+                continue
+            yield post
+
+    def slice(self, category: Optional[str], limit: int, view: str = "full") -> List[Dict]:
+        return [post.view(view) for post in itertools.islice(self._matching(category), limit)]
+
+    def page(self, category: Optional[str], limit: int, view: str = "full",
+             page: Optional[int] = None, cursor: Optional[str] = None) -> Dict:
+        """
+        One page of the feed, addressed by page number or by the opaque cursor of a
+        previous page (newest first). Cursors seek by (createdAt, id) with a binary
+        search, so they stay cheap however deep the page is.
+        """
+        matching = list(self._matching(category)) if page is not None or not cursor else None
+        if cursor:
+            seek = pagination.decode_cursor(cursor)
+            if seek["sort"] != CURSOR_SORT:
+                raise ValueError("Invalid pagination cursor.")
+            key = seek["key"]
+            try:
+                target = (-(key.timestamp() if isinstance(key, datetime.datetime) else float("inf")), -int(seek["id"]))
+            except (TypeError, ValueError):
+                raise ValueError("Invalid pagination cursor.")
+            start = bisect.bisect_right(self.posts, target, key=lambda p: (-p.sort_key[0], -p.sort_key[1]))
+            rows = list(itertools.islice(self._matching(category, start), limit + 1))
+            page = None
+        else:
+            page = max(1, page or 1)
+            rows = matching[(page - 1) * limit:page * limit + 1]
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        result = {
+            "posts": [post.view(view) for post in rows],
+            "page": page,
+            "limit": limit,
+            "next_cursor": rows[-1].cursor() if rows and has_more else None,
+        }
+        if matching is not None:
+            result["total"] = len(matching)
+            result["total_pages"] = max(1, (len(matching) + limit - 1) // limit)
+        return result
+
+    def get_by_slug(self, slug: str) -> Optional[ProjectedPost]:
+        return self.by_slug.get(slug)
+
+
+class PublicProjection:
+    def __init__(self, manager, max_age: float = 1800, max_posts: int = 10000):
+        self.manager = manager
+        self.max_age = max_age
+        self.max_posts = max(1, max_posts)
+        self.sites: Dict[str, SiteProjection] = {}
+        # site_id -> post ids written since the last read; None means rebuild fully
+        self._pending: Dict[str, Optional[Set]] = {}
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.stats = {"builds": 0, "incremental": 0}
+
+    def mark_changed(self, site_id: str, post_ids: Optional[Iterable] = None):
+        """
+        Record writes to a site's posts; safe to call from worker threads. Writes
+        landing while the first build runs are recorded too, so get() re-reads them
+        once the build is done.
+        """
+        with self._lock:
+            if site_id not in self.sites and site_id not in self._pending and site_id not in self._tasks:
+                return
+            if post_ids is None:
+                self._pending[site_id] = None
+                return
+            pending = self._pending.setdefault(site_id, set())
+            if pending is not None:
+                pending.update(int(post_id) for post_id in post_ids)
+
+    def invalidate(self, site_id: str):
+        with self._lock:
+            self.sites.pop(site_id, None)
+            self._pending.pop(site_id, None)
+
+    async def get(self, site_id: str) -> SiteProjection:
+        """The site's projection with pending writes applied, building it on first use."""
+        projection = self.sites.get(site_id)
+        while projection is None or site_id in self._pending:
+            # Writes can land while an update is running; loop until they are applied
+            task = self._tasks.get(site_id) or self._spawn(site_id, self._update)
+            await asyncio.shield(task)
+            projection = self.sites.get(site_id)
+        if self.max_age and time.time() - projection.built_at > self.max_age and site_id not in self._tasks:
+            # Pick up edits made outside this API without holding up the request
+            self._spawn(site_id, self.rebuild)
+        return projection
+
+    async def refresh(self, site_id: str) -> SiteProjection:
+        """Rebuild the site's projection from scratch (e.g. after edits made outside this API)."""
+        task = self._tasks.get(site_id)
+        if task is not None:
+            # Let a running update finish rather than racing it
+            await asyncio.wait([task])
+        return await asyncio.shield(self._tasks.get(site_id) or self._spawn(site_id, self.rebuild))
+
+    async def rebuild(self, site_id: str) -> SiteProjection:
+        with self._lock:
+            self._pending.pop(site_id, None)
+        engine = await self.manager.get_async_engine(site_id)
+        config = self.manager.get_config(site_id)
+        async with engine.connect() as conn:
+            table_name = await self.manager.resolve_table_name_async(conn, config.target_table_name, site_id=site_id)
+            posts = await self._load(site_id, conn, table_name, None, limit=self.max_posts)
+
+        projection = SiteProjection(table_name, posts, self.max_posts)
+        self.sites[site_id] = projection
+        self.stats["builds"] += 1
+        print(f"[PROJECTION] Built public projection for {site_id}: {len(posts)} published posts")
+        return projection
+
+    async def _update(self, site_id: str) -> SiteProjection:
+        with self._lock:
+            projection = self.sites.get(site_id)
+            pending = self._pending.pop(site_id, set()) if projection is not None else None
+        if projection is None or pending is None:
+            return await self.rebuild(site_id)
+        if not pending:
+            return projection
+
+        try:
+            engine = await self.manager.get_async_engine(site_id)
+            async with engine.connect() as conn:
+                fresh = await self._load(site_id, conn, projection.table_name, pending)
+        except Exception:
+            # The changed ids are lost with the failed read; rebuild fully next time
+            with self._lock:
+                self._pending[site_id] = None
+            raise
+
+        keep = [post for post in projection.posts if post.post_id not in pending]
+        projection.posts = keep + fresh
+        projection._reindex()
+        self.stats["incremental"] += 1
+        return projection
+
+    async def _load(self, site_id: str, conn, table_name: str, post_ids: Optional[Set],
+                    match: Optional[str] = None, params: Optional[Dict] = None,
+                    limit: Optional[int] = None) -> List[ProjectedPost]:
+        """
+        Published rows (all, only post_ids, or those matching match) of the table as
+        ProjectedPosts; with limit, only the newest limit rows.
+        """
+        schema = await self.manager.schema_registry.get_async(site_id, conn)
+        has_cat_table = schema.has_table("BlogCategory") and schema.has_table("Category")
+        present = {col["name"] for col in schema.columns(table_name)}
+        select_sql = ", ".join(f'"{name}"' for name in PUBLIC_COLUMNS if name in present or name == "id")
+
+        where = "status = 'published'"
+        params = dict(params or {})
+        if post_ids is not None:
+            where += " AND id IN :ids"
+            params["ids"] = [int(post_id) for post_id in post_ids]
+        if match:
+            where += f" AND {match}"
+        # Same order as the feed when capped, so the cap keeps the newest posts
+        phases = [(None, None)]
+        if limit:
+            if "createdAt" in present:
+                nullable = pagination.nullable_sort(schema, table_name, CURSOR_SORT)
+                phases = pagination.phases(CURSOR_SORT, nullable=nullable)
+            else:
+                phases = [(None, "id DESC")]
+
+        rows = []
+        for phase_where, order in phases:
+            if limit and len(rows) >= limit:
+                break
+            sql = f'SELECT {select_sql} FROM "{table_name}" WHERE {where}'
+            if phase_where:
+                sql += f" AND {phase_where}"
+            if order:
+                sql += f" ORDER BY {order} LIMIT :limit"
+                params["limit"] = limit - len(rows)
+            sql = text(sql)
+            if post_ids is not None:
+                sql = sql.bindparams(bindparam("ids", expanding=True))
+            # Streamed in batches so a build never holds the whole raw result at once
+            result = await conn.stream(sql, params)
+            columns = list(result.keys())
+            async for batch in result.partitions(LOAD_BATCH_SIZE):
+                rows.extend(dict(zip(columns, row)) for row in batch)
+
+        cat_map: Dict = {}
+        if has_cat_table and rows:
+            index = self.manager.category_index
+            if post_ids is None and not match:
+                cat_map = await index.all_links(site_id, conn)
+            else:
+                cat_map = await index.categories(site_id, conn, [row["id"] for row in rows])
+
+        posts = []
+        for row in rows:
+            if has_cat_table:
+                categories = cat_map.get(row["id"], [])
+            else:
+                categories = [row["category"]] if row.get("category") else []
+            posts.append(ProjectedPost(row, categories))
+        return posts
+
+    def current(self, site_id: str) -> Optional[SiteProjection]:
+        """The site's projection if it is built and has no pending writes, without building it."""
+        if site_id in self._pending:
+            return None
+        return self.sites.get(site_id)
+
+    async def lookup(self, site_id: str, slug: str) -> Optional[ProjectedPost]:
+        """
+        One published post by slug, read straight from the site's database through
+        the unique slug index, for when the projection isn't built or is behind.
+        Posts without a slug are addressed by id, as in the projection.
+        """
+        engine = await self.manager.get_async_engine(site_id)
+        config = self.manager.get_config(site_id)
+        async with engine.connect() as conn:
+            table_name = await self.manager.resolve_table_name_async(conn, config.target_table_name, site_id=site_id)
+            schema = await self.manager.schema_registry.get_async(site_id, conn)
+            present = {col["name"] for col in schema.columns(table_name)}
+            slug_column = next((col for col in SLUG_COLUMNS if col in present), None)
+
+            posts = []
+            if slug_column:
+                posts = await self._load(site_id, conn, table_name, None, f'"{slug_column}" = :slug', {"slug": slug})
+            if not posts and slug.isdigit():
+                match = "id = :id"
+                if slug_column:
+                    match += f""" AND ("{slug_column}" IS NULL OR "{slug_column}" = '')"""
+                posts = await self._load(site_id, conn, table_name, None, match, {"id": int(slug)})
+        return posts[0] if posts else None
+
+    def _spawn(self, site_id: str, fn) -> asyncio.Task:
+        task = asyncio.create_task(fn(site_id))
+        self._tasks[site_id] = task
+
+        def done(t):
+            if self._tasks.get(site_id) is t:
+                del self._tasks[site_id]
+            if not t.cancelled() and t.exception() is not None:
+                print(f"[PROJECTION] Update failed for {site_id}: {t.exception()}")
+        task.add_done_callback(done)
+        return task
+
+    def snapshot(self) -> Dict:
+        now = time.time()
+        return {
+            "max_age": self.max_age,
+            **self.stats,
+            "sites": {
+                site_id: {
+                    "table": projection.table_name,
+                    "posts": len(projection.posts),
+                    "age": round(now - projection.built_at, 1),
+                    "pending": site_id in self._pending,
+                }
+                for site_id, projection in self.sites.items()
+            },
+        }
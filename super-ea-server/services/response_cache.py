@@ -0,0 +1,141 @@
+"""
+Stale-while-revalidate cache for public JSON responses.
+
+Entries hold the encoded body with a strong ETag and Last-Modified, so the API
+can answer conditional GETs with 304 without touching the tenant database.
+  * age < ttl               -> served as is
+  * age < ttl + stale_ttl   -> served stale, rebuilt once in the background
+  * older / missing         -> rebuilt inline; concurrent misses share one build
+Writes that change what a site publishes call invalidate(site_id) so the next
+request rebuilds instead of waiting for the TTL.
+"""
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import hashlib
+import threading
+import time
+
+from services import serialization
+
+
+class CachedResponse:
+    def __init__(self, site_id: str, body: bytes, last_modified: float):
+        self.site_id = site_id
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.last_modified = last_modified
+        self.built_at = time.time()
+
+    def age(self) -> float:
+        return time.time() - self.built_at
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """True if an If-None-Match header lists this entry's ETag (or *)."""
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison, as RFC 9110 requires for If-None-Match
+        return "*" in tags or self.etag in tags or f"W/{self.etag}" in tags
+
+
+class ResponseCache:
+    def __init__(self, ttl: float = 60, stale_ttl: float = 600, max_entries: int = 256):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        # key -> (site_id, build task); the site lets invalidate() detach its builds
+        self._builds: Dict[Hashable, Tuple[str, asyncio.Task]] = {}
+        # Bumped by invalidate(); builds started before a bump are returned but not stored
+        self._versions: Dict[str, int] = {}
+        # invalidate() is also called from worker threads running sync writes
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale": 0, "misses": 0, "revalidations": 0, "invalidations": 0}
+
+    async def get(self, key: Hashable, site_id: str, builder: Callable[[], Awaitable[Any]]) -> CachedResponse:
+        """Return the cached response for key, building it with builder() when needed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            age = entry.age()
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                return entry
+            if age < self.ttl + self.stale_ttl:
+                self.stats["stale"] += 1
+                if key not in self._builds:
+                    self.stats["revalidations"] += 1
+                    self._build(key, site_id, builder)
+                return entry
+
+        self.stats["misses"] += 1
+        build = self._builds.get(key)
+        task = build[1] if build else self._build(key, site_id, builder)
+        # Shield so a disconnecting client doesn't cancel the build others wait on
+        return await asyncio.shield(task)
+
+    def _build(self, key: Hashable, site_id: str, builder: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = asyncio.create_task(self._run_build(key, site_id, builder, self._versions.get(site_id, 0)))
+        self._builds[key] = (site_id, task)
+        task.add_done_callback(lambda t: self._forget_build(key, t))
+        return task
+
+    def _forget_build(self, key: Hashable, task: asyncio.Task):
+        build = self._builds.get(key)
+        if build is not None and build[1] is task:
+            del self._builds[key]
+        # Background revalidations nobody awaits must not log "exception never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    async def _run_build(self, key: Hashable, site_id: str, builder: Callable[[], Awaitable[Any]], version: int) -> CachedResponse:
+        try:
+            data = await builder()
+        except Exception as e:
+            print(f"[RESPONSE CACHE] Build failed for {key}: {e}")
+            raise
+
+        body = serialization.dumps(data)
+        with self._lock:
+            previous = self._entries.get(key)
+        # Unchanged content keeps its Last-Modified so If-Modified-Since keeps matching
+        last_modified = time.time()
+        entry = CachedResponse(site_id, body, last_modified)
+        if previous is not None and previous.etag == entry.etag:
+            entry.last_modified = previous.last_modified
+
+        with self._lock:
+            if self._versions.get(site_id, 0) == version:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, site_id: Optional[str]):
+        """Drop every cached response of the site (after a publish, edit, delete, ...)."""
+        if not site_id:
+            return
+        with self._lock:
+            self._versions[site_id] = self._versions.get(site_id, 0) + 1
+            stale_keys = [key for key, entry in self._entries.items() if entry.site_id == site_id]
+            for key in stale_keys:
+                del self._entries[key]
+            # Builds already running read pre-write data: later requests start their own
+            for key in [key for key, (owner, _) in list(self._builds.items()) if owner == site_id]:
+                del self._builds[key]
+        if stale_keys:
+            self.stats["invalidations"] += 1
+            print(f"[RESPONSE CACHE] Invalidated {len(stale_keys)} response(s) for {site_id}")
+
+    def snapshot(self) -> Dict:
+        return {
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "entries": len(self._entries),
+            "building": len(self._builds),
+            **self.stats,
+        }
@@ -1,27 +1,38 @@
-from sqlalchemy import inspect, Engine
-from typing import List, Dict
+from sqlalchemy import Engine
+from typing import List, Dict, Optional
+
+from services.schema_registry import engine_key
 
 class SchemaDiscovery:
-    def __init__(self, engine: Engine):
+    def __init__(self, engine: Optional[Engine] = None, site_id: Optional[str] = None, schema=None):
+        # An already-loaded registry snapshot (e.g. from get_async) needs no engine
         self.engine = engine
-        self.inspector = inspect(engine)
+        self.site_id = site_id
+        self._schema = schema
 
+    @property
+    def schema(self):
+        """Reflected schema from the shared per-site registry (loaded on first use)."""
+        if self._schema is None:
+            from services.connection_manager import ConnectionManager
+            registry = ConnectionManager.get_instance().schema_registry
+            self._schema = registry.get(self.site_id or engine_key(self.engine), bind=self.engine)
+        return self._schema
 
     def get_all_table_names(self) -> List[str]:
         """Returns a list of all table names in the database."""
-        return self.inspector.get_table_names()
+        return self.schema.table_names
 
     def get_table_schema(self, table_name: str) -> str:
         """
         Introspects the table and returns a text representation
         formatted for the Gemini System Prompt.
         """
-        if not self.inspector.has_table(table_name):
+        if not self.schema.has_table(table_name):
             raise ValueError(f"Table '{table_name}' not found in database.")
 
-        columns = self.inspector.get_columns(table_name)
-        pk_constraint = self.inspector.get_pk_constraint(table_name)
-        pks = pk_constraint.get('constrained_columns', [])
+        columns = self.schema.columns(table_name)
+        pks = self.schema.primary_key(table_name)
         
         # Get ENUM types from PostgreSQL
         enum_values = self._get_enum_values()
@@ -46,31 +57,12 @@ class SchemaDiscovery:
 
         return schema_text
     
-    def _get_enum_values(self) -> dict:
+    def _get_enum_values(self) -> Dict[str, List[str]]:
         """
-        Retrieves all ENUM types and their values from PostgreSQL.
-        Returns a dict mapping enum_name -> list of allowed values.
+        Returns the PostgreSQL ENUM types reflected by the schema registry,
+        as a dict mapping enum_name -> list of allowed values.
         """
-        enum_values = {}
-        try:
-            from sqlalchemy import text
-            with self.engine.connect() as conn:
-                # Query PostgreSQL for ENUM types
-                result = conn.execute(text("""
-                    SELECT t.typname AS enum_name, e.enumlabel AS enum_value
-                    FROM pg_type t
-                    JOIN pg_enum e ON t.oid = e.enumtypid
-                    ORDER BY t.typname, e.enumsortorder
-                """))
-                for row in result:
-                    enum_name = row[0]
-                    enum_value = row[1]
-                    if enum_name not in enum_values:
-                        enum_values[enum_name] = []
-                    enum_values[enum_name].append(enum_value)
-        except Exception as e:
-            print(f"Could not retrieve ENUM values: {e}")
-        return enum_values
+        return self.schema.enums
 
     def get_structure_for_prompt(self, table_name: str) -> str:
         """
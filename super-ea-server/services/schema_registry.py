@@ -0,0 +1,226 @@
+"""
+Per-site registry of reflected database metadata.
+
+Tables, columns, primary keys, foreign keys and PostgreSQL enum labels are
+reflected once per site and answered from memory until the TTL expires or the
+site is refreshed. Facts derived from the schema (SEO table detection, column
+maps) are memoized on the snapshot so they are dropped together with it.
+"""
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import hashlib
+import threading
+import time
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+
+def engine_key(engine) -> str:
+    """
+    Registry key for an engine used without a site_id. str(engine.url) masks the
+    password, so databases differing only in credentials would share an entry;
+    the full URL is hashed instead so it never shows up in snapshots or logs.
+    """
+    url = engine.url.render_as_string(hide_password=False)
+    return "engine:" + hashlib.sha256(url.encode()).hexdigest()[:16]
+
+
+class SiteSchema:
+    """Reflected catalog of one site's default schema."""
+
+    def __init__(self, key: str, dialect: str, tables: Dict[str, Dict], enums: Dict[str, List[str]]):
+        self.key = key
+        self.dialect = dialect
+        # table -> { "columns": [...], "primary_key": [...], "foreign_keys": [...] }
+        self.tables = tables
+        # enum type name -> allowed labels (PostgreSQL only)
+        self.enums = enums
+        self.loaded_at = time.time()
+        self.memo: Dict[Any, Any] = {}
+        self._by_lower = {name.lower(): name for name in tables}
+
+    @property
+    def table_names(self) -> List[str]:
+        return list(self.tables)
+
+    def has_table(self, table_name: str) -> bool:
+        return table_name in self.tables
+
+    def find_table(self, table_name: str) -> Optional[str]:
+        """Exact match first, then case-insensitive."""
+        if table_name in self.tables:
+            return table_name
+        return self._by_lower.get(table_name.lower())
+
+    def columns(self, table_name: str) -> List[Dict]:
+        info = self.tables.get(table_name)
+        if info is None:
+            raise ValueError(f"Table '{table_name}' not found in database.")
+        return info["columns"]
+
+    def primary_key(self, table_name: str) -> List[str]:
+        info = self.tables.get(table_name)
+        return info["primary_key"] if info else []
+
+    def foreign_keys(self, table_name: str) -> List[Dict]:
+        info = self.tables.get(table_name)
+        return info["foreign_keys"] if info else []
+
+    def remember(self, key: Any, factory: Callable[[], Any]) -> Any:
+        """Memoize a value derived from this snapshot."""
+        if key not in self.memo:
+            self.memo[key] = factory()
+        return self.memo[key]
+
+    def summary(self) -> Dict:
+        return {
+            "dialect": self.dialect,
+            "tables": len(self.tables),
+            "enums": len(self.enums),
+            "loaded_at": self.loaded_at,
+        }
+
+
+class SchemaRegistry:
+    def __init__(self, manager, ttl: float = 1800):
+        self.manager = manager
+        self.ttl = ttl
+        self._schemas: Dict[str, SiteSchema] = {}
+        self._lock = threading.Lock()
+        # Reentrant: a sync get() on the event loop thread may run while get_async() holds it there
+        self._site_locks: Dict[str, threading.RLock] = {}
+        self._async_locks: Dict[str, asyncio.Lock] = {}
+        self.stats = {"hits": 0, "loads": 0}
+
+    def _fresh(self, key: str) -> Optional[SiteSchema]:
+        schema = self._schemas.get(key)
+        if schema is not None and time.time() - schema.loaded_at < self.ttl:
+            with self._lock:
+                self.stats["hits"] += 1
+            return schema
+        return None
+
+    def _site_lock(self, key: str) -> threading.RLock:
+        with self._lock:
+            return self._site_locks.setdefault(key, threading.RLock())
+
+    def _async_lock(self, key: str) -> asyncio.Lock:
+        # Only used on the event loop thread, so no thread lock is needed
+        return self._async_locks.setdefault(key, asyncio.Lock())
+
+    def get(self, key: str, bind=None) -> SiteSchema:
+        """
+        Return the site's schema, reflecting it on a miss. `key` is normally the
+        site_id; bind may be an Engine or a sync Connection and defaults to the
+        site's engine. Concurrent misses for the same site reflect once.
+        """
+        schema = self._fresh(key)
+        if schema is not None:
+            return schema
+
+        with self._site_lock(key):
+            schema = self._fresh(key)
+            if schema is not None:
+                return schema
+            if bind is None:
+                bind = self.manager.get_engine(key)
+            return self._load(key, bind)
+
+    async def get_async(self, key: str, conn=None) -> SiteSchema:
+        """
+        Async access. With an AsyncConnection the reflection runs through
+        run_sync on that connection, otherwise on a worker thread. Concurrent
+        misses for the same site reflect once, as with get().
+        """
+        schema = self._fresh(key)
+        if schema is not None:
+            return schema
+        async with self._async_lock(key):
+            schema = self._fresh(key)
+            if schema is not None:
+                return schema
+            site_lock = self._site_lock(key)
+            # Never block the loop on a worker thread's reflection: wait for it off the loop instead
+            if conn is not None and site_lock.acquire(blocking=False):
+                try:
+                    schema = self._fresh(key)
+                    if schema is not None:
+                        return schema
+                    return await conn.run_sync(lambda sync_conn: self._load(key, sync_conn))
+                finally:
+                    site_lock.release()
+            return await asyncio.to_thread(self.get, key)
+
+    def invalidate(self, key: str):
+        self._schemas.pop(key, None)
+
+    async def refresh(self, key: str) -> SiteSchema:
+        self.invalidate(key)
+        return await self.get_async(key)
+
+    def _load(self, key: str, bind) -> SiteSchema:
+        started = time.time()
+        schema = self._reflect(key, bind)
+        with self._lock:
+            self._schemas[key] = schema
+            self.stats["loads"] += 1
+        print(f"[SCHEMA REGISTRY] Reflected {len(schema.tables)} tables for {key} in {time.time() - started:.2f}s")
+        return schema
+
+    def _reflect(self, key: str, bind) -> SiteSchema:
+        inspector = inspect(bind)
+        dialect = inspector.dialect.name
+        names = inspector.get_table_names()
+        tables = {name: {"columns": [], "primary_key": [], "foreign_keys": []} for name in names}
+
+        try:
+            # One catalog query per kind of object instead of one per table
+            columns = inspector.get_multi_columns()
+            pks = inspector.get_multi_pk_constraint()
+            fks = inspector.get_multi_foreign_keys()
+            for (_, name), cols in columns.items():
+                if name in tables:
+                    tables[name]["columns"] = cols
+            for (_, name), pk in pks.items():
+                if name in tables:
+                    tables[name]["primary_key"] = pk.get("constrained_columns") or []
+            for (_, name), fk_list in fks.items():
+                if name in tables:
+                    tables[name]["foreign_keys"] = fk_list
+        except (AttributeError, NotImplementedError):
+            for name in names:
+                tables[name]["columns"] = inspector.get_columns(name)
+                tables[name]["primary_key"] = inspector.get_pk_constraint(name).get("constrained_columns") or []
+                tables[name]["foreign_keys"] = inspector.get_foreign_keys(name)
+
+        enums = self._reflect_enums(bind) if dialect == "postgresql" else {}
+        return SiteSchema(key, dialect, tables, enums)
+
+    def _reflect_enums(self, bind) -> Dict[str, List[str]]:
+        """Retrieve all ENUM types and their labels from PostgreSQL."""
+        sql = text("""
+            SELECT t.typname AS enum_name, e.enumlabel AS enum_value
+            FROM pg_type t
+            JOIN pg_enum e ON t.oid = e.enumtypid
+            ORDER BY t.typname, e.enumsortorder
+        """)
+        enum_values: Dict[str, List[str]] = {}
+        try:
+            if isinstance(bind, Engine):
+                with bind.connect() as conn:
+                    rows = conn.execute(sql).fetchall()
+            else:
+                rows = bind.execute(sql).fetchall()
+            for enum_name, enum_value in rows:
+                enum_values.setdefault(enum_name, []).append(enum_value)
+        except Exception as e:
+            print(f"Could not retrieve ENUM values: {e}")
+        return enum_values
+
+    def snapshot(self) -> Dict:
+        return {
+            "ttl": self.ttl,
+            "stats": dict(self.stats),
+            "sites": {key: schema.summary() for key, schema in self._schemas.items()},
+        }
@@ -0,0 +1,347 @@
+"""
+Ranked post search for site content tables.
+
+Each site gets the best backend its database supports:
+  * pg_fts   - PostgreSQL tsvector expression index ("<table>_search_fts")
+  * pg_trgm  - PostgreSQL pg_trgm GIN indexes on title / h1 (indexed ILIKE)
+  * fts5     - SQLite FTS5 external-content shadow table ("<table>_fts"),
+               kept in sync with the content table by triggers
+  * like     - portable LOWER(...) LIKE fallback (sequential scan)
+Indexes are never created implicitly; POST /sites/{id}/search/index builds
+them. The chosen backend is memoized on the site's schema snapshot, so it is
+re-detected after a schema refresh or an index build.
+
+search_all() fans one query out to many sites at once under a shared deadline
+and merges the hits; sites that miss the deadline or fail are reported next to
+the partial results instead of failing the whole search.
+"""
+from typing import Dict, Iterable, List, Optional
+import asyncio
+import re
+import time
+
+from sqlalchemy import text
+
+from services import projection
+from services.circuit_breaker import SiteUnavailableError
+from services.serialization import RowSerializer
+
+# Columns searched by the indexed backends, when the table has them
+SEARCH_COLUMNS = ("title", "h1", "content")
+# The LIKE and trigram backends only match short columns
+LIKE_COLUMNS = ("title", "h1")
+TS_CONFIG = "english"
+INDEX_KINDS = ("fts", "trgm")
+
+
+class SearchBackend:
+    """Portable LIKE search. Subclasses swap in indexed matching and ranking."""
+
+    name = "like"
+    indexed = False
+
+    def __init__(self, table_name: str, columns: List[str]):
+        self.table_name = table_name
+        self.columns = columns
+
+    def _like_columns(self) -> List[str]:
+        return [col for col in self.columns if col in LIKE_COLUMNS] or self.columns[:1]
+
+    def searched_columns(self) -> List[str]:
+        """Columns match_clause actually looks at."""
+        return self._like_columns()
+
+    def match_clause(self, query: str, params: Dict, alias: Optional[str] = None) -> str:
+        """WHERE fragment matching query; binds its values into params."""
+        prefix = f"{alias}." if alias else ""
+        params["search"] = f"%{query.lower()}%"
+        return "(" + " OR ".join(f'LOWER({prefix}"{col}") LIKE :search' for col in self._like_columns()) + ")"
+
+    def rank_expr(self, params: Dict, alias: str = "t") -> str:
+        """Relevance of a matching row, higher is better."""
+        first = self._like_columns()[0]
+        return f'CASE WHEN LOWER({alias}."{first}") LIKE :search THEN 1 ELSE 0 END'
+
+    def ranked_sql(self, select_sql: str, query: str, filters: List[str], params: Dict) -> str:
+        """Full statement returning matching rows of alias t, best first, with a "rank" column."""
+        where = [self.match_clause(query, params, alias="t"), *filters]
+        return (
+            f'SELECT {select_sql}, {self.rank_expr(params)} AS "rank" FROM "{self.table_name}" t '
+            f'WHERE {" AND ".join(where)} ORDER BY "rank" DESC, t.id DESC LIMIT :limit'
+        )
+
+    def describe(self) -> Dict:
+        return {"backend": self.name, "indexed": self.indexed, "columns": self.searched_columns()}
+
+
+class PostgresFullTextBackend(SearchBackend):
+    name = "pg_fts"
+    indexed = True
+
+    def searched_columns(self) -> List[str]:
+        return self.columns
+
+    def _document(self, alias: Optional[str] = None) -> str:
+        # Must match the indexed expression exactly for the planner to use the index
+        prefix = f"{alias}." if alias else ""
+        parts = " || ' ' || ".join(f"""coalesce({prefix}"{col}", '')""" for col in self.columns)
+        return f"to_tsvector('{TS_CONFIG}'::regconfig, {parts})"
+
+    def match_clause(self, query: str, params: Dict, alias: Optional[str] = None) -> str:
+        params["search"] = query
+        return f"{self._document(alias)} @@ websearch_to_tsquery('{TS_CONFIG}'::regconfig, :search)"
+
+    def rank_expr(self, params: Dict, alias: str = "t") -> str:
+        return f"ts_rank({self._document(alias)}, websearch_to_tsquery('{TS_CONFIG}'::regconfig, :search))"
+
+    def index_sql(self) -> List[str]:
+        return [
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{self.table_name}_search_fts" '
+            f'ON "{self.table_name}" USING GIN ({self._document()})'
+        ]
+
+
+class PostgresTrigramBackend(SearchBackend):
+    name = "pg_trgm"
+    indexed = True
+
+    def match_clause(self, query: str, params: Dict, alias: Optional[str] = None) -> str:
+        # pg_trgm GIN indexes serve ILIKE '%x%' directly
+        prefix = f"{alias}." if alias else ""
+        params["search"] = f"%{query}%"
+        params["search_text"] = query
+        return "(" + " OR ".join(f'{prefix}"{col}" ILIKE :search' for col in self._like_columns()) + ")"
+
+    def rank_expr(self, params: Dict, alias: str = "t") -> str:
+        scores = [f"""similarity(coalesce({alias}."{col}", ''), :search_text)""" for col in self._like_columns()]
+        return scores[0] if len(scores) == 1 else f"GREATEST({', '.join(scores)})"
+
+    def index_sql(self) -> List[str]:
+        return ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + [
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{self.table_name}_{col}_trgm" '
+            f'ON "{self.table_name}" USING GIN ("{col}" gin_trgm_ops)'
+            for col in self._like_columns()
+        ]
+
+
+class SqliteFts5Backend(SearchBackend):
+    name = "fts5"
+    indexed = True
+
+    def searched_columns(self) -> List[str]:
+        return self.columns
+
+    @property
+    def fts_table(self) -> str:
+        return f"{self.table_name}_fts"
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        # Quote every token so user input can't inject FTS5 syntax; the last one matches as a prefix
+        tokens = re.findall(r"\w+", query)
+        if not tokens:
+            return ""
+        quoted = ['"' + token.replace('"', '""') + '"' for token in tokens]
+        quoted[-1] += "*"
+        return " ".join(quoted)
+
+    def match_clause(self, query: str, params: Dict, alias: Optional[str] = None) -> str:
+        prefix = f"{alias}." if alias else ""
+        params["search"] = self._fts_query(query)
+        if not params["search"]:
+            return "1 = 0"
+        return f'{prefix}id IN (SELECT rowid FROM "{self.fts_table}" WHERE "{self.fts_table}" MATCH :search)'
+
+    def ranked_sql(self, select_sql: str, query: str, filters: List[str], params: Dict) -> str:
+        params["search"] = self._fts_query(query)
+        if not params["search"]:
+            filters = [*filters, "1 = 0"]
+        # bm25 rank is only available inside the FTS query; lower is better
+        where = [f'"{self.fts_table}" MATCH :search', *filters]
+        return (
+            f'SELECT {select_sql}, -f.rank AS "rank" FROM "{self.fts_table}" f '
+            f'JOIN "{self.table_name}" t ON t.id = f.rowid '
+            f'WHERE {" AND ".join(where)} ORDER BY f.rank LIMIT :limit'
+        )
+
+    def index_sql(self) -> List[str]:
+        table, fts = self.table_name, self.fts_table
+        cols = ", ".join(f'"{col}"' for col in self.columns)
+        new_vals = ", ".join(f'new."{col}"' for col in self.columns)
+        old_vals = ", ".join(f'old."{col}"' for col in self.columns)
+        delete_old = f"""INSERT INTO "{fts}"("{fts}", rowid, {cols}) VALUES ('delete', old.id, {old_vals});"""
+        insert_new = f"""INSERT INTO "{fts}"(rowid, {cols}) VALUES (new.id, {new_vals});"""
+        return [
+            f"""CREATE VIRTUAL TABLE IF NOT EXISTS "{fts}" USING fts5({cols}, content='{table}', content_rowid='id')""",
+            f'CREATE TRIGGER IF NOT EXISTS "{fts}_ai" AFTER INSERT ON "{table}" BEGIN {insert_new} END',
+            f'CREATE TRIGGER IF NOT EXISTS "{fts}_ad" AFTER DELETE ON "{table}" BEGIN {delete_old} END',
+            f'CREATE TRIGGER IF NOT EXISTS "{fts}_au" AFTER UPDATE ON "{table}" BEGIN {delete_old} {insert_new} END',
+            f"""INSERT INTO "{fts}"("{fts}") VALUES ('rebuild')""",
+        ]
+
+
+class SiteSearch:
+    def __init__(self, manager, deadline: float = 3, concurrency: int = 20):
+        self.manager = manager
+        # Default per-search deadline and max sites queried at once by search_all()
+        self.deadline = deadline
+        self.concurrency = max(1, concurrency)
+        self.stats = {"federated": 0, "site_timeouts": 0, "site_errors": 0}
+
+    def _columns(self, schema, table_name: str) -> List[str]:
+        present = {col["name"] for col in schema.columns(table_name)}
+        columns = [col for col in SEARCH_COLUMNS if col in present]
+        if not columns:
+            raise ValueError(f"Table '{table_name}' has no searchable columns ({', '.join(SEARCH_COLUMNS)}).")
+        return columns
+
+    async def _detect(self, conn, schema, table_name: str) -> SearchBackend:
+        columns = self._columns(schema, table_name)
+        if schema.dialect == "sqlite":
+            if schema.has_table(f"{table_name}_fts"):
+                return SqliteFts5Backend(table_name, columns)
+        elif schema.dialect == "postgresql":
+            rows = (await conn.execute(
+                # Only the schema the unqualified table name resolves to
+                text("SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :table"),
+                {"table": table_name},
+            )).fetchall()
+            if any(name == f"{table_name}_search_fts" for name, _ in rows):
+                return PostgresFullTextBackend(table_name, columns)
+            if any("gin_trgm_ops" in definition for _, definition in rows):
+                return PostgresTrigramBackend(table_name, columns)
+        return SearchBackend(table_name, columns)
+
+    async def backend(self, site_id: str, conn, table_name: str) -> SearchBackend:
+        """The site's search backend for table_name, memoized on its schema snapshot."""
+        schema = await self.manager.schema_registry.get_async(site_id, conn)
+        key = ("search_backend", table_name)
+        if key not in schema.memo:
+            schema.memo[key] = await self._detect(conn, schema, table_name)
+            print(f"[SEARCH] {site_id}.{table_name}: using {schema.memo[key].name}")
+        return schema.memo[key]
+
+    async def create_index(self, site_id: str, table_name: str, kind: str = "fts") -> Dict:
+        """
+        Build the search index for the site's table on a dedicated connection.
+        PostgreSQL indexes are built CONCURRENTLY (outside a transaction) so
+        writes to the table continue meanwhile.
+        """
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"Unknown search index kind '{kind}'. Use one of: {', '.join(INDEX_KINDS)}")
+        schema = await self.manager.schema_registry.get_async(site_id)
+        columns = self._columns(schema, table_name)
+
+        if schema.dialect == "postgresql":
+            backend = PostgresFullTextBackend(table_name, columns) if kind == "fts" else PostgresTrigramBackend(table_name, columns)
+            options = {"isolation_level": "AUTOCOMMIT"}
+        elif schema.dialect == "sqlite" and kind == "fts":
+            backend = SqliteFts5Backend(table_name, columns)
+            options = {}
+        else:
+            raise ValueError(f"Search index '{kind}' is not supported on {schema.dialect}.")
+
+        engine = await self.manager.get_async_engine(site_id)
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(**options)
+            for statement in backend.index_sql():
+                await conn.execute(text(statement))
+            await conn.commit()
+
+        # New indexes / shadow tables change what _detect finds
+        self.manager.invalidate_schema(site_id)
+        print(f"[SEARCH] Built {backend.name} index for {site_id}.{table_name}")
+        return backend.describe()
+
+    async def search(self, site_id: str, query: str, limit: int = 20, status: Optional[str] = None,
+                     fields: Optional[str] = "summary") -> Dict:
+        """Ranked hits for query in the site's content table, best first."""
+        engine = await self.manager.get_async_engine(site_id)
+        config = self.manager.get_config(site_id)
+        started = time.time()
+
+        async with engine.connect() as conn:
+            table_name = await self.manager.resolve_table_name_async(conn, config.target_table_name, site_id=site_id)
+            schema = await self.manager.schema_registry.get_async(site_id, conn)
+            backend = await self.backend(site_id, conn, table_name)
+
+            params = {"limit": limit}
+            filters = []
+            if status:
+                filters.append("t.status = :status")
+                params["status"] = status
+
+            select_sql = projection.select_list(schema, table_name, fields)
+            result = await conn.execute(text(backend.ranked_sql(select_sql, query, filters, params)), params)
+            posts = RowSerializer.for_result(result, schema, table_name).dicts(result.fetchall())
+
+        return {
+            "site_id": site_id,
+            "table": table_name,
+            **backend.describe(),
+            "count": len(posts),
+            "took_ms": round((time.time() - started) * 1000, 1),
+            "posts": posts,
+        }
+
+    async def search_all(self, query: str, site_ids: Optional[Iterable[str]] = None, limit: int = 20,
+                         per_site: int = 10, status: Optional[str] = None, fields: Optional[str] = "summary",
+                         deadline: Optional[float] = None) -> Dict:
+        """
+        Search every site (or site_ids) concurrently and merge the hits.
+
+        The whole fan-out gets one deadline, so the response takes about as long
+        as the slowest site that made it, never longer than the deadline. Ranks
+        from different backends aren't comparable, so each site's scores are
+        scaled to its best hit (1.0) before merging; ties keep per-site order.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        names = {site["id"]: site["name"] for site in self.manager.list_sites()}
+        site_ids = list(names) if site_ids is None else [site_id for site_id in site_ids if site_id in names]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.time()
+
+        async def run(site_id: str) -> Dict:
+            async with semaphore:
+                return await self.search(site_id, query, limit=per_site, status=status, fields=fields)
+
+        tasks = {asyncio.create_task(run(site_id)): site_id for site_id in site_ids}
+        done, pending = await asyncio.wait(tasks, timeout=deadline) if tasks else (set(), set())
+        for task in pending:
+            task.cancel()
+            # Cancelled queries unwind in the background; the response doesn't wait for them
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        sites: Dict[str, Dict] = {}
+        hits = []
+        for task, site_id in tasks.items():
+            entry = {"name": names[site_id]}
+            if task in pending:
+                self.stats["site_timeouts"] += 1
+                entry.update(status="timeout", error=f"No answer within {deadline}s")
+            elif task.exception() is not None:
+                exc = task.exception()
+                self.stats["site_errors"] += 1
+                entry.update(status="unavailable" if isinstance(exc, SiteUnavailableError) else "error", error=str(exc))
+            else:
+                result = task.result()
+                entry.update(status="ok", backend=result["backend"], count=result["count"], took_ms=result["took_ms"])
+                best = max((post["rank"] or 0 for post in result["posts"]), default=0)
+                for position, post in enumerate(result["posts"]):
+                    relevance = (post["rank"] or 0) / best if best > 0 else 1.0
+                    hits.append((-relevance, position, site_id, {
+                        "site_id": site_id, "site_name": names[site_id], "relevance": round(relevance, 4), **post,
+                    }))
+            sites[site_id] = entry
+
+        hits.sort(key=lambda hit: hit[:3])
+        self.stats["federated"] += 1
+        return {
+            "query": query,
+            "deadline": deadline,
+            "partial": any(entry["status"] != "ok" for entry in sites.values()),
+            "took_ms": round((time.time() - started) * 1000, 1),
+            "sites": sites,
+            "count": min(len(hits), limit),
+            "posts": [hit[3] for hit in hits[:limit]],
+        }
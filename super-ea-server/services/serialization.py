@@ -0,0 +1,121 @@
+"""
+Row serialization for endpoints that return tenant rows.
+
+Endpoints used to build rows with dict(zip(columns, row)), walk every value
+with isinstance() to stringify dates, and leave the rest to FastAPI's
+jsonable_encoder and the stdlib encoder. Instead:
+  * RowSerializer picks converters once per query shape from the site's
+    reflected column types (memoized on the schema snapshot) and only touches
+    the columns that need converting,
+  * FastJSONResponse encodes with orjson when it is installed (stdlib json
+    otherwise); endpoints return it directly, which skips jsonable_encoder.
+Dates keep their previous str() format ("2024-01-31 09:30:00").
+"""
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import json
+
+from fastapi.responses import JSONResponse
+from sqlalchemy.sql import sqltypes
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder produces the same JSON, more slowly
+    orjson = None
+
+Converter = Callable[[Any], Any]
+
+
+def _to_str(value):
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+def _to_number(value):
+    # Same rule as FastAPI's decimal encoder: integral decimals become ints
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    return value
+
+
+def _to_text(value):
+    return bytes(value).decode() if isinstance(value, (bytes, bytearray, memoryview)) else value
+
+
+def converter_for(column_type) -> Optional[Converter]:
+    """Converter for values of a reflected column type, or None if they encode as they are."""
+    if isinstance(column_type, (sqltypes.DateTime, sqltypes.Date, sqltypes.Time, sqltypes.Interval)):
+        return _to_str
+    if isinstance(column_type, sqltypes.Numeric) and not isinstance(column_type, sqltypes.Float):
+        return _to_number
+    if isinstance(column_type, sqltypes.LargeBinary):
+        return _to_text
+    return None
+
+
+class RowSerializer:
+    """Turns result rows of one query shape into JSON-ready dicts."""
+
+    def __init__(self, columns: Sequence[str], column_types: Dict[str, Any]):
+        self.columns = list(columns)
+        self.converters: List[Tuple[int, str, Converter]] = []
+        for index, name in enumerate(self.columns):
+            converter = converter_for(column_types[name]) if name in column_types else None
+            if converter is not None:
+                self.converters.append((index, name, converter))
+
+    @classmethod
+    def for_result(cls, result, schema=None, table_name: Optional[str] = None) -> "RowSerializer":
+        """Serializer for a result's columns, typed from table_name in the site's schema snapshot."""
+        columns = tuple(result.keys())
+        if schema is None or not table_name or not schema.has_table(table_name):
+            return cls(columns, {})
+
+        def build():
+            return cls(columns, {col["name"]: col["type"] for col in schema.columns(table_name)})
+        return schema.remember(("row_serializer", table_name, columns), build)
+
+    def dicts(self, rows: Iterable) -> List[Dict]:
+        columns, converters = self.columns, self.converters
+        if not converters:
+            return [dict(zip(columns, row)) for row in rows]
+        out = []
+        for row in rows:
+            values = list(row)
+            for index, _, convert in converters:
+                values[index] = convert(values[index])
+            out.append(dict(zip(columns, values)))
+        return out
+
+    def convert(self, posts: List[Dict]) -> List[Dict]:
+        """Convert dicts built from raw rows in place (for callers that needed the raw values first)."""
+        for post in posts:
+            for _, name, convert in self.converters:
+                if name in post:
+                    post[name] = convert(post[name])
+        return posts
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return _to_number(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode()
+    return str(value)
+
+
+if orjson is not None:
+    # Datetimes go through _default so they keep the str() format of the stdlib path
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(data) -> bytes:
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+else:
+    def dumps(data) -> bytes:
+        return json.dumps(data, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with dumps(); return it directly to bypass jsonable_encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,110 @@
+"""
+Batch refresher for the per-site stats cache.
+
+Refreshes run as asyncio tasks with a bounded number of sites in flight at
+once, a refresh already running for a site is shared by every caller that asks
+for it (a forced refresh only joins another forced one, and otherwise runs
+right after the refresh in flight), and a site that exceeds its timeout gets an error entry in the cache
+instead of holding up the rest of the batch.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+import time
+
+
+class StatsRefresher:
+    def __init__(self, manager, concurrency: int = 10, timeout: float = 15):
+        self.manager = manager
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # site_id -> (refresh task, whether it was forced)
+        self._inflight: Dict[str, Tuple[asyncio.Task, bool]] = {}
+        self.stats = {"scheduled": 0, "coalesced": 0, "chained": 0, "timeouts": 0}
+
+    def schedule(self, site_id: str, force_refresh: bool = False) -> asyncio.Task:
+        """
+        Start a refresh for the site, or return the one already in flight.
+        A forced refresh never returns a non-forced one's (possibly cached)
+        result: it is chained to run once the refresh in flight finishes.
+        Must be called from the event loop; the task is not awaited here.
+        """
+        previous = None
+        inflight = self._inflight.get(site_id)
+        if inflight is not None and not inflight[0].done():
+            task, forced = inflight
+            if forced or not force_refresh:
+                self.stats["coalesced"] += 1
+                return task
+            previous = task
+            self.stats["chained"] += 1
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        task = asyncio.create_task(self._run(site_id, force_refresh, previous))
+        self._inflight[site_id] = (task, force_refresh)
+        task.add_done_callback(lambda t: self._forget(site_id, t))
+        self.stats["scheduled"] += 1
+        return task
+
+    def schedule_many(self, site_ids: Iterable[str], force_refresh: bool = False) -> List[asyncio.Task]:
+        return [self.schedule(site_id, force_refresh) for site_id in site_ids]
+
+    async def refresh(self, site_id: str, force_refresh: bool = False) -> Optional[Dict]:
+        return await self.schedule(site_id, force_refresh)
+
+    async def refresh_many(self, site_ids: Iterable[str], force_refresh: bool = False) -> List[Optional[Dict]]:
+        """Refresh several sites in parallel; the batch takes about as long as its slowest site."""
+        return await asyncio.gather(*self.schedule_many(site_ids, force_refresh))
+
+    def is_refreshing(self, site_id: str) -> bool:
+        inflight = self._inflight.get(site_id)
+        return inflight is not None and not inflight[0].done()
+
+    def _forget(self, site_id: str, task: asyncio.Task):
+        inflight = self._inflight.get(site_id)
+        if inflight is not None and inflight[0] is task:
+            del self._inflight[site_id]
+
+    async def _run(self, site_id: str, force_refresh: bool, after: Optional[asyncio.Task] = None) -> Optional[Dict]:
+        if after is not None:
+            # Never two refreshes of one site at once; its outcome is its own callers'
+            await asyncio.wait([after])
+        async with self._semaphore:
+            try:
+                return await asyncio.wait_for(
+                    self.manager.refresh_site_stats(site_id, force_refresh=force_refresh),
+                    timeout=self.timeout,
+                )
+            except asyncio.TimeoutError as e:
+                self.stats["timeouts"] += 1
+                return await self._record_timeout(site_id, e)
+
+    async def _record_timeout(self, site_id: str, exc: Exception) -> Optional[Dict]:
+        config = self.manager.connections.get(site_id)
+        if config is None:
+            return None
+
+        print(f"Stats refresh for {site_id} timed out after {self.timeout}s")
+        self.manager.report_failure(site_id, exc)
+        previous = self.manager.get_cached_stats(site_id) or {}
+        stats = {
+            "id": site_id,
+            "name": config.name,
+            "table": previous.get("table") or self.manager.normalize_table_name(config.target_table_name),
+            "total_posts": previous.get("total_posts", 0),
+            "status": "error",
+            "error": f"Stats refresh timed out after {self.timeout}s",
+            "last_updated": time.time(),
+            "breaker": self.manager.get_breaker_state(site_id),
+        }
+        await self.manager.save_site_stats(site_id, stats)
+        return stats
+
+    def snapshot(self) -> Dict:
+        return {
+            "concurrency": self.concurrency,
+            "timeout": self.timeout,
+            "in_flight": sorted(site_id for site_id in self._inflight if self.is_refreshing(site_id)),
+            **self.stats,
+        }
@@ -3,6 +3,7 @@ XAI Grok Engine - Drop-in replacement for content generation.
 Uses grok-4-fast-reasoning as primary with automatic fallback to grok-4-fast-non-reasoning.
 """
 
+import asyncio
 import os
 import re
 import json
@@ -61,6 +62,8 @@ class XAIContentGenerator:
         Make a call to XAI API with automatic failover.
         Primary: grok-4-fast-reasoning
         Fallback: grok-4-fast-non-reasoning
+        Blocking; the async methods run it in a worker thread so concurrent
+        site pipelines don't stall the event loop.
 
         Args:
             prompt: The prompt to send to the API
@@ -306,7 +309,7 @@ class XAIContentGenerator:
             REMINDER: The body_html content MUST respect the word limit specified above.
             """
             
-            response_text = self._call_xai(prompt, json_mode=True, max_tokens=max_tokens)
+            response_text = await asyncio.to_thread(self._call_xai, prompt, json_mode=True, max_tokens=max_tokens)
 
             # FIX: Add better error handling for JSON validation
             try:
@@ -340,167 +343,6 @@ class XAIContentGenerator:
         # Should not reach here, but return last result as fallback
         return result
 
-    async def generate_schema_aware_content(self, req: ContentGenerationRequest, target_schema_text: str, post_status: str = "publish") -> Dict[str, Any]:
-        """
-        Generates content that strictly adheres to the provided database schema description.
-        Returns a raw dictionary that maps 1:1 to the target table columns.
-        Validates word count and retries if content doesn't meet requirements.
-        """
-        if self.model_name == "mock-xai":
-            return {"mock_col_1": "Content", "mock_col_2": "Meta"}
-
-        min_words = req.structure.target_word_count[0]
-        max_words = req.structure.target_word_count[1]
-        max_tokens = self._calculate_max_tokens(max_words)
-        max_retries = 2
-        last_word_count = 0
-        result = None
-        
-        print(f"[Token Allocation] Target: {min_words}-{max_words} words -> Allocating {max_tokens} tokens")
-        
-        # Common content field names to check for word count
-        content_field_names = ["content", "body", "body_html", "post_content", "article_body", "html_content", "text", "description"]
-        
-        for attempt in range(max_retries + 1):
-            retry_instruction = ""
-            if attempt > 0:
-                retry_instruction = f"""
-                
-                ⚠️ CRITICAL RETRY NOTICE (Attempt {attempt + 1}/{max_retries + 1}) ⚠️
-                Previous generation had only {last_word_count} words in the content field.
-                YOU MUST generate content with AT LEAST {min_words} words!
-                This is NON-NEGOTIABLE. Expand every section with more details, examples, and explanations.
-                """
-            
-            prompt = f"""
-            You are a Database Content Adapter.
-            
-            CORE STRATEGY:
-            - Campaign Name: {req.core_identity.campaign_name}
-            - Persona: {req.personalization.act_as} {f"({req.personalization.custom_persona})" if req.personalization.act_as == PersonaType.CUSTOM else ""}
-            - Topic: {req.core_identity.primary_keyword}
-            - Target Audience: {req.core_identity.target_audience}
-            - Search Intent: {req.core_identity.intent}
-            - Content Type: {req.core_identity.content_type}
-            
-            SEO PARAMETERS:
-            - Secondary Keywords: {", ".join(req.seo_technical.secondary_keywords)}
-            - Meta Description Goal: {req.seo_technical.meta_description_goal or "Auto-generate"}
-            - Internal Links to Include: {", ".join(req.seo_technical.internal_links)}
-            - Use External Authority Links: {"Yes" if req.seo_technical.external_authority_links else "No"}
-            - Featured Image URLs: {', '.join(req.seo_technical.featured_image_urls) if req.seo_technical.featured_image_urls else "None provided"}
-            
-            IMAGE MAPPING INSTRUCTION:
-            If Featured Image URLs are provided above, you MUST:
-            - Use the FIRST URL as the primary value for columns named:
-              "image", "featured_image", "hero_image", "thumbnail", "cover_image", "main_image", "post_image" or similar.
-            - If the database has a column for multiple images (like "images", "gallery", "featured_images"), store ALL URLs as a JSON array.
-            - Use the EXACT URLs provided, do not generate placeholder text.
-            
-            TONE, STYLE & PERSONALITY:
-            - Tone of Voice: {req.personalization.tone}
-            - Writing Style: {req.personalization.style}
-            - Point of View: {req.personalization.pov}
-            - Emoji Usage: {req.personalization.emoji_usage}
-            - Humanization Level (0-100): {req.personalization.humanization_level}
-            - Negative Constraints: {req.personalization.negative_constraints or "None"}
-            
-            STRUCTURE & FORMATTING:
-            - Header Structure: {", ".join(req.structure.header_structure)}
-            - Final CTA: {req.structure.cta}
-            
-            {self._build_word_limit_instructions(req)}
-            {retry_instruction}
-            
-            TASK:
-            Generate a blog post/article according to these parameters and format it strictly as a JSON object.
-            The JSON object keys MUST exactly match the column names defined in the schema below.
-            
-            {target_schema_text}
-            
-            CRITICAL - DO NOT INCLUDE THESE COLUMNS IN YOUR OUTPUT:
-            - Do NOT include PRIMARY KEY columns (marked as PRIMARY KEY in the schema) - the database auto-generates these
-            - Do NOT include columns named "id", "post_id", "article_id", or any auto-increment ID column
-            - The database will automatically assign the ID when inserting
-            
-            Constraint: Do not include fields that are not in the schema.
-            Ensure content types (VARCHAR, TEXT, INT) are respected.
-            
-            CRITICAL INSTRUCTION - CONTENT FORMATTING:
-            For columns named "content", "body", "body_html", "post_content", "article_body", "html_content" or similar TEXT/VARCHAR columns meant for the main article body:
-            - Generate PLAIN TEXT content with proper formatting using line breaks (\\n\\n for paragraphs)
-            - Use clear section headings followed by double line breaks
-            - Structure the content with proper hierarchy (Main sections, then subsections)
-            - Separate paragraphs with double line breaks (\\n\\n)
-            - Use bullet points with "• " or numbered lists with "1. ", "2. ", etc. for lists
-            - Use UPPERCASE or **text** for emphasis on important terms (but avoid actual markdown/HTML)
-            - Keep it clean, readable plain text that will display properly without HTML rendering
-            - Example format: "Introduction\\n\\nYour text here with proper sentences.\\n\\nSection Title\\n\\nMore content with clear paragraphs."
-            
-            CRITICAL INSTRUCTION - STATUS MAPPING:
-            The user has requested the post status be: "{post_status}".
-            Look for a column named "status", "post_status", "state", "published", "is_published", "visibility" or similar.
-            
-            IMPORTANT: If the schema shows "ALLOWED VALUES:" for this column, you MUST use one of those EXACT values (case-sensitive).
-            - For Draft/Save requests: Use the lowercase value like 'draft', 'pending', 'unpublished', or false/0
-            - For Publish requests: Use the lowercase value like 'published', 'live', 'active', or true/1
-            
-            Examples:
-            - If schema says "ALLOWED VALUES: ['draft', 'published']" and user wants Draft → use 'draft' (lowercase, exact match)
-            - If schema says "ALLOWED VALUES: ['DRAFT', 'PUBLISHED']" and user wants Draft → use 'DRAFT' (uppercase, exact match)
-            - If the column is boolean: Draft → false, Publish → true
-            
-            NEVER use a value that is not in the ALLOWED VALUES list. Match case exactly.
-            
-            Return ONLY a valid JSON object with the column names as keys.
-            """
-
-            response_text = self._call_xai(prompt, json_mode=True, max_tokens=max_tokens)
-
-            # FIX: Add better error handling for JSON parsing
-            try:
-                result = json.loads(response_text)
-            except json.JSONDecodeError as parse_error:
-                print(f"[ERROR] JSON Parse failed. Raw response (first 500 chars): {response_text[:500]}")
-                raise RuntimeError(f"AI response parsing failed: {parse_error}. Raw response preview: {response_text[:200]}...")
-            
-            # Find the content field and validate word count
-            content_text = ""
-            content_field_found = None
-            for field_name in content_field_names:
-                if field_name in result and result[field_name]:
-                    content_text = str(result[field_name])
-                    content_field_found = field_name
-                    break
-            
-            if content_text:
-                is_valid, word_count, message = self._validate_word_count(
-                    content_text, min_words, max_words
-                )
-                last_word_count = word_count
-                
-                print(f"[Word Count Check] Attempt {attempt + 1} (field: {content_field_found}): {message}")
-                
-                if is_valid:
-                    print(f"[Word Count] ✓ Content meets requirements: {word_count} words")
-                    return result
-                
-                # If below minimum and we have retries left, try again
-                if word_count < min_words and attempt < max_retries:
-                    print(f"[Word Count] ✗ Content too short ({word_count}/{min_words}), retrying...")
-                    continue
-                
-                # If above maximum or exhausted retries, return what we have
-                print(f"[Word Count] Returning content with {word_count} words (target: {min_words}-{max_words})")
-                return result
-            else:
-                # No content field found, return the result as-is
-                print(f"[Word Count] No content field found in response, skipping validation")
-                return result
-        
-        # Fallback
-        return result
-
     async def validate_content_against_schema(self, req: ContentGenerationRequest, target_schema_text: str) -> Dict[str, Any]:
         """
         Analyzes the target schema and the content request to identify any mandatory fields
@@ -533,9 +375,48 @@ class XAIContentGenerator:
         If nothing is missing, return {{"missing_fields": []}}.
         """
 
-        response_text = self._call_xai(prompt, json_mode=True)
+        response_text = await asyncio.to_thread(self._call_xai, prompt, json_mode=True)
         return json.loads(response_text)
 
+    async def fill_schema_columns(self, req: ContentGenerationRequest, article: BlogContent, columns: list[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Fill the few columns of a site's table that the canonical article could not
+        be mapped onto. Much cheaper than a full generation: the article itself is
+        only summarized in the prompt and the answer is limited to these columns.
+        """
+        if self.model_name == "mock-xai":
+            return {}
+
+        column_lines = "\n".join(
+            f"- {col['name']} ({col['type']})" + (f" ALLOWED VALUES: {col['allowed']}" if col.get('allowed') else "")
+            for col in columns
+        )
+        prompt = f"""
+        You are a Database Content Adapter.
+
+        An article has already been written:
+        - Topic: {req.core_identity.primary_keyword}
+        - Title: {article.h1}
+        - Summary: {article.meta_description}
+        - Keywords: {", ".join(article.lsi_used)}
+
+        The target table also requires these columns, which have no value yet:
+        {column_lines}
+
+        TASK:
+        Return a JSON object with exactly these column names as keys and values that fit
+        the article and the column types. For JSON columns use valid JSON; if the schema
+        shows ALLOWED VALUES, use one of them exactly (case-sensitive).
+        """
+
+        response_text = await asyncio.to_thread(self._call_xai, prompt, json_mode=True, max_tokens=1500)
+        try:
+            result = json.loads(response_text)
+        except json.JSONDecodeError as parse_error:
+            raise RuntimeError(f"AI response parsing failed: {parse_error}. Raw response preview: {response_text[:200]}...")
+        names = {col['name'] for col in columns}
+        return {key: value for key, value in result.items() if key in names}
+
     async def identify_best_content_table(self, table_names: list[str]) -> str:
         """
         Analyzes a list of table names and identifies the most likely table for storing blog posts/content.
@@ -564,7 +445,7 @@ class XAIContentGenerator:
         If no suitable table is found, return {{"table_name": null}}.
         """
 
-        response_text = self._call_xai(prompt, json_mode=True)
+        response_text = await asyncio.to_thread(self._call_xai, prompt, json_mode=True)
         result = json.loads(response_text)
         return result.get("table_name")
 
@@ -601,7 +482,7 @@ class XAIContentGenerator:
         - "best_match": The single best table name string (MUST match original case, or null if none found).
         """
 
-        response_text = self._call_xai(prompt, json_mode=True)
+        response_text = await asyncio.to_thread(self._call_xai, prompt, json_mode=True)
         return json.loads(response_text)
 
     def _build_base_prompt(self, req: ContentGenerationRequest) -> str:
@@ -0,0 +1,102 @@
+import datetime
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+
+import pytest
+
+# Tests import the server modules the way main.py does (services.*, schemas)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# database.py reads DATABASE_URL at import time; never let tests touch a real admin database
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="super-ea-tests-"), "admin.db")
+
+TENANT_SCHEMA = """
+CREATE TABLE blogs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, h1 TEXT, "seoSlug" TEXT UNIQUE NOT NULL,
+    status TEXT NOT NULL DEFAULT 'draft', content TEXT NOT NULL, excerpt TEXT, author TEXT NOT NULL,
+    "featuredImages" TEXT, "downloadLink" TEXT, scheduled_at TIMESTAMP,
+    "createdAt" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP, "updatedAt" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE "Category" (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, "categoryId" INTEGER UNIQUE NOT NULL, name TEXT UNIQUE NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active', "createdAt" TIMESTAMP, "updatedAt" TIMESTAMP
+);
+CREATE TABLE "BlogCategory" (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, "blogId" INTEGER NOT NULL REFERENCES blogs(id),
+    "categoryId" INTEGER NOT NULL REFERENCES "Category"("categoryId"), "createdAt" TIMESTAMP
+);
+INSERT INTO "Category"("categoryId", name) VALUES (1, 'pre-built bots'), (2, 'indicators');
+"""
+
+STATUSES = ("scheduled", "published", "draft")
+
+
+def make_tenant(path, posts=30):
+    """
+    Create a tenant SQLite database shaped like a production blog site.
+    Post i is 'post-i', status STATUSES[i % 3], created on 2026-01-01 + i days,
+    in category 'indicators' when i is odd and 'pre-built bots' otherwise.
+    """
+    base = datetime.datetime(2026, 1, 1)
+    conn = sqlite3.connect(path)
+    conn.executescript(TENANT_SCHEMA)
+    for i in range(1, posts + 1):
+        created = (base + datetime.timedelta(days=i)).isoformat(sep=" ")
+        conn.execute(
+            'INSERT INTO blogs (title, h1, "seoSlug", status, content, excerpt, author, "featuredImages", "createdAt", "updatedAt") '
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (f"Post {i} about forex bot", f"H1 {i}", f"post-{i}", STATUSES[i % 3], ("word " * (200 + i)).strip(),
+             f"excerpt {i}", "Alice", json.dumps([f"https://img/{i}.webp"]), created, created),
+        )
+        conn.execute('INSERT INTO "BlogCategory" ("blogId", "categoryId") VALUES (?, ?)', (i, 1 + i % 2))
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def tenant_db(tmp_path):
+    return make_tenant(str(tmp_path / "tenant.db"))
+
+
+@pytest.fixture
+def manager():
+    """A fresh ConnectionManager singleton over an empty admin database."""
+    from database import Base, admin_engine, init_db
+    from services.connection_manager import ConnectionManager
+
+    init_db()
+    with admin_engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+    ConnectionManager._instance = ConnectionManager()
+    yield ConnectionManager._instance
+    ConnectionManager._instance = None
+
+
+@pytest.fixture
+def client(manager):
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+        # Disposes the sites' async engines on the loop that opened them
+        for site_id in list(manager.connections):
+            test_client.delete(f"/sites/{site_id}")
+
+
+def add_site(client, site_id, path, table="blogs"):
+    response = client.post("/sites", json={
+        "id": site_id,
+        "name": site_id,
+        "db_type": "sqlite",
+        "connection_string": f"sqlite:///{path}",
+        "target_table_name": table,
+    })
+    assert response.status_code == 200, response.text
+    return response
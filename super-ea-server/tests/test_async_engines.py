@@ -0,0 +1,62 @@
+import pytest
+
+from services.connection_manager import DatabaseConfig
+from conftest import add_site
+
+
+def config(url):
+    return DatabaseConfig(id="s1", name="Site", connection_string=url)
+
+
+def test_async_url_uses_the_async_driver(manager):
+    url = manager._build_async_url(config("postgresql://app:pw@db.example.com/site?sslmode=require&channel_binding=require"))
+    assert url.drivername == "postgresql+asyncpg"
+    assert dict(url.query) == {"ssl": "require"}
+    assert manager._build_async_url(config("sqlite:////tmp/site.db")).drivername == "sqlite+aiosqlite"
+    with pytest.raises(ValueError, match="No async driver available for 'mssql'"):
+        manager._build_async_url(config("mssql://app:pw@db/site"))
+
+
+def test_post_listing_reads_through_the_async_engine(client, manager, tenant_db, monkeypatch):
+    add_site(client, "s1", tenant_db)
+
+    def blocking_engine(site_id):
+        raise AssertionError("listing used the blocking engine")
+    monkeypatch.setattr(manager, "get_engine", blocking_engine)
+    response = client.get("/sites/s1/posts", params={"limit": 3})
+
+    assert response.status_code == 200
+    assert [post["id"] for post in response.json()["posts"]] == [30, 29, 28]
+    assert "s1" in manager.async_engines
+
+
+def test_schedule_and_list_scheduled_posts(client, tenant_db):
+    add_site(client, "s1", tenant_db)
+
+    response = client.post("/sites/s1/posts/2/schedule", json={
+        "blog_id": 2, "site_id": "s1", "scheduled_at": "2030-01-01T09:00:00",
+    })
+    assert response.json()["success"] is True, response.text
+
+    scheduled = client.get("/sites/s1/scheduled-posts").json()["scheduled_posts"]
+    assert 2 in [post["id"] for post in scheduled]
+
+
+def test_post_writes_go_through_the_async_engine(client, manager, tenant_db, monkeypatch):
+    add_site(client, "s1", tenant_db)
+
+    def blocking_engine(site_id):
+        raise AssertionError("write used the blocking engine")
+    monkeypatch.setattr(manager, "get_engine", blocking_engine)
+
+    assert client.put("/sites/s1/posts/3", json={"title": "Renamed", "category": "indicators"}).status_code == 200
+    assert client.patch("/sites/s1/posts/3/status", json={"status": "published"}).status_code == 200
+    injected = client.post("/inject-content", json={"injections": [{
+        "site_id": "s1", "target_table": "blogs",
+        "content": {"title": "Fresh", "slug": "fresh", "content": "body", "status": "draft"},
+    }]})
+    assert injected.status_code == 200, injected.text
+
+    post = client.get("/sites/s1/posts/3").json()
+    assert (post["title"], post["status"]) == ("Renamed", "published")
+    assert injected.json()[0]["blog_id"] == 31
@@ -0,0 +1,82 @@
+import datetime
+import json
+import sqlite3
+
+import pytest
+
+from services.bulk_actions import parse_post_ids, parse_scheduled_at
+from conftest import add_site
+
+
+def statuses(path):
+    conn = sqlite3.connect(path)
+    rows = dict(conn.execute("SELECT status, COUNT(*) FROM blogs GROUP BY status").fetchall())
+    conn.close()
+    return rows
+
+
+def prime_counter(manager, path):
+    by_status = statuses(path)
+    manager.post_counter._store("s1", "blogs", sum(by_status.values()), by_status, exact=True)
+
+
+def test_parse_post_ids_dedupes_in_request_order():
+    assert parse_post_ids(["3", 1, 3, 2, 1]) == [3, 1, 2]
+    with pytest.raises(ValueError, match="integer ids"):
+        parse_post_ids([1, "x"])
+
+
+def test_parse_scheduled_at_accepts_utc_suffix():
+    assert parse_scheduled_at("2026-05-01T10:00:00Z") == datetime.datetime(2026, 5, 1, 10, tzinfo=datetime.timezone.utc)
+    with pytest.raises(ValueError, match="ISO 8601"):
+        parse_scheduled_at("tomorrow")
+
+
+def test_stream_reports_each_chunk_and_keeps_counts_exact(client, manager, tenant_db):
+    add_site(client, "s1", tenant_db)
+    prime_counter(manager, tenant_db)
+
+    response = client.post("/sites/s1/posts/bulk-action/stream", json={
+        "action": "publish", "post_ids": [1, 2, 3, 4, 5, 6, 7, 999], "chunk_size": 3,
+    })
+    events = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [(e["status"], e.get("chunk"), e.get("processed")) for e in events] == [
+        ("progress", 1, 3), ("progress", 2, 6), ("progress", 3, 8), ("complete", None, None),
+    ]
+    assert events[-1]["affected_count"] == 7
+    counts = manager.post_counter._view(manager.post_counter.counts["s1"])
+    assert counts == {"total": 30, "by_status": statuses(tenant_db), "exact": True}
+    assert counts["by_status"]["published"] == 14
+
+
+def test_delete_updates_counts_for_rows_that_existed(client, manager, tenant_db):
+    add_site(client, "s1", tenant_db)
+    prime_counter(manager, tenant_db)
+
+    response = client.post("/sites/s1/posts/bulk-action", json={"action": "delete", "post_ids": [1, 2, 3, 1000]})
+
+    assert response.json() == {"status": "success", "action": "delete", "affected_count": 3}
+    counts = manager.post_counter._view(manager.post_counter.counts["s1"])
+    assert counts == {"total": 27, "by_status": statuses(tenant_db), "exact": True}
+
+
+def test_schedule_sets_the_publish_time(client, tenant_db):
+    add_site(client, "s1", tenant_db)
+
+    response = client.post("/sites/s1/posts/bulk-action", json={
+        "action": "schedule", "post_ids": [2, 4], "scheduled_at": "2026-05-01T10:00:00Z",
+    })
+
+    assert response.json()["affected_count"] == 2
+    conn = sqlite3.connect(tenant_db)
+    rows = conn.execute("SELECT status, scheduled_at FROM blogs WHERE id IN (2, 4)").fetchall()
+    conn.close()
+    assert rows == [("scheduled", "2026-05-01 10:00:00+00:00")] * 2
+
+
+def test_bad_requests_fail_before_the_stream_starts(client, tenant_db):
+    add_site(client, "s1", tenant_db)
+    response = client.post("/sites/s1/posts/bulk-action/stream", json={"action": "archive", "post_ids": [1]})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown action: archive"
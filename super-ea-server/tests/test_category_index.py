@@ -0,0 +1,72 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from services import category_index
+from services.category_index import CategoryIndex
+
+SCHEMA = [
+    'CREATE TABLE "Category" ("categoryId" INTEGER PRIMARY KEY, name TEXT, status TEXT, "createdAt" TIMESTAMP, "updatedAt" TIMESTAMP)',
+    'CREATE TABLE "BlogCategory" (id INTEGER PRIMARY KEY, "blogId" INTEGER, "categoryId" INTEGER)',
+    """INSERT INTO "Category" ("categoryId", name) VALUES (1, 'forex'), (2, 'bots')""",
+    'INSERT INTO "BlogCategory" ("blogId", "categoryId") VALUES (10, 1), (10, 2), (11, 2)',
+]
+
+
+def test_primary_is_the_first_linked_category():
+    assert category_index.primary(["forex", "bots"]) == "forex"
+    assert category_index.primary([]) is None
+
+
+def test_categories_are_cached_per_post(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'site.db'}")
+        async with engine.begin() as conn:
+            for statement in SCHEMA:
+                await conn.execute(text(statement))
+        index = CategoryIndex(ttl=600, max_posts=10)
+        async with engine.connect() as conn:
+            first = await index.categories("site", conn, [10, 11, 12])
+            # A category created elsewhere forces a reload of the names
+            await conn.execute(text("""INSERT INTO "Category" ("categoryId", name) VALUES (3, 'news')"""))
+            await conn.execute(text('INSERT INTO "BlogCategory" ("blogId", "categoryId") VALUES (13, 3)'))
+            second = await index.categories("site", conn, [10, 13])
+        await engine.dispose()
+        return index, first, second
+
+    index, first, second = asyncio.run(run())
+    assert first[10] == ["forex", "bots"]
+    assert first[11] == ["bots"] and first[12] == []
+    assert second[13] == ["news"]
+    assert index.stats["post_hits"] == 1
+    assert index.stats["loads"] == 2
+
+
+def test_post_lru_is_bounded():
+    index = CategoryIndex(max_posts=2)
+    index.sites["site"] = category_index.SiteCategories({1: "forex"})
+    for blog_id in (1, 2, 3):
+        index.set_post("site", blog_id, ["forex"])
+    assert list(index.sites["site"].posts) == [2, 3]
+    index.forget_posts("site", [3])
+    assert list(index.sites["site"].posts) == [2]
+
+
+def test_ensure_category_creates_missing_names(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'site.db'}")
+        async with engine.begin() as conn:
+            for statement in SCHEMA:
+                await conn.execute(text(statement))
+        index = CategoryIndex()
+        async with engine.begin() as conn:
+            assert await index.ensure_category("site", conn, "bots") == 2
+            assert await index.ensure_category("site", conn, "news") == 3
+            created = (await conn.execute(text("""SELECT "categoryId" FROM "Category" WHERE name = 'news'"""))).scalar()
+        await engine.dispose()
+        return index, created
+
+    index, created = asyncio.run(run())
+    assert created == 3
+    assert index.sites["site"].ids["news"] == 3
@@ -0,0 +1,77 @@
+import pytest
+
+from services import circuit_breaker
+from services.circuit_breaker import CircuitBreaker, SiteUnavailableError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "time", lambda: now[0])
+    return now
+
+
+def test_opens_after_threshold_and_fails_fast(clock):
+    breaker = CircuitBreaker("s1", failure_threshold=2, base_backoff=5)
+    breaker.before_attempt()
+    assert breaker.record_failure(RuntimeError("refused")) is False
+    assert breaker.record_failure(RuntimeError("refused")) is True
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(SiteUnavailableError, match="refused"):
+        breaker.before_attempt()
+
+
+def test_lets_exactly_one_probe_through_after_backoff(clock):
+    breaker = CircuitBreaker("s1", failure_threshold=1, base_backoff=5)
+    breaker.record_failure(RuntimeError("down"))
+
+    clock[0] += 5
+    breaker.before_attempt()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(SiteUnavailableError):
+        breaker.before_attempt()
+
+    breaker.record_success()
+    assert breaker.snapshot()["state"] == CircuitBreaker.CLOSED
+    breaker.before_attempt()
+
+
+def test_failed_probe_doubles_backoff_up_to_max(clock):
+    breaker = CircuitBreaker("s1", failure_threshold=1, base_backoff=5, max_backoff=12)
+    breaker.record_failure(RuntimeError("down"))
+    assert breaker.next_probe_at - clock[0] == 5
+
+    for expected in (10, 12):
+        clock[0] = breaker.next_probe_at
+        breaker.before_attempt()
+        assert breaker.record_failure(RuntimeError("still down")) is True
+        assert breaker.next_probe_at - clock[0] == expected
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker("s1", failure_threshold=2)
+    breaker.record_failure(RuntimeError("blip"))
+    breaker.record_success()
+    assert breaker.record_failure(RuntimeError("blip")) is False
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_manager_stops_connecting_to_an_unreachable_site(manager, monkeypatch):
+    from services.connection_manager import DatabaseConfig
+
+    config = DatabaseConfig(id="down", name="down", db_type="sqlite", connection_string="sqlite:////nonexistent-dir/site.db")
+    manager.connections[config.id] = config
+    attempts = []
+    create = manager._create_engine_and_test
+    monkeypatch.setattr(manager, "_create_engine_and_test", lambda *a: attempts.append(1) or create(*a))
+
+    for _ in range(manager.breaker_failure_threshold):
+        with pytest.raises(ValueError, match="Connection failed"):
+            manager.get_engine("down")
+    with pytest.raises(SiteUnavailableError):
+        manager.get_engine("down")
+
+    assert len(attempts) == manager.breaker_failure_threshold
+    assert not manager.is_site_available("down")
+    assert manager.get_pool_usage()["allocated"] == 0
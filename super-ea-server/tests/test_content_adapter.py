@@ -0,0 +1,122 @@
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from schemas import BlogContent, FAQItem
+from services import content_adapter
+from services.content_adapter import adapt, html_to_text, status_value
+
+
+class FakeSchema:
+    """The parts of a SchemaSnapshot adapt() reads."""
+
+    def __init__(self, columns, enums=None, foreign_keys=None):
+        self._columns = columns
+        self.enums = enums or {}
+        self._foreign_keys = foreign_keys or []
+
+    def columns(self, table_name):
+        return self._columns
+
+    def foreign_keys(self, table_name):
+        return self._foreign_keys
+
+
+def column(name, type_="TEXT", nullable=False, default=None):
+    return {"name": name, "type": type_, "nullable": nullable, "default": default}
+
+
+ARTICLE = BlogContent(
+    h1="Best Forex Bots 2026",
+    meta_title="Best Forex Bots",
+    meta_description="A short summary",
+    body_html="<h2>Intro</h2><p>Hello <strong>traders</strong></p><ul><li>One</li><li>Two</li></ul>",
+    faq_schema_json=[FAQItem(question="Q?", answer="A.")],
+    lsi_used=["ea", "mt5"],
+)
+REQUEST = SimpleNamespace(
+    distribution=SimpleNamespace(category="indicators"),
+    seo_technical=SimpleNamespace(featured_image_urls=["https://img/1.webp", "https://img/2.webp"]),
+)
+
+
+def test_html_to_text_keeps_block_layout():
+    assert html_to_text(ARTICLE.body_html) == "Intro\n\nHello **traders**\n\n• One\n• Two"
+    assert html_to_text("<ol><li>a</li><li>b</li></ol>") == "1. a\n2. b"
+    assert html_to_text(None) == ""
+
+
+def test_status_value_matches_enum_labels_case_insensitively():
+    col = column("status", "post_status")
+    assert status_value(col, ["DRAFT", "LIVE"], "Publish") == "LIVE"
+    assert status_value(col, ["DRAFT", "LIVE"], "Schedule") == "DRAFT"
+    assert status_value(column("is_published", "BOOLEAN"), None, "publish") is True
+    assert status_value(col, None, "Schedule") == "scheduled"
+
+
+def test_adapt_maps_article_onto_site_columns():
+    schema = FakeSchema(
+        [
+            column("id", "INTEGER"),
+            column("title"),
+            column("seoSlug", "VARCHAR(255)"),
+            column("content"),
+            column("status", "post_status"),
+            column("featuredImages", "JSON", nullable=True),
+            column("excerpt", nullable=True),
+        ],
+        enums={"post_status": ["DRAFT", "PUBLISHED"]},
+    )
+    adapted, missing = adapt(ARTICLE, REQUEST, "Publish", schema, "blogs")
+
+    assert adapted == {
+        "title": "Best Forex Bots 2026",
+        "seoSlug": "best-forex-bots-2026",
+        "content": html_to_text(ARTICLE.body_html),
+        "status": "PUBLISHED",
+        "featuredImages": ["https://img/1.webp", "https://img/2.webp"],
+        "excerpt": "A short summary",
+    }
+    assert missing == []
+
+
+def test_adapt_reports_only_required_columns_nothing_fills():
+    schema = FakeSchema(
+        [
+            column("title"),
+            column("tagline", "VARCHAR(120)"),  # required text: LLM fills it
+            column("reading_level", postgresql.ENUM("easy", "hard", name="difficulty")),  # required enum
+            column("notes", nullable=True),  # optional
+            column("views", "INTEGER"),  # not text
+            column("author_name"),  # the insert picks an author
+            column("site_id", "VARCHAR(36)"),  # foreign key
+            column("lang", default="'en'"),  # has a default
+        ],
+        foreign_keys=[{"constrained_columns": ["site_id"]}],
+    )
+    adapted, missing = adapt(ARTICLE, REQUEST, "draft", schema, "posts", extra_fields=["metatitle", "nope"])
+
+    assert missing == [
+        {"name": "tagline", "type": "VARCHAR(120)", "allowed": None},
+        {"name": "reading_level", "type": "VARCHAR(4)", "allowed": ["easy", "hard"]},
+    ]
+    assert adapted == {"title": "Best Forex Bots 2026", "metatitle": "Best Forex Bots"}
+
+
+def test_canonical_payload_carries_category_and_first_image():
+    payload = content_adapter.canonical_payload(ARTICLE, REQUEST)
+    assert payload["category"] == "indicators"
+    assert payload["image"] == "https://img/1.webp"
+    assert payload["faq"] == [{"question": "Q?", "answer": "A."}]
+    assert payload["keywords"] == "ea, mt5"
+
+
+def test_only_status_columns_take_the_post_status():
+    schema = FakeSchema([
+        column("post_status"),
+        column("statusUpdatedAt", "TIMESTAMP", nullable=True),
+        column("paymentStatus", nullable=True),
+    ])
+    payload, missing = adapt(ARTICLE, REQUEST, "Publish", schema, "blogs")
+    assert payload == {"post_status": "published"}
+    assert missing == []
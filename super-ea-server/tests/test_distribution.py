@@ -0,0 +1,103 @@
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from schemas import BlogContent
+from services.content_orchestrator import ContentOrchestrator
+from conftest import add_site, make_tenant
+
+ARTICLE = BlogContent(
+    h1="Grid Bots Explained", meta_title="Grid Bots", meta_description="What grid bots do",
+    body_html="<p>Grid bots place orders at fixed intervals.</p>", faq_schema_json=[], lsi_used=["grid"],
+)
+
+
+def request(status="Publish", category="indicators"):
+    return SimpleNamespace(
+        core_identity=SimpleNamespace(primary_keyword="grid bots"),
+        distribution=SimpleNamespace(post_status=status, scheduled_at=None, category=category),
+        seo_technical=SimpleNamespace(featured_image_urls=["https://img/grid.webp"]),
+    )
+
+
+def test_sites_run_concurrently_up_to_the_limit_in_site_order(manager):
+    manager.distribution_concurrency = 2
+    orchestrator = ContentOrchestrator()
+    running, peak = [0], [0]
+
+    async def pipeline(site_id):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.01 * (5 - int(site_id)))
+        running[0] -= 1
+        return site_id
+
+    assert asyncio.run(orchestrator._for_each_site(["1", "2", "3", "4"], pipeline)) == ["1", "2", "3", "4"]
+    assert peak[0] == 2
+
+
+def test_site_timeout_names_the_site(manager):
+    manager.distribution_timeout = 0.05
+    orchestrator = ContentOrchestrator()
+    with pytest.raises(TimeoutError, match="Site s1 did not finish within 0.05s"):
+        asyncio.run(orchestrator._with_site_timeout("Site s1", asyncio.sleep(1)))
+
+
+def test_one_article_is_written_to_every_site(client, manager, tenant_db, tmp_path, monkeypatch):
+    second_db = make_tenant(str(tmp_path / "second.db"), posts=3)
+    add_site(client, "s1", tenant_db)
+    add_site(client, "s2", second_db)
+    orchestrator = ContentOrchestrator()
+    generated = []
+
+    async def generate_blog_post(req):
+        generated.append(req)
+        return ARTICLE
+    monkeypatch.setattr(orchestrator.gemini, "generate_blog_post", generate_blog_post)
+
+    results = asyncio.run(orchestrator.orchestrate_distribution(request(), ["s1", "ghost", "s2"]))
+
+    assert len(generated) == 1
+    assert [(r["site_id"], r["status"], r.get("blog_id")) for r in results] == [
+        ("s1", "success", 31), ("ghost", "failed", None), ("s2", "success", 4),
+    ]
+    for path, blog_id in ((tenant_db, 31), (second_db, 4)):
+        conn = sqlite3.connect(path)
+        row = conn.execute('SELECT title, "seoSlug", status, "featuredImages" FROM blogs WHERE id = ?', (blog_id,)).fetchone()
+        category = conn.execute('SELECT "categoryId" FROM "BlogCategory" WHERE "blogId" = ?', (blog_id,)).fetchone()
+        conn.close()
+        assert row[:3] == ("Grid Bots Explained", "grid-bots-explained", "published")
+        assert "https://img/grid.webp" in row[3]
+        assert category == (2,)
+
+
+def test_a_failed_generation_fails_every_site(manager, monkeypatch):
+    orchestrator = ContentOrchestrator()
+
+    async def generate_blog_post(req):
+        raise RuntimeError("model overloaded")
+    monkeypatch.setattr(orchestrator.gemini, "generate_blog_post", generate_blog_post)
+
+    results = asyncio.run(orchestrator.orchestrate_distribution(request(), ["a", "b"]))
+    assert results == [
+        {"site_id": "a", "status": "failed", "error": "model overloaded"},
+        {"site_id": "b", "status": "failed", "error": "model overloaded"},
+    ]
+
+
+def test_generation_has_its_own_timeout(manager, monkeypatch):
+    manager.distribution_timeout = 0.01
+    manager.generation_timeout = 0.2
+    orchestrator = ContentOrchestrator()
+
+    async def generate_blog_post(req):
+        await asyncio.sleep(0.05)
+        return ARTICLE
+    monkeypatch.setattr(orchestrator.gemini, "generate_blog_post", generate_blog_post)
+    assert asyncio.run(orchestrator._generate_article(request())) is ARTICLE
+
+    manager.generation_timeout = 0.01
+    results = asyncio.run(orchestrator.orchestrate_distribution(request(), ["a"]))
+    assert results == [{"site_id": "a", "status": "failed", "error": "Article generation did not finish within 0.01s"}]
@@ -0,0 +1,75 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.connection_manager import ConnectionManager, DatabaseConfig
+
+
+def register(manager, tenant_db, site_id="s1"):
+    # Known to the manager but not connected yet, like a lazily restored site
+    manager.connections[site_id] = DatabaseConfig(
+        id=site_id, name=site_id, db_type="sqlite", connection_string=f"sqlite:///{tenant_db}"
+    )
+
+
+def slow_connects(manager, monkeypatch):
+    # Keep the leader's connect in flight long enough for every caller to arrive
+    create = manager._create_engine_and_test
+
+    def slow_create(*args):
+        time.sleep(0.2)
+        return create(*args)
+    monkeypatch.setattr(manager, "_create_engine_and_test", slow_create)
+
+
+def test_singleton_is_created_once_under_contention(manager, monkeypatch):
+    monkeypatch.setattr(ConnectionManager, "_instance", None)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        instances = list(executor.map(lambda _: ConnectionManager.get_instance(), range(8)))
+    assert all(instance is instances[0] for instance in instances)
+
+
+def test_concurrent_cold_callers_share_one_connect(manager, tenant_db, monkeypatch):
+    register(manager, tenant_db)
+    slow_connects(manager, monkeypatch)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        engines = list(executor.map(lambda _: manager.get_engine("s1"), range(6)))
+
+    assert all(engine is engines[0] for engine in engines)
+    assert manager.get_connect_stats()["connects"] == 1
+    assert manager.get_connect_stats()["coalesced"] == 5
+    engines[0].dispose()
+
+
+def test_concurrent_cold_async_callers_share_one_connect(manager, tenant_db):
+    register(manager, tenant_db)
+
+    async def run():
+        engines = await asyncio.gather(*(manager.get_async_engine("s1") for _ in range(5)))
+        await engines[0].dispose()
+        return engines
+
+    engines = asyncio.run(run())
+    assert all(engine is engines[0] for engine in engines)
+    assert manager.get_connect_stats()["connects"] == 1
+    assert manager.get_connect_stats()["coalesced"] == 4
+
+
+def test_failed_connect_is_reported_to_every_waiter(manager, monkeypatch):
+    manager.connections["down"] = DatabaseConfig(
+        id="down", name="down", db_type="sqlite", connection_string="sqlite:////nonexistent-dir/site.db"
+    )
+    slow_connects(manager, monkeypatch)
+
+    def outcome(_):
+        try:
+            manager.get_engine("down")
+        except ValueError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        errors = list(executor.map(outcome, range(4)))
+    assert all(error and error.startswith("Connection failed for down") for error in errors)
+    assert manager.get_connect_stats()["connects"] == 1
+    assert manager._engine_inflight == {}
@@ -0,0 +1,53 @@
+from services.hot_posts import HotPostCache
+from services.response_cache import CachedResponse
+
+
+def entry(body=b'{"id": 1}'):
+    return CachedResponse("site", body, 0)
+
+
+def test_hit_after_put():
+    cache = HotPostCache(max_entries=10, ttl=60)
+    cached = entry()
+    cache.put("site", "hello", 1, cached, cache.version("site"))
+    assert cache.get("site", "hello") is cached
+    assert cache.get("site", "other") is None
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_lru_eviction_keeps_recently_read():
+    cache = HotPostCache(max_entries=2, ttl=60)
+    for post_id, slug in enumerate(["a", "b"], 1):
+        cache.put("site", slug, post_id, entry(), 0)
+    cache.get("site", "a")
+    cache.put("site", "c", 3, entry(), 0)
+    assert cache.get("site", "b") is None
+    assert cache.get("site", "a") is not None
+    assert cache.stats["evictions"] == 1
+
+
+def test_invalidate_only_drops_changed_posts():
+    cache = HotPostCache(max_entries=10, ttl=60)
+    cache.put("site", "a", 1, entry(), 0)
+    cache.put("site", "b", 2, entry(), 0)
+    cache.put("other", "a", 1, entry(), 0)
+    cache.invalidate("site", [1])
+    assert cache.get("site", "a") is None
+    assert cache.get("site", "b") is not None
+    assert cache.get("other", "a") is not None
+
+
+def test_put_after_invalidation_is_not_stored():
+    cache = HotPostCache(max_entries=10, ttl=60)
+    version = cache.version("site")
+    cache.invalidate("site")
+    cache.put("site", "a", 1, entry(), version)
+    assert cache.get("site", "a") is None
+
+
+def test_expired_entries_are_dropped():
+    cache = HotPostCache(max_entries=10, ttl=60)
+    cached = entry()
+    cached.built_at -= 61
+    cache.put("site", "a", 1, cached, 0)
+    assert cache.get("site", "a") is None
@@ -0,0 +1,120 @@
+import datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from services import pagination
+
+ROWS = [
+    (1, "beta", datetime.datetime(2024, 1, 3)),
+    (2, None, datetime.datetime(2024, 1, 1)),
+    (3, "alpha", None),
+    (4, "beta", None),
+    (5, None, datetime.datetime(2024, 1, 2)),
+    (6, "gamma", datetime.datetime(2024, 1, 3)),
+    (7, "alpha", datetime.datetime(2024, 1, 2)),
+]
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        conn.execute(text('CREATE TABLE blogs (id INTEGER PRIMARY KEY, title TEXT, "createdAt" TIMESTAMP)'))
+        conn.execute(text('INSERT INTO blogs VALUES (:id, :title, :created)'),
+                     [{"id": i, "title": t, "created": c} for i, t, c in ROWS])
+        yield conn
+
+
+def expected_ids(sort):
+    column, direction = pagination.SORTS[sort]
+    key = pagination.sort_column(sort)
+    index = {"id": 0, "title": 1, "createdAt": 2}[key]
+    # NULLs order as larger than any value
+    rows = sorted(ROWS, key=lambda row: (row[index] is None, "" if row[index] is None else row[index], row[0]))
+    ids = [row[0] for row in rows]
+    return ids[::-1] if direction == "DESC" else ids
+
+
+def read_page(conn, sort, limit, cursor=None):
+    nullable = sort not in ("id_asc", "id_desc")
+    params = {}
+    if cursor:
+        phases, backwards = pagination.seek_phases(pagination.decode_cursor(cursor), params, nullable)
+    else:
+        phases, backwards = pagination.phases(sort, nullable=nullable), False
+    rows = []
+    for where, order in phases:
+        where = f" WHERE {where}" if where else ""
+        sql = f'SELECT id, title, "createdAt" FROM blogs{where} ORDER BY {order} LIMIT :limit'
+        rows.extend(dict(row._mapping) for row in conn.execute(text(sql), {**params, "limit": limit - len(rows)}))
+        if len(rows) >= limit:
+            break
+    for row in rows:
+        if isinstance(row["createdAt"], str):
+            row["createdAt"] = datetime.datetime.fromisoformat(row["createdAt"])
+    if backwards:
+        rows.reverse()
+    return rows
+
+
+@pytest.mark.parametrize("sort", sorted(pagination.SORTS))
+def test_cursor_pages_cover_every_row(conn, sort):
+    assert [row["id"] for row in read_page(conn, sort, 100)] == expected_ids(sort)
+
+    seen, cursor = [], None
+    while True:
+        rows = read_page(conn, sort, 2, cursor)
+        if not rows:
+            break
+        seen.extend(row["id"] for row in rows)
+        cursor = pagination.encode_cursor(sort, rows[-1], "next")
+    assert seen == expected_ids(sort)
+
+
+@pytest.mark.parametrize("sort", sorted(pagination.SORTS))
+def test_prev_cursor_walks_back(conn, sort):
+    last = read_page(conn, sort, 100)[-1]
+    seen, cursor = [], pagination.encode_cursor(sort, last, "prev")
+    while True:
+        rows = read_page(conn, sort, 2, cursor)
+        if not rows:
+            break
+        seen = [row["id"] for row in rows] + seen
+        cursor = pagination.encode_cursor(sort, rows[0], "prev")
+    assert seen == expected_ids(sort)[:-1]
+
+
+def test_cursor_round_trip_keeps_types():
+    row = {"id": 7, "createdAt": datetime.datetime(2024, 1, 2, 9, 30)}
+    cursor = pagination.decode_cursor(pagination.encode_cursor("date_desc", row, "prev"))
+    assert cursor == {"sort": "date_desc", "key": row["createdAt"], "id": 7, "direction": "prev"}
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30"])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        pagination.decode_cursor(cursor)
+
+
+def test_not_null_columns_read_in_one_plain_phase():
+    assert pagination.phases("date_desc", nullable=False) == [(None, '"createdAt" DESC, id DESC')]
+    assert pagination.phases("id_asc") == [(None, "id ASC")]
+    phases, backwards = pagination.seek_phases({"sort": "date_desc", "key": "k", "id": 3, "direction": "prev"}, {}, False)
+    assert phases == [('("createdAt", id) > (:cursor_key, :cursor_id)', '"createdAt" ASC, id ASC')] and backwards
+
+
+def test_nullable_columns_read_their_nulls_apart():
+    assert pagination.phases("date_desc") == [
+        ('"createdAt" IS NULL', "id DESC"), ('"createdAt" IS NOT NULL', '"createdAt" DESC, id DESC'),
+    ]
+    assert pagination.phases("date_desc", reverse=True) == [
+        ('"createdAt" IS NOT NULL', '"createdAt" ASC, id ASC'), ('"createdAt" IS NULL', "id ASC"),
+    ]
+
+
+def test_phases_are_index_scans(conn):
+    conn.execute(text('CREATE INDEX blogs_created ON blogs ("createdAt")'))
+    for where, order in pagination.phases("date_desc"):
+        plan = " ".join(row[-1] for row in conn.execute(text(f'EXPLAIN QUERY PLAN SELECT id FROM blogs WHERE {where} ORDER BY {order}')))
+        assert "blogs_created" in plan and "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,68 @@
+from services.pool_governor import PoolGovernor
+
+
+def governor(**kwargs):
+    options = dict(global_max=20, min_pool_size=1, initial_pool_size=2, max_pool_size=5, max_overflow=3)
+    options.update(kwargs)
+    return PoolGovernor(**options)
+
+
+def test_reservations_respect_the_global_cap():
+    gov = governor(global_max=8)
+    assert gov.reserve("a:sync") == (2, 2)
+    assert gov.reserve("b:sync") == (2, 2)
+    assert gov.reserve("c:sync") is None
+    assert gov.snapshot()["allocated"] == 8
+
+
+def test_unsized_pools_take_no_budget():
+    gov = governor(global_max=4)
+    assert gov.reserve("sqlite:sync", sized=False) == (0, 0)
+    assert gov.reserve("a:sync") == (2, 2)
+
+
+def test_pool_is_sized_from_observed_peak():
+    gov = governor()
+    gov.reserve("a:sync")
+    for _ in range(4):
+        gov._on_checkout("a:sync")
+    gov.release("a:sync")
+    assert gov.demand["a:sync"] == 4
+    assert gov.reserve("a:sync") == (4, 3)
+
+
+def test_redundant_engine_keeps_its_own_reservation():
+    gov = governor()
+    gov.reserve("a:sync")
+    gov.reserve("a:sync")
+    assert gov.snapshot()["allocated"] == 8
+    assert gov.snapshot()["pools"]["a:sync"]["engines"] == 2
+    # The loser is disposed: only its budget is returned
+    gov.release("a:sync")
+    assert gov.snapshot()["allocated"] == 4
+    gov.release("a:sync")
+    assert gov.snapshot()["allocated"] == 0
+    assert "a:sync" not in gov.pools
+
+
+def test_idle_candidates_skip_checked_out_pools():
+    gov = governor()
+    for key in ("a:sync", "b:sync", "c:sync"):
+        gov.reserve(key)
+    gov._on_checkout("b:sync")
+    gov.touch("a:sync")
+    assert gov.idle_candidates() == ["c:sync", "a:sync"]
+    gov._on_checkin("b:sync")
+    assert gov.idle_candidates(limit=1) == ["c:sync"]
+
+
+def test_release_idle_refuses_pools_in_use():
+    gov = governor()
+    gov.reserve("a:sync")
+    gov.reserve("a:sync")
+    gov._on_checkout("a:sync")
+    assert not gov.release_idle("a:sync")
+    assert gov.snapshot()["allocated"] == 8
+    gov._on_checkin("a:sync")
+    assert gov.release_idle("a:sync")
+    assert gov.snapshot()["allocated"] == 0
@@ -0,0 +1,70 @@
+import asyncio
+
+from services.post_counter import PostCounter
+
+
+def counter_with(by_status, exact=True):
+    counter = PostCounter(manager=None)
+    total = sum(by_status.values()) if by_status else 10
+    counter._store("site", "blogs", total, by_status, exact=exact)
+    return counter
+
+
+def test_insert_adjusts_total_and_status():
+    counter = counter_with({"draft": 2, "published": 3})
+    counter.record_insert("site", "blogs", "draft")
+    view = counter._view(counter.counts["site"])
+    assert view == {"total": 6, "by_status": {"draft": 3, "published": 3}, "exact": True}
+
+
+def test_delete_drops_emptied_statuses():
+    counter = counter_with({"draft": 2, "published": 3})
+    counter.record_delete("site", "blogs", {"draft": 2, "published": 1})
+    view = counter._view(counter.counts["site"])
+    assert view["total"] == 2
+    assert view["by_status"] == {"published": 2}
+
+
+def test_status_change_moves_rows_between_statuses():
+    counter = counter_with({"draft": 2, "published": 3})
+    counter.record_status_change("site", "blogs", {"draft": 2, "published": 1}, "scheduled")
+    view = counter._view(counter.counts["site"])
+    assert view["total"] == 5
+    assert view["by_status"] == {"published": 2, "scheduled": 3}
+
+
+def test_unknown_status_marks_counts_stale():
+    counter = counter_with({"draft": 2})
+    counter.record_insert("site", "blogs", None)
+    view = counter._view(counter.counts["site"])
+    assert view["total"] == 3
+    assert view["exact"] is False
+
+
+def test_writes_to_another_table_are_ignored():
+    counter = counter_with({"draft": 2})
+    counter.record_insert("site", "posts", "draft")
+    counter.record_insert(None, "blogs", "draft")
+    assert counter._view(counter.counts["site"])["total"] == 2
+
+
+def test_estimate_has_no_status_breakdown():
+    counter = counter_with(None, exact=False)
+    view = counter._view(counter.counts["site"])
+    assert view == {"total": 10, "by_status": None, "exact": False}
+    counter.record_insert("site", "blogs", "draft")
+    assert counter._view(counter.counts["site"])["by_status"] is None
+
+
+def test_cold_estimate_is_not_reported_as_stats():
+    counter = PostCounter(manager=None)
+    recounts = []
+
+    async def estimate(conn, table_name):
+        return 42
+
+    counter._estimate = estimate
+    counter._schedule_recount = lambda site_id, table_name: recounts.append(site_id)
+    view = asyncio.run(counter.get_counts("site", None, "blogs"))
+    assert view == {"total": 42, "by_status": None, "exact": False}
+    assert recounts == ["site"]
@@ -0,0 +1,100 @@
+import sqlite3
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from conftest import add_site
+
+INDICATORS = list(range(29, 0, -2))  # odd post ids, newest first
+
+
+@contextmanager
+def statements(manager, site_id):
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+    engine = manager.async_engines[site_id].sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def listing(client, **params):
+    response = client.get("/sites/s1/posts", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_filtered_page_and_total_come_from_one_query(client, manager, tenant_db):
+    add_site(client, "s1", tenant_db)
+    listing(client, category="indicators", include_stats=False)  # warm schema and category caches
+
+    with statements(manager, "s1") as executed:
+        body = listing(client, category="indicators", include_stats=False, page=2, limit=5)
+
+    assert len(executed) == 1
+    assert [post["id"] for post in body["posts"]] == INDICATORS[5:10]
+    assert (body["total"], body["total_exact"], body["total_pages"]) == (15, True, 3)
+    assert all("_total" not in post for post in body["posts"])
+
+
+def test_past_the_end_page_still_reports_the_total(client, tenant_db):
+    add_site(client, "s1", tenant_db)
+    body = listing(client, category="indicators", include_stats=False, page=9, limit=5)
+    assert body["posts"] == [] and body["total"] == 15
+
+
+def test_total_can_be_skipped(client, manager, tenant_db):
+    add_site(client, "s1", tenant_db)
+    listing(client, search="forex", include_stats=False)
+
+    with statements(manager, "s1") as executed:
+        body = listing(client, search="forex", include_stats=False, include_total=False)
+
+    assert body["total"] is None and len(body["posts"]) == 10
+    assert len(executed) == 1 and "COUNT" not in executed[0]
+
+
+def test_cursor_pages_keep_the_filtered_total(client, tenant_db):
+    add_site(client, "s1", tenant_db)
+    seen, cursor = [], None
+    while True:
+        body = listing(client, category="indicators", include_stats=False, limit=4, **({"cursor": cursor} if cursor else {}))
+        assert body["total"] == 15
+        seen += [post["id"] for post in body["posts"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert seen == INDICATORS
+
+
+def test_nullable_sort_pages_through_its_nulls(client, tmp_path):
+    path = str(tmp_path / "nullable.db")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE blogs (id INTEGER PRIMARY KEY, title TEXT, status TEXT, content TEXT)")
+    titles = ["beta", None, "alpha", None, "beta", None, "gamma"]
+    db.executemany("INSERT INTO blogs (id, title, status, content) VALUES (?, ?, 'draft', '')", enumerate(titles, 1))
+    db.commit()
+    db.close()
+    add_site(client, "s1", path)
+    # NULL titles sort above every title, as in PostgreSQL
+    expected = [6, 4, 2, 7, 5, 1, 3]
+
+    by_page = []
+    for page in range(1, 5):
+        body = listing(client, sort="title_desc", page=page, limit=2, include_stats=False)
+        by_page.extend(post["id"] for post in body["posts"])
+    assert by_page == expected
+    assert body["total"] == 7
+
+    by_cursor, params = [], {"sort": "title_desc", "limit": 2, "include_stats": False}
+    while True:
+        body = listing(client, **params)
+        by_cursor.extend(post["id"] for post in body["posts"])
+        if not body["next_cursor"]:
+            break
+        params = {"cursor": body["next_cursor"], "limit": 2, "include_stats": False}
+    assert by_cursor == expected
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from services import projection
+from services.schema_registry import SchemaRegistry
+from conftest import add_site
+
+
+def schema_for(tmp_path, ddl):
+    engine = create_engine(f"sqlite:///{tmp_path / 'site.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(ddl))
+    return SchemaRegistry(manager=None).get("site", bind=engine)
+
+
+def test_all_columns_by_default(tmp_path):
+    schema = schema_for(tmp_path, "CREATE TABLE blogs (id INTEGER PRIMARY KEY, title TEXT, content TEXT)")
+    assert projection.select_list(schema, "blogs", None) == "t.*"
+    assert projection.select_list(schema, "blogs", " * ") == "t.*"
+
+
+def test_summary_drops_the_body_and_derives_an_excerpt(tmp_path):
+    schema = schema_for(tmp_path, "CREATE TABLE blogs (id INTEGER PRIMARY KEY, title TEXT, content TEXT)")
+    select = projection.select_list(schema, "blogs", "summary")
+    assert select == 't."id", t."title", SUBSTR(SUBSTR(t."content", 1, 2000), 1, 280) AS "excerpt"'
+
+
+def test_summary_prefers_a_stored_excerpt(tmp_path):
+    schema = schema_for(tmp_path, 'CREATE TABLE blogs (id INTEGER PRIMARY KEY, excerpt TEXT, content TEXT, "createdAt" TIMESTAMP)')
+    select = projection.select_list(schema, "blogs", "summary", required=("id", "createdAt"))
+    assert select.startswith('t."id", t."createdAt", COALESCE(NULLIF(t."excerpt", \'\'), SUBSTR(')
+    assert 't."content"' not in select.split("SUBSTR")[0]
+
+
+def test_explicit_fields_keep_required_keys_and_reject_unknown_ones(tmp_path):
+    schema = schema_for(tmp_path, "CREATE TABLE blogs (id INTEGER PRIMARY KEY, title TEXT, status TEXT)")
+    assert projection.select_list(schema, "blogs", "title, status,title") == 't."id", t."title", t."status"'
+    with pytest.raises(ValueError, match="Unknown field"):
+        projection.select_list(schema, "blogs", "title,password")
+
+
+def test_listing_with_summary_fields_skips_the_body(client, tenant_db):
+    add_site(client, "s1", tenant_db)
+
+    summary = client.get("/sites/s1/posts", params={"fields": "summary", "limit": 2}).json()["posts"]
+    assert [post["id"] for post in summary] == [30, 29]
+    assert "content" not in summary[0]
+    assert summary[0]["excerpt"] == "excerpt 30"
+
+    picked = client.get("/sites/s1/posts", params={"fields": "title", "limit": 1}).json()["posts"]
+    assert set(picked[0]) >= {"id", "title"} and "content" not in picked[0]
+
+    assert client.get("/sites/s1/posts", params={"fields": "nope"}).status_code == 400
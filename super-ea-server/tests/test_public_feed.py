@@ -0,0 +1,96 @@
+import sqlite3
+
+from conftest import add_site
+
+PUBLISHED = [str(i) for i in range(28, 0, -3)]  # post ids with status 'published', newest first
+
+
+def ids(posts):
+    return [post["id"] for post in posts]
+
+
+def test_plain_list_and_lite_cards(client, tenant_db):
+    add_site(client, "algotrading", tenant_db)
+
+    posts = client.get("/api/posts").json()
+    assert ids(posts) == PUBLISHED
+    assert posts[0]["slug"] == "post-28" and posts[0]["content"].startswith("word")
+
+    cards = client.get("/api/posts", params={"lite": True, "category": "indicators"}).json()
+    assert ids(cards) == ["25", "19", "13", "7", "1"]
+    assert all("content" not in card and card["category"] == "indicators" for card in cards)
+
+
+def test_page_numbers_and_cursors_walk_the_same_feed(client, tenant_db):
+    add_site(client, "algotrading", tenant_db)
+
+    first = client.get("/api/posts", params={"page": 1, "limit": 4}).json()
+    assert (first["total"], first["total_pages"]) == (10, 3)
+    second = client.get("/api/posts", params={"page": 2, "limit": 4}).json()
+
+    walked, cursor = ids(first["posts"]), first["next_cursor"]
+    while cursor:
+        page = client.get("/api/posts", params={"cursor": cursor, "limit": 4}).json()
+        walked += ids(page["posts"])
+        cursor = page["next_cursor"]
+
+    assert walked == PUBLISHED
+    assert walked[4:8] == ids(second["posts"])
+    assert client.get("/api/posts", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_single_post_by_slug(client, manager, tenant_db):
+    add_site(client, "algotrading", tenant_db)
+
+    response = client.get("/api/posts/post-28")
+    assert response.json()["id"] == "28"
+    again = client.get("/api/posts/post-28", headers={"If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
+    assert manager.hot_posts.snapshot()["hits"] == 1
+
+    assert client.get("/api/posts/post-2").status_code == 404  # a draft
+    assert client.get("/api/posts/no-such-post").status_code == 404
+
+
+def test_unpublishing_drops_the_post_from_the_feed(client, tenant_db):
+    add_site(client, "algotrading", tenant_db)
+    assert client.get("/api/posts/post-28").status_code == 200
+    assert ids(client.get("/api/posts").json())[0] == "28"
+
+    response = client.patch("/sites/algotrading/posts/28/status", json={"status": "draft"})
+    assert response.status_code == 200, response.text
+
+    assert client.get("/api/posts/post-28").status_code == 404
+    assert ids(client.get("/api/posts").json()) == PUBLISHED[1:]
+
+
+def test_writes_during_the_first_build_are_applied(client, manager, tenant_db, monkeypatch):
+    add_site(client, "algotrading", tenant_db)
+    projection = manager.public_projection
+    load = projection._load
+
+    async def slow_load(site_id, conn, table_name, post_ids, *args, **kwargs):
+        posts = await load(site_id, conn, table_name, post_ids, *args, **kwargs)
+        if post_ids is None:
+            # Post 30 is published after the first build has read the table
+            db = sqlite3.connect(tenant_db)
+            db.execute("UPDATE blogs SET status = 'published' WHERE id = 30")
+            db.commit()
+            db.close()
+            manager.posts_changed("algotrading", [30])
+        return posts
+    monkeypatch.setattr(projection, "_load", slow_load)
+
+    assert ids(client.get("/api/posts").json()) == ["30"] + PUBLISHED
+
+
+def test_a_post_shows_its_first_linked_category(client, tenant_db):
+    db = sqlite3.connect(tenant_db)
+    db.execute('INSERT INTO "BlogCategory" ("blogId", "categoryId") VALUES (28, 2)')
+    db.commit()
+    db.close()
+    add_site(client, "algotrading", tenant_db)
+
+    assert client.get("/api/posts/post-28").json()["category"] == "pre-built bots"
+    listed = client.get("/sites/algotrading/posts", params={"limit": 1, "status": "published"}).json()["posts"]
+    assert (listed[0]["id"], listed[0]["category"]) == (28, "pre-built bots")
@@ -0,0 +1,58 @@
+import datetime
+
+from services.public_projection import ProjectedPost, SiteProjection, read_time
+
+
+def post(post_id, created=None, **fields):
+    return ProjectedPost({"id": post_id, "createdAt": created, "seoSlug": f"post-{post_id}", **fields}, [])
+
+
+def dated(day):
+    return datetime.datetime(2024, 1, day)
+
+
+def projection(max_posts=None):
+    posts = [post(1, dated(1)), post(2, None), post(3, dated(3)), post(4, dated(3)), post(5, None)]
+    return SiteProjection("blogs", posts, max_posts)
+
+
+def test_undated_posts_sort_first_like_postgres_desc():
+    assert [p.post_id for p in projection().posts] == [5, 2, 4, 3, 1]
+
+
+def test_cursor_pages_match_page_numbers():
+    site = projection()
+    seen, cursor = [], None
+    while True:
+        page = site.page(None, 2, cursor=cursor) if cursor else site.page(None, 2)
+        seen.extend(int(p["id"]) for p in page["posts"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [5, 2, 4, 3, 1]
+    assert site.page(None, 2, page=2)["posts"] == [p.data for p in site.posts[2:4]]
+
+
+def test_max_posts_keeps_the_newest():
+    site = projection(max_posts=3)
+    assert [p.post_id for p in site.posts] == [5, 2, 4]
+    assert site.truncated
+    assert site.get_by_slug("post-1") is None
+
+
+def test_untruncated_projection():
+    site = projection(max_posts=10)
+    assert not site.truncated
+    assert site.get_by_slug("post-1").post_id == 1
+
+
+def test_views_share_fields_without_body():
+    projected = post(1, dated(1), title="Hello", content="<p>" + "word " * 450 + "</p>")
+    assert projected.data["readTime"] == "3 min read"
+    assert "content" not in projected.lite
+    assert projected.summary["content"] == ""
+    assert projected.lite["description"].startswith("word word")
+
+
+def test_read_time_ignores_tags():
+    assert read_time("<img src='a very long attribute value'>") == "1 min read"
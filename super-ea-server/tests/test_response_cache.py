@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+from services.response_cache import CachedResponse, ResponseCache
+
+
+class Builder:
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"build": self.calls}
+
+
+def body(entry):
+    return json.loads(entry.body)
+
+
+def test_concurrent_misses_share_one_build():
+    async def run():
+        cache, builder = ResponseCache(ttl=60), Builder(delay=0.01)
+        entries = await asyncio.gather(*(cache.get("feed", "site", builder) for _ in range(5)))
+        return cache, builder, entries
+
+    cache, builder, entries = asyncio.run(run())
+    assert builder.calls == 1
+    assert all(entry is entries[0] for entry in entries)
+    assert cache.stats["misses"] == 5
+
+
+def test_stale_entry_is_served_while_revalidating():
+    async def run():
+        cache, builder = ResponseCache(ttl=60, stale_ttl=600), Builder()
+        first = await cache.get("feed", "site", builder)
+        first.built_at -= 61
+        stale = await cache.get("feed", "site", builder)
+        await asyncio.sleep(0.01)
+        fresh = await cache.get("feed", "site", builder)
+        return first, stale, fresh, cache
+
+    first, stale, fresh, cache = asyncio.run(run())
+    assert stale is first
+    assert body(fresh) == {"build": 2}
+    assert cache.stats["revalidations"] == 1
+
+
+def test_build_started_before_invalidation_is_not_stored():
+    async def run():
+        cache, builder = ResponseCache(ttl=60), Builder(delay=0.01)
+        pending = asyncio.create_task(cache.get("feed", "site", builder))
+        await asyncio.sleep(0)
+        cache.invalidate("site")
+        old = await pending
+        new = await cache.get("feed", "site", builder)
+        return old, new
+
+    old, new = asyncio.run(run())
+    assert body(old) == {"build": 1}
+    assert body(new) == {"build": 2}
+
+
+def test_unchanged_rebuild_keeps_last_modified():
+    async def run():
+        cache = ResponseCache(ttl=0, stale_ttl=0)
+
+        async def same():
+            return {"posts": []}
+        first = await cache.get("feed", "site", same)
+        first.last_modified -= 100
+        return first, await cache.get("feed", "site", same)
+
+    first, second = asyncio.run(run())
+    assert second is not first
+    assert second.etag == first.etag and second.last_modified == first.last_modified
+
+
+def test_if_none_match():
+    entry = CachedResponse("site", b"{}", 0)
+    assert entry.matches(entry.etag)
+    assert entry.matches(f'"other", W/{entry.etag}')
+    assert entry.matches("*")
+    assert not entry.matches('"other"') and not entry.matches(None)
@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from services.schema_registry import SchemaRegistry, engine_key
+
+
+class FakeManager:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def get_engine(self, key):
+        return self.engine
+
+
+def site_db(path):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE blogs (id INTEGER PRIMARY KEY, title TEXT NOT NULL, authorId INTEGER REFERENCES users(id))"))
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY)"))
+    return engine
+
+
+def url_only(url):
+    # engine_key only reads .url; no driver needed
+    return SimpleNamespace(url=make_url(url))
+
+
+def test_engine_key_tells_credentials_apart():
+    first = url_only("postgresql://app:one@db/site")
+    second = url_only("postgresql://app:two@db/site")
+    assert str(first.url) == str(second.url)
+    assert engine_key(first) != engine_key(second)
+    assert engine_key(first) == engine_key(url_only("postgresql://app:one@db/site"))
+    assert "one" not in engine_key(first)
+
+
+def test_reflection_is_cached_until_invalidated(tmp_path):
+    registry = SchemaRegistry(FakeManager(site_db(tmp_path / "site.db")))
+    schema = registry.get("site")
+    assert sorted(schema.table_names) == ["blogs", "users"]
+    assert schema.find_table("BLOGS") == "blogs"
+    assert schema.primary_key("blogs") == ["id"]
+    assert schema.foreign_keys("blogs")[0]["referred_table"] == "users"
+    assert registry.get("site") is schema
+    registry.invalidate("site")
+    assert registry.get("site") is not schema
+    assert registry.stats == {"hits": 1, "loads": 2}
+
+
+def test_concurrent_misses_reflect_once(tmp_path):
+    registry = SchemaRegistry(FakeManager(site_db(tmp_path / "site.db")))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        schemas = list(executor.map(lambda _: registry.get("site"), range(8)))
+    assert all(schema is schemas[0] for schema in schemas)
+    assert registry.stats["loads"] == 1
+
+
+def test_async_misses_on_a_connection_reflect_once(tmp_path):
+    path = tmp_path / "site.db"
+    registry = SchemaRegistry(FakeManager(site_db(path)))
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+        async def read():
+            async with engine.connect() as conn:
+                return await registry.get_async("site", conn)
+        schemas = await asyncio.gather(*(read() for _ in range(5)))
+        await engine.dispose()
+        return schemas
+
+    schemas = asyncio.run(run())
+    assert all(schema is schemas[0] for schema in schemas)
+    assert registry.stats["loads"] == 1
+
+
+def test_memo_is_dropped_with_the_snapshot(tmp_path):
+    registry = SchemaRegistry(FakeManager(site_db(tmp_path / "site.db")))
+    calls = []
+    registry.get("site").remember("derived", lambda: calls.append(1) or len(calls))
+    assert registry.get("site").remember("derived", lambda: calls.append(1) or len(calls)) == 1
+    registry.invalidate("site")
+    assert registry.get("site").remember("derived", lambda: calls.append(1) or len(calls)) == 2
@@ -0,0 +1,122 @@
+import asyncio
+
+from sqlalchemy import create_engine, text
+
+from services.circuit_breaker import SiteUnavailableError
+from services.search import (
+    PostgresFullTextBackend,
+    PostgresTrigramBackend,
+    SearchBackend,
+    SiteSearch,
+    SqliteFts5Backend,
+)
+from conftest import add_site, make_tenant
+
+COLUMNS = ["title", "h1", "content"]
+ROWS = [
+    (1, "Grid bot basics", "Grid", "How a grid trading bot works"),
+    (2, "Scalping", "Scalping guide", "A grid is not used here"),
+    (3, "News trading", "News", "Trading the calendar"),
+]
+
+
+def site_db():
+    engine = create_engine("sqlite://")
+    conn = engine.connect()
+    conn.execute(text("CREATE TABLE blogs (id INTEGER PRIMARY KEY, title TEXT, h1 TEXT, content TEXT, status TEXT)"))
+    conn.execute(text("INSERT INTO blogs VALUES (:id, :title, :h1, :content, 'published')"),
+                 [{"id": i, "title": t, "h1": h, "content": c} for i, t, h, c in ROWS])
+    return conn
+
+
+def run(conn, backend, query):
+    params = {"limit": 10}
+    rows = conn.execute(text(backend.ranked_sql("t.id", query, [], params)), params).fetchall()
+    return [row[0] for row in rows]
+
+
+def test_describe_reports_the_columns_actually_searched():
+    assert SearchBackend("blogs", COLUMNS).describe()["columns"] == ["title", "h1"]
+    assert PostgresTrigramBackend("blogs", COLUMNS).describe()["columns"] == ["title", "h1"]
+    assert PostgresFullTextBackend("blogs", COLUMNS).describe()["columns"] == COLUMNS
+    assert SqliteFts5Backend("blogs", COLUMNS).describe()["columns"] == COLUMNS
+    # A table with only a body column still gets a LIKE column
+    assert SearchBackend("blogs", ["content"]).describe()["columns"] == ["content"]
+
+
+def test_like_backend_matches_title_and_h1_only():
+    conn = site_db()
+    assert run(conn, SearchBackend("blogs", COLUMNS), "GRID") == [1]
+    assert run(conn, SearchBackend("blogs", COLUMNS), "guide") == [2]
+
+
+def test_fts5_backend_ranks_body_matches():
+    conn = site_db()
+    backend = SqliteFts5Backend("blogs", COLUMNS)
+    for statement in backend.index_sql():
+        conn.execute(text(statement))
+    assert sorted(run(conn, backend, "grid")) == [1, 2]
+    assert run(conn, backend, "calend") == [3]
+    # Triggers keep the shadow table in sync
+    conn.execute(text("UPDATE blogs SET content = 'nothing' WHERE id = 3"))
+    assert run(conn, backend, "calendar") == []
+
+
+def test_fts5_query_is_quoted():
+    assert SqliteFts5Backend._fts_query('grid" OR bot') == '"grid" "OR" "bot"*'
+    assert SqliteFts5Backend._fts_query("!!") == ""
+
+
+class FakeSites:
+    def list_sites(self):
+        return [{"id": site_id, "name": site_id.upper()} for site_id in ("a", "b", "down", "slow")]
+
+
+def federated(query, **kwargs):
+    site_search = SiteSearch(FakeSites(), deadline=0.2)
+    results = {
+        "a": [{"id": 1, "rank": 4.0}, {"id": 2, "rank": 1.0}],
+        "b": [{"id": 7, "rank": 0.5}],
+    }
+
+    async def search(site_id, query, **_):
+        if site_id == "down":
+            raise SiteUnavailableError("circuit open")
+        if site_id == "slow":
+            await asyncio.sleep(5)
+        return {"backend": "like", "count": len(results[site_id]), "took_ms": 1, "posts": results[site_id]}
+
+    site_search.search = search
+    return site_search, asyncio.run(site_search.search_all(query, **kwargs))
+
+
+def test_search_all_merges_by_relevance_within_the_deadline():
+    site_search, result = federated("grid")
+
+    assert [(post["site_id"], post["id"], post["relevance"]) for post in result["posts"]] == [
+        ("a", 1, 1.0), ("b", 7, 1.0), ("a", 2, 0.25),
+    ]
+    assert result["partial"] is True
+    assert {site_id: entry["status"] for site_id, entry in result["sites"].items()} == {
+        "a": "ok", "b": "ok", "down": "unavailable", "slow": "timeout",
+    }
+    assert result["took_ms"] < 2000
+    assert site_search.stats == {"federated": 1, "site_timeouts": 1, "site_errors": 1}
+
+
+def test_search_all_limits_to_requested_sites_and_hits():
+    _, result = federated("grid", site_ids=["a", "unknown"], limit=1)
+    assert list(result["sites"]) == ["a"]
+    assert result["partial"] is False
+    assert result["count"] == 1 and result["posts"][0]["id"] == 1
+
+
+def test_search_endpoint_searches_every_site(client, tenant_db, tmp_path):
+    add_site(client, "s1", tenant_db)
+    add_site(client, "s2", make_tenant(str(tmp_path / "second.db"), posts=3))
+
+    result = client.get("/search", params={"q": "Post 3 about", "per_site": 5}).json()
+
+    assert result["partial"] is False
+    assert {(post["site_id"], post["seoSlug"]) for post in result["posts"]} == {("s1", "post-3"), ("s2", "post-3")}
+    assert client.get("/search", params={"q": "x", "deadline": 0}).status_code == 400
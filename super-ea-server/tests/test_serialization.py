@@ -0,0 +1,61 @@
+import datetime
+import json
+from decimal import Decimal
+
+from sqlalchemy import DateTime, Float, Integer, LargeBinary, Numeric, String, create_engine, text
+
+from services import serialization
+from services.schema_registry import SchemaRegistry
+from services.serialization import FastJSONResponse, RowSerializer, converter_for, dumps
+
+CREATED = datetime.datetime(2024, 1, 31, 9, 30)
+
+
+def test_converters_only_for_types_that_need_them():
+    assert converter_for(String()) is None
+    assert converter_for(Integer()) is None
+    assert converter_for(Float()) is None
+    assert converter_for(DateTime())(CREATED) == "2024-01-31 09:30:00"
+    assert converter_for(Numeric())(Decimal("12")) == 12
+    assert converter_for(Numeric())(Decimal("1.5")) == 1.5
+    assert converter_for(LargeBinary())(b"abc") == "abc"
+
+
+def test_row_serializer_converts_typed_columns():
+    serializer = RowSerializer(["id", "title", "createdAt", "price"], {
+        "id": Integer(), "title": String(), "createdAt": DateTime(), "price": Numeric(),
+    })
+    assert [name for _, name, _ in serializer.converters] == ["createdAt", "price"]
+    assert serializer.dicts([(1, "Post", CREATED, Decimal("9.50")), (2, "Draft", None, None)]) == [
+        {"id": 1, "title": "Post", "createdAt": "2024-01-31 09:30:00", "price": 9.5},
+        {"id": 2, "title": "Draft", "createdAt": None, "price": None},
+    ]
+    assert serializer.convert([{"id": 3, "createdAt": CREATED}]) == [{"id": 3, "createdAt": "2024-01-31 09:30:00"}]
+
+
+def test_for_result_is_memoized_per_query_shape(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'site.db'}")
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE blogs (id INTEGER PRIMARY KEY, "createdAt" TIMESTAMP)'))
+    schema = SchemaRegistry(manager=None).get("site", bind=engine)
+
+    with engine.connect() as conn:
+        first = RowSerializer.for_result(conn.execute(text('SELECT id, "createdAt" FROM blogs')), schema, "blogs")
+        again = RowSerializer.for_result(conn.execute(text('SELECT id, "createdAt" FROM blogs')), schema, "blogs")
+        other = RowSerializer.for_result(conn.execute(text("SELECT id FROM blogs")), schema, "blogs")
+        untyped = RowSerializer.for_result(conn.execute(text("SELECT id FROM blogs")), schema, "missing")
+
+    assert first is again and first is not other
+    assert [name for _, name, _ in first.converters] == ["createdAt"]
+    assert untyped.converters == []
+
+
+def test_dumps_matches_the_stdlib_encoding():
+    data = {"title": "Café", "createdAt": CREATED, "price": Decimal("2"), "raw": b"x", 1: None}
+    expected = {"title": "Café", "createdAt": "2024-01-31 09:30:00", "price": 2, "raw": "x", "1": None}
+    assert json.loads(dumps(data)) == expected
+    assert json.loads(FastJSONResponse(data).body) == expected
+
+    # The fallback used when orjson is not installed gives the same JSON
+    stdlib = json.dumps(data, default=serialization._default, ensure_ascii=False).encode()
+    assert json.loads(stdlib) == expected
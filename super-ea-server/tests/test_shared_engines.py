@@ -0,0 +1,63 @@
+import os
+
+from services.connection_manager import DatabaseConfig
+from conftest import add_site, make_tenant
+
+
+def db_key(manager, url, site_id="s1"):
+    return manager._normalize_db_url(DatabaseConfig(id=site_id, name=site_id, connection_string=url))
+
+
+def test_equivalent_urls_share_a_key(manager, tmp_path, monkeypatch):
+    assert db_key(manager, "postgres://app:pw@DB.example.com/site") == db_key(manager, "postgresql://app:pw@db.example.com:5432/site")
+    assert db_key(manager, "postgresql://app:pw@db/site") != db_key(manager, "postgresql://app:other@db/site")
+    assert "pw" not in db_key(manager, "postgresql://app:pw@db/site")
+
+    monkeypatch.chdir(tmp_path)
+    assert db_key(manager, "sqlite:///site.db") == db_key(manager, f"sqlite:///{os.path.join(tmp_path, 'site.db')}")
+    assert db_key(manager, "sqlite://", "a") != db_key(manager, "sqlite://", "b")
+
+
+def test_sites_on_one_database_share_engines_until_the_last_one_goes(client, manager, tenant_db):
+    add_site(client, "s1", tenant_db)
+    add_site(client, "s2", tenant_db)
+    assert manager.engines["s1"] is manager.engines["s2"]
+
+    for site_id in ("s1", "s2"):
+        assert client.get(f"/sites/{site_id}/posts", params={"limit": 1}).status_code == 200
+    assert manager.async_engines["s1"] is manager.async_engines["s2"]
+    assert manager.get_connect_stats()["shared"] >= 1
+    assert sorted(manager.get_pool_usage()["engines"]["sites"].values()) == [["s1", "s2"], ["s1", "s2"]]
+
+    client.delete("/sites/s1")
+    assert client.get("/sites/s2/posts", params={"limit": 1}).status_code == 200
+    assert manager.get_pool_usage()["engines"]["sites"] == {
+        key: ["s2"] for key in manager.shared_engines
+    }
+
+    client.delete("/sites/s2")
+    assert manager.shared_engines == {} and manager.engine_refs == {}
+
+
+def test_repointing_a_site_releases_its_old_engine(client, manager, tenant_db, tmp_path):
+    add_site(client, "s1", tenant_db)
+    other_db = make_tenant(str(tmp_path / "other.db"), posts=2)
+    add_site(client, "s1", other_db)
+
+    assert list(manager.shared_engines) == [f"{db_key(manager, f'sqlite:///{other_db}')}:sync"]
+    assert client.get("/sites/s1/posts").json()["total"] == 2
+
+
+def test_repointing_a_site_forgets_its_counts_and_caches(client, manager, tenant_db, tmp_path):
+    add_site(client, "algotrading", tenant_db)
+    # Warms the post counter, the stats cache, the public projection and the hot posts
+    assert client.get("/sites/algotrading/posts").json()["total"] == 30
+    assert client.get("/sites/algotrading/stats").status_code == 200
+    assert client.get("/api/posts/post-28").status_code == 200
+
+    add_site(client, "algotrading", make_tenant(str(tmp_path / "other.db"), posts=2))
+
+    assert "algotrading" not in manager.site_stats_cache
+    assert client.get("/sites/algotrading/posts").json()["total"] == 2
+    assert client.get("/api/posts/post-28").status_code == 404
+    assert [post["slug"] for post in client.get("/api/posts").json()] == ["post-1"]
@@ -0,0 +1,43 @@
+import json
+
+from conftest import add_site, make_tenant
+
+
+def stream(client):
+    response = client.get("/sites/detailed/stream")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_cached_entries_first_then_each_refresh(client, tenant_db, tmp_path):
+    add_site(client, "s1", tenant_db)
+    add_site(client, "s2", make_tenant(str(tmp_path / "second.db"), posts=3))
+
+    events = stream(client)
+
+    assert [(e["status"], e["data"]["id"], e["data"]["total_posts"]) for e in events[:2]] == [
+        ("cached", "s1", -1), ("cached", "s2", -1),
+    ]
+    assert sorted((e["status"], e["data"]["id"], e["data"]["total_posts"]) for e in events[2:4]) == [
+        ("updated", "s1", 30), ("updated", "s2", 3),
+    ]
+    assert events[4] == {"status": "complete", "refreshed": 2}
+
+    # Fresh stats are served from the cache without refreshing
+    events = stream(client)
+    assert [(e["status"], e.get("data", {}).get("total_posts")) for e in events] == [
+        ("cached", 30), ("cached", 3), ("complete", None),
+    ]
+
+
+def test_sites_with_an_open_circuit_are_not_refreshed(client, manager, tenant_db):
+    add_site(client, "s1", tenant_db)
+    breaker = manager.get_breaker("s1")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure(ConnectionError("refused"))
+
+    events = stream(client)
+
+    assert events[0]["data"]["status"] == "unavailable"
+    assert events[0]["data"]["breaker"]["state"] == "open"
+    assert events[1] == {"status": "complete", "refreshed": 0}
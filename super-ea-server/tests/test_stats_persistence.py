@@ -0,0 +1,35 @@
+from database import AdminSessionLocal, SiteStats
+from services.connection_manager import ConnectionManager
+from conftest import add_site
+
+
+def test_refreshed_stats_survive_a_restart(client, manager, tenant_db):
+    add_site(client, "s1", tenant_db)
+    stats = client.post("/sites/s1/refresh-stats").json()
+    assert (stats["status"], stats["total_posts"], stats["exact"]) == ("connected", 30, True)
+
+    restored = ConnectionManager().get_cached_stats("s1")
+
+    assert restored == {
+        "id": "s1", "name": "s1", "table": "blogs", "total_posts": 30, "exact": True,
+        "status": "connected", "last_updated": stats["last_updated"],
+    }
+
+
+def test_stats_of_unknown_sites_are_not_restored(manager):
+    session = AdminSessionLocal()
+    session.add(SiteStats(site_id="gone", table_name="blogs", total_posts=3, status="connected", last_updated=1.0))
+    session.commit()
+    session.close()
+
+    assert ConnectionManager().get_cached_stats("gone") is None
+
+
+def test_deleting_a_site_deletes_its_stats(client, manager, tenant_db):
+    add_site(client, "s1", tenant_db)
+    client.post("/sites/s1/refresh-stats")
+    client.delete("/sites/s1")
+
+    session = AdminSessionLocal()
+    assert session.query(SiteStats).filter(SiteStats.site_id == "s1").count() == 0
+    session.close()
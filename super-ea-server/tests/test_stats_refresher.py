@@ -0,0 +1,60 @@
+import asyncio
+
+from services.stats_refresher import StatsRefresher
+
+
+class FakeManager:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = []
+
+    async def refresh_site_stats(self, site_id, force_refresh=False):
+        self.calls.append((site_id, force_refresh))
+        await asyncio.sleep(self.delay)
+        return {"id": site_id, "forced": force_refresh}
+
+
+def test_concurrent_refreshes_of_a_site_are_shared():
+    async def run():
+        manager = FakeManager()
+        refresher = StatsRefresher(manager)
+        results = await asyncio.gather(*(refresher.refresh("a") for _ in range(5)), refresher.refresh("b"))
+        return manager, refresher, results
+
+    manager, refresher, results = asyncio.run(run())
+    assert sorted(manager.calls) == [("a", False), ("b", False)]
+    assert refresher.stats["coalesced"] == 4
+    assert results[0] is results[4]
+
+
+def test_forced_refresh_runs_after_a_non_forced_one():
+    async def run():
+        manager = FakeManager()
+        refresher = StatsRefresher(manager)
+        plain = refresher.schedule("a")
+        forced = refresher.schedule("a", force_refresh=True)
+        joined = refresher.schedule("a", force_refresh=True)
+        later_plain = refresher.schedule("a")
+        return manager, refresher, plain, forced, joined, later_plain, await asyncio.gather(plain, forced)
+
+    manager, refresher, plain, forced, joined, later_plain, results = asyncio.run(run())
+    assert forced is not plain
+    assert joined is forced and later_plain is forced
+    assert manager.calls == [("a", False), ("a", True)]
+    assert results == [{"id": "a", "forced": False}, {"id": "a", "forced": True}]
+    assert refresher.stats["chained"] == 1
+    assert not refresher.is_refreshing("a")
+
+
+def test_timeout_is_recorded_without_failing_the_batch():
+    class SlowManager(FakeManager):
+        connections = {}
+
+    async def run():
+        refresher = StatsRefresher(SlowManager(delay=1), timeout=0.01)
+        return refresher, await refresher.refresh_many(["a", "b"])
+
+    refresher, results = asyncio.run(run())
+    # Unknown sites get no error entry
+    assert results == [None, None]
+    assert refresher.stats["timeouts"] == 2
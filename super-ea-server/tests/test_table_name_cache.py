@@ -0,0 +1,44 @@
+import sqlite3
+
+from conftest import add_site
+
+
+def test_table_name_recovery(manager):
+    tables = ["Blogs", "users", "post"]
+    assert manager._match_table_name(tables, "blogs") == "Blogs"
+    assert manager._match_table_name(tables, "posts") == "post"
+    assert manager._match_table_name(tables, "articles") == "Blogs"
+    assert manager._match_table_name(["users"], "articles") == "articles"
+    assert manager.normalize_table_name(" Blog ") == "blogs"
+
+
+def test_resolved_names_are_cached_until_the_schema_changes(client, manager, tenant_db):
+    add_site(client, "s1", tenant_db, table="Blogs")
+    engine = manager.get_engine("s1")
+
+    assert manager.resolve_table_name(engine, "Blogs", site_id="s1") == "blogs"
+    loads = manager.schema_registry.stats["loads"]
+    assert manager.resolve_table_name(engine, "Blogs", site_id="s1") == "blogs"
+    assert manager.schema_registry.stats["loads"] == loads
+
+    # A migration renames the table; a schema refresh picks it up
+    conn = sqlite3.connect(tenant_db)
+    conn.execute("ALTER TABLE blogs RENAME TO posts")
+    conn.close()
+    assert manager.resolve_table_name(engine, "Blogs", site_id="s1") == "blogs"
+    assert client.post("/sites/s1/schema/refresh").json()["table_names"] == ["BlogCategory", "Category", "posts"]
+    assert manager.resolve_table_name(engine, "post", site_id="s1") == "posts"
+
+
+def test_expired_entries_are_resolved_again(manager):
+    manager.table_cache_ttl = 0
+    manager.cache_table_name("s1", "blogs", "Blogs")
+    assert manager.get_cached_table_name("s1", "blogs") is None
+
+
+def test_config_change_forgets_resolved_names(client, manager, tenant_db):
+    add_site(client, "s1", tenant_db)
+    manager.cache_table_name("s1", "blogs", "blogs")
+
+    assert client.patch("/sites/s1", json={"target_table_name": "posts"}).status_code == 200
+    assert manager.get_cached_table_name("s1", "blogs") is None